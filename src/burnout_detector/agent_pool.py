@@ -0,0 +1,111 @@
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Iterator, List, Optional, Sequence
+
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.tracing import Tracer, use_tracer
+from src.burnout_detector.score_store import ScoreStore
+from src.burnout_detector.verdict_cache import VerdictCache
+
+
+class SingleBurnoutAgentPool:
+    """
+    Thread-safe pool of long-lived `SingleBurnoutAgent`s for analysing many candidates in parallel.
+
+    A `CodeAgent` keeps per-run memory and interpreter state, so each agent is only ever used by one thread at a
+    time: callers check an agent out, run a candidate on it and return it. The agents run in `reuse_agent` mode, so
+    the model, tools and `CodeAgent` are built once per pooled agent, and they share one snapshot store, verdict
+    cache and score store.
+    """
+
+    def __init__(self, config: SingleBurnoutAgentConfig, size: int = 4):
+        """
+        Args:
+            config: Configuration of the pooled agents. `reuse_agent` is forced on and the spinner off.
+            size: Number of agents, i.e. the maximum number of candidates analysed in parallel.
+        """
+        self.config = config
+        self.size = size
+        agent_config = replace(config, reuse_agent=True, show_spinner=False, trace_path=None)
+        self.snapshot_store = None
+        if config.snapshot_path:
+            from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+            self.snapshot_store = SnapshotStore(config.snapshot_path)
+        self.verdict_cache = VerdictCache(config.verdict_cache) if config.verdict_cache is not None else None
+        if self.verdict_cache is not None and self.snapshot_store is not None:
+            self.verdict_cache.attach(self.snapshot_store)
+        self.score_store = ScoreStore(config.score_store) if config.score_store is not None else None
+
+        self.trace_summary: Optional[str] = None  # time split of the last traced batch (see `detect_burnout_many`)
+        self._agents: "queue.Queue[SingleBurnoutAgent]" = queue.Queue()
+        for _ in range(size):
+            self._agents.put(SingleBurnoutAgent(
+                agent_config, snapshot_store=self.snapshot_store, verdict_cache=self.verdict_cache,
+                score_store=self.score_store,
+            ))
+
+    @contextmanager
+    def agent(self, timeout: Optional[float] = None) -> Iterator[SingleBurnoutAgent]:
+        """
+        Check an agent out of the pool for the duration of the block, waiting for one to become free.
+
+        Args:
+            timeout: Seconds to wait for a free agent; None to wait indefinitely.
+
+        Raises:
+            queue.Empty: If no agent becomes free within `timeout` seconds.
+        """
+        agent = self._agents.get(timeout=timeout)
+        try:
+            yield agent
+        finally:
+            self._agents.put(agent)
+
+    def detect_burnout(self, burnout_candidate: str, abandoned: Optional[threading.Event] = None):
+        """
+        Detect whether a candidate is burnt out, on the next free agent.
+
+        Args:
+            burnout_candidate: The name of the burnout candidate.
+            abandoned: Optional event the caller sets when it gives up on the candidate. The run is interrupted at the
+                end of its current step, and its agent returns to the pool once it has stopped. A candidate abandoned
+                before an agent became free is not run at all.
+        """
+        with self.agent() as agent:
+            if abandoned is not None and abandoned.is_set():
+                return None
+            return agent.detect_burnout(burnout_candidate, abandoned=abandoned)
+
+    def detect_burnout_many(self, burnout_candidates: Sequence[str]) -> List:
+        """
+        Analyse many candidates in parallel, one per pooled agent at a time.
+
+        When `trace_path` is set, the whole batch is traced into one trace (one "run" span per candidate), and its
+        summary is kept in `trace_summary`.
+
+        Returns:
+            list: The result of each candidate, in input order.
+        """
+        if not self.config.trace_path:
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                return list(executor.map(self.detect_burnout, burnout_candidates))
+
+        tracer = Tracer(self.config.trace_path)
+
+        def traced(burnout_candidate: str):
+            with tracer.span("detect_burnout", "run", candidate=burnout_candidate):
+                return self.detect_burnout(burnout_candidate)
+
+        try:
+            with use_tracer(tracer), ThreadPoolExecutor(max_workers=self.size) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, traced, burnout_candidate)
+                    for burnout_candidate in burnout_candidates
+                ]
+                return [future.result() for future in futures]
+        finally:
+            self.trace_summary = tracer.format_summary()
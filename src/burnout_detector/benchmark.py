@@ -0,0 +1,532 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+import numpy as np
+from smolagents.models import ChatMessage, TokenUsage
+
+from src.burnout_detector.agent_pool import SingleBurnoutAgentPool
+from src.burnout_detector.llm_utils import LLMConfig, LLMUtils
+from src.burnout_detector.multi_burnout_agent import MultiBurnoutAgent, MultiBurnoutAgentConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgentConfig
+from src.burnout_detector.sweep import display_name
+from src.burnout_detector.tools.rootly_tools.async_collector import AsyncCollectorConfig, AsyncRootlyCollector
+from src.burnout_detector.tools.rootly_tools.fake_rootly import (
+    FakeRootlyServer,
+    FaultConfig,
+    SyntheticOrg,
+    SyntheticOrgConfig,
+)
+from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.tools.rootly_tools.rate_limiter import RateLimiterConfig
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, RootlyClientConfig, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+from src.burnout_detector.workload_metrics import (
+    MISSING_TIME,
+    IncidentColumns,
+    ShiftColumns,
+    compute_workload_metrics_from_columns,
+    parse_epoch,
+)
+
+
+SUITES = ("micro", "metrics", "collection", "e2e", "startup")
+BENCHMARK_NOW = "2025-06-01T00:00:00Z"  # fixed end of the synthetic history, so payloads are identical across runs
+STARTUP_MODULES = (  # entry points whose import must stay cheap; users_tool shows the deferred smolagents cost
+    "src.burnout_detector.llm_utils",
+    "src.burnout_detector.single_burnout_agent",
+    "src.burnout_detector.multi_burnout_agent",
+    "src.burnout_detector.sweep",
+    "src.burnout_detector.tools.rootly_tools.users_tool",
+)
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # directory `src` lives in
+# Prepended to the code of child interpreters: on exit, they write their own peak RSS to stderr. On Linux a child's
+# ru_maxrss (and so RUSAGE_CHILDREN) starts from the parent's peak, carried over fork and exec; VmHWM does not.
+_REPORT_PEAK_RSS = """import atexit, sys
+def _report_peak_rss():
+    try:
+        with open("/proc/self/status") as status:
+            sys.stderr.write(next(line for line in status if line.startswith("VmHWM:")))
+    except (OSError, StopIteration):
+        pass
+atexit.register(_report_peak_rss)
+"""
+_child_peaks_kb: List[int] = []  # peak RSS reported by the child interpreters of the case being measured
+
+
+@dataclass
+class BenchmarkCase:
+    suite: str  # one of SUITES
+    name: str
+    params: Dict[str, Any]
+    fixture: Callable[[], ContextManager[Any]]  # builds the case's input; excluded from the measurements
+    run: Callable[[Any], int]  # the measured code; returns the number of items it processed
+    repeats: int = 5  # timed runs, after one untimed warm-up run
+    in_subprocess: bool = False  # the measured code runs in child processes, whose peak RSS is reported instead
+
+    @property
+    def case_id(self) -> str:
+        params = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.suite}/{self.name}[{params}]"
+
+
+@dataclass
+class BenchmarkResult:
+    case_id: str
+    suite: str
+    name: str
+    params: Dict[str, Any]
+    items: int  # items processed per run (records, candidates, ...)
+    wall_s: List[float] = field(default_factory=list)  # wall time of each timed run
+    wall_min_s: float = 0.0
+    wall_median_s: float = 0.0
+    items_per_s: float = 0.0  # items / wall_min_s
+    peak_rss_kb: int = 0  # peak resident set size of the process that ran the case (the largest child, if any)
+    alloc_peak_bytes: int = 0  # peak Python heap traced by tracemalloc during one run
+    alloc_retained_bytes: int = 0  # Python heap still held by the run's allocations once it returned
+
+
+def _peak_rss_kb(children: bool = False) -> int:
+    if children and _child_peaks_kb:
+        return max(_child_peaks_kb)
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB on Linux
+
+
+def measure(case: BenchmarkCase) -> BenchmarkResult:
+    """
+    Run a case: one warm-up run, `repeats` timed runs, then one run under tracemalloc for the allocation figures
+    (tracing slows the code down, so it is kept out of the timings).
+    """
+    _child_peaks_kb.clear()
+    with case.fixture() as state:
+        items = case.run(state)
+        wall = []
+        for _ in range(case.repeats):
+            start = time.perf_counter()
+            case.run(state)
+            wall.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            case.run(state)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        case_id=case.case_id, suite=case.suite, name=case.name, params=case.params, items=items,
+        wall_s=[round(seconds, 6) for seconds in wall], wall_min_s=round(min(wall), 6),
+        wall_median_s=round(statistics.median(wall), 6), items_per_s=round(items / min(wall), 1) if min(wall) else 0.0,
+        peak_rss_kb=_peak_rss_kb(children=case.in_subprocess), alloc_peak_bytes=peak, alloc_retained_bytes=retained,
+    )
+
+
+def _org(users: int = 1, schedules: int = 0, teams: int = 0, incidents: int = 0, history_days: int = 0) -> SyntheticOrg:
+    return SyntheticOrg(SyntheticOrgConfig(
+        users=users, schedules=schedules, teams=teams, incidents=incidents, history_days=history_days, seed=0,
+        now=BENCHMARK_NOW,
+    ))
+
+
+@contextmanager
+def _payload(resource_name: str, size: int) -> Iterator[List[dict]]:
+    if resource_name == "users":
+        yield _org(users=size).records["users"]
+    elif resource_name == "schedules":
+        yield _org(schedules=size).records["schedules"]
+    elif resource_name == "shifts":
+        # One schedule rotating through a few users, with as many one-hour shifts as requested.
+        org = SyntheticOrg(SyntheticOrgConfig(users=8, schedules=1, teams=0, incidents=0, history_days=1,
+                                              shift_hours=1, now=BENCHMARK_NOW))
+        template = org.records["shifts"]
+        yield [template[i % len(template)] for i in range(size)]
+    else:
+        yield _org(users=50, incidents=size, history_days=90).records["incidents"]
+
+
+def micro_cases(sizes: List[int], repeats: int) -> List[BenchmarkCase]:
+    """
+    The per-record flattening the tools apply to every JSON:API page (`process_*`), on in-memory payloads.
+    """
+    process = {
+        "users": UsersTool.process_user,
+        "schedules": ShiftsTool.process_schedule,
+        "shifts": ShiftsTool.process_shift,
+        "incidents": IncidentsTool.process_incident,
+    }
+    cases = []
+    for resource_name, process_record in process.items():
+        for size in sizes:
+            cases.append(BenchmarkCase(
+                suite="micro", name=f"process_{resource_name}", params={"records": size},
+                fixture=lambda resource_name=resource_name, size=size: _payload(resource_name, size),
+                run=lambda records, process_record=process_record: len(
+                    [processed for processed in map(process_record, records) if processed is not None]
+                ),
+                repeats=repeats,
+            ))
+    return cases
+
+
+@contextmanager
+def _workload_columns(engineers: int, incidents: int, shifts: int) -> Iterator[tuple]:
+    rng = np.random.default_rng(0)
+    now = parse_epoch(BENCHMARK_NOW)
+    history = 90 * 86400
+    started_at = now - rng.integers(0, history, incidents)
+    resolved_at = started_at + rng.exponential(2 * 3600, incidents).astype(np.int64)
+    resolved_at[rng.random(incidents) < 0.05] = MISSING_TIME  # a few are still open
+    incident_columns = IncidentColumns(
+        engineer=rng.integers(0, engineers, incidents, dtype=np.int32), started_at=started_at.astype(np.int64),
+        resolved_at=resolved_at, severity=rng.integers(0, 5, incidents, dtype=np.int8),
+    )
+    # Shifts of 4h to a week, placed at random, so many overlap or run back to back.
+    starts_at = now - rng.integers(0, history, shifts)
+    shift_columns = ShiftColumns(
+        engineer=rng.integers(0, engineers, shifts, dtype=np.int32), starts_at=starts_at.astype(np.int64),
+        ends_at=(starts_at + 3600 * rng.integers(4, 169, shifts)).astype(np.int64),
+    )
+    yield [f"user-{i}" for i in range(engineers)], incident_columns, shift_columns, now
+
+
+def metrics_cases(engineers: int, repeats: int) -> List[BenchmarkCase]:
+    """
+    The vectorized workload metrics of a whole organization, at the scale of a sweep over every engineer: 50
+    incidents and 26 on-call shifts per engineer.
+    """
+    incidents, shifts = 50 * engineers, 26 * engineers
+    return [BenchmarkCase(
+        suite="metrics", name="workload_metrics",
+        params={"engineers": engineers, "incidents": incidents, "shifts": shifts},
+        fixture=lambda: _workload_columns(engineers, incidents, shifts),
+        run=lambda columns: len(compute_workload_metrics_from_columns(*columns[:3], now=columns[3])),
+        repeats=repeats,
+    )]
+
+
+@contextmanager
+def _fake_rootly(org: SyntheticOrg, latency: float) -> Iterator[RootlyClient]:
+    with FakeRootlyServer(org, faults=FaultConfig(latency_seconds=latency)) as server:
+        # No response cache, and a rate limit the stand-in never pushes back on, so every run does the same requests.
+        client = RootlyClient(RootlyClientConfig(
+            base_url=server.base_url, cache=None,
+            rate_limit=RateLimiterConfig(requests_per_second=1000.0, max_requests_per_second=1000.0, burst=100),
+        ))
+        try:
+            yield client
+        finally:
+            client.close()
+
+
+def collection_cases(records: int, latencies: List[float], repeats: int) -> List[BenchmarkCase]:
+    """
+    Rootly collection throughput against the local stand-in server, with a fixed latency added to every response.
+    """
+    org = _org(users=max(records // 10, 10), schedules=10, teams=0, incidents=records, history_days=90)
+    names = [display_name(UsersTool.process_user(user)) for user in org.records["users"][:20]]
+    cases = []
+    for latency in latencies:
+        fixture = lambda latency=latency: _fake_rootly(org, latency)
+        cases += [
+            BenchmarkCase(
+                suite="collection", name="users", params={"records": len(org.records["users"]), "latency_s": latency},
+                fixture=fixture, run=lambda client: sum(1 for _ in UsersTool(client=client, page_size=100)
+                                                        .iter_users(api_key="benchmark")),
+                repeats=repeats,
+            ),
+            BenchmarkCase(
+                suite="collection", name="incidents", params={"records": records, "latency_s": latency},
+                fixture=fixture, run=lambda client: sum(1 for _ in IncidentsTool(client=client, page_size=100)
+                                                        .iter_incidents(api_key="benchmark")),
+                repeats=repeats,
+            ),
+            BenchmarkCase(
+                suite="collection", name="async_collector", params={"candidates": len(names), "latency_s": latency},
+                fixture=fixture, run=lambda client: len(AsyncRootlyCollector(AsyncCollectorConfig(), client=client)
+                                                        .collect_sync(names, api_key="benchmark")),
+                repeats=repeats,
+            ),
+        ]
+    return cases
+
+
+class BenchmarkModel:
+    """
+    Deterministic stand-in for `LiteLLMModel`. A single-engineer run takes two steps: a `users_tool` lookup, then a
+    final answer; a bulk prompt gets one block per engineer. `latency` seconds are slept per completion to model the
+    provider.
+    """
+
+    def __init__(self, model_id: str = "benchmark-model", latency: float = 0.0):
+        self.model_id = model_id
+        self.latency = latency
+
+    def generate(self, messages, **kwargs) -> ChatMessage:
+        texts = [
+            part["text"] if isinstance(part, dict) else str(part)
+            for message in messages
+            for part in (message.content if isinstance(message.content, list) else [message.content or ""])
+        ]
+        prompt = "\n".join(texts)
+        if self.latency:
+            time.sleep(self.latency)
+
+        if "==== Engineer:" in prompt:
+            names = [line[len("Name: "):] for line in prompt.splitlines() if line.startswith("Name: ")]
+            content = "\n".join(
+                f"==== Engineer: {name} ====\n- Burnout reason: none\n- Burnout severity: low\n"
+                f"- Additional information: benchmark\n==== End of engineer ====" for name in names
+            )
+        else:
+            name = prompt.split("this engineer: ")[1].split("\n")[0].strip() if "this engineer: " in prompt else "?"
+            if "users_tool" in prompt and "Execution logs:" not in prompt:
+                code = f"print(users_tool(search={name!r}))"
+            else:
+                code = f"final_answer({f'- Engineer name: {name}{chr(10)}- Burnout severity: low'!r})"
+            content = f"<code>\n{code}\n</code>"
+        return ChatMessage(role="assistant", content=content,
+                           token_usage=TokenUsage(input_tokens=len(prompt) // 4, output_tokens=len(content) // 4))
+
+
+@contextmanager
+def _benchmark_environment(org: SyntheticOrg, model: BenchmarkModel) -> Iterator[List[str]]:
+    """
+    Point the shared Rootly client at a stand-in server and the agents at the benchmark model for the duration of
+    the block. Yields the names of the users of the org.
+    """
+    previous_key = os.environ.get("ROOTLY_API_KEY")
+    get_llm_model = LLMUtils.__dict__["get_llm_model"]
+    with FakeRootlyServer(org) as server:
+        os.environ["ROOTLY_API_KEY"] = "benchmark"
+        get_rootly_client(RootlyClientConfig(base_url=server.base_url, cache=None))
+        LLMUtils.get_llm_model = staticmethod(lambda config: model)
+        try:
+            yield [display_name(UsersTool.process_user(user)) for user in org.records["users"]]
+        finally:
+            LLMUtils.get_llm_model = get_llm_model
+            get_rootly_client(RootlyClientConfig())
+            if previous_key is None:
+                os.environ.pop("ROOTLY_API_KEY", None)
+            else:
+                os.environ["ROOTLY_API_KEY"] = previous_key
+
+
+def e2e_cases(candidates: int, workers: List[int], llm_latency: float, repeats: int) -> List[BenchmarkCase]:
+    """
+    Whole sweeps with the benchmark model against the stand-in server: `SingleBurnoutAgent`s through the agent pool,
+    and `MultiBurnoutAgent` collection plus batched detection.
+    """
+    org = _org(users=candidates, schedules=2, teams=0, incidents=candidates * 20, history_days=90)
+    llm_config = LLMConfig(model_id="benchmark-model")
+    model = BenchmarkModel(latency=llm_latency)
+
+    @contextmanager
+    def single_fixture(size: int):
+        with _benchmark_environment(org, model) as names:
+            yield SingleBurnoutAgentPool(
+                SingleBurnoutAgentConfig(llm_config=llm_config, trace_path=None, show_spinner=False), size=size
+            ), names
+
+    def run_single(state) -> int:
+        pool, names = state
+        results = pool.detect_burnout_many(names)
+        return sum(1 for result in results if isinstance(result, str) and "Engineer name" in result)
+
+    @contextmanager
+    def multi_fixture():
+        with _benchmark_environment(org, model) as names:
+            yield MultiBurnoutAgent(MultiBurnoutAgentConfig(llm_config=llm_config)), names
+
+    def run_multi(state) -> int:
+        agent, names = state
+        return sum(1 for result in agent.detect_burnout(agent.collect_burnout_candidates(names)) if "error" not in result)
+
+    cases = [
+        BenchmarkCase(
+            suite="e2e", name="single_agent_sweep",
+            params={"candidates": candidates, "workers": size, "llm_latency_s": llm_latency},
+            fixture=lambda size=size: single_fixture(size), run=run_single, repeats=repeats,
+        )
+        for size in workers
+    ]
+    cases.append(BenchmarkCase(
+        suite="e2e", name="multi_agent_sweep", params={"candidates": candidates, "llm_latency_s": llm_latency},
+        fixture=multi_fixture, run=run_multi, repeats=repeats,
+    ))
+    return cases
+
+
+def _python(code: str) -> int:
+    completed = subprocess.run([sys.executable, "-c", _REPORT_PEAK_RSS + code], cwd=_ROOT, check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    _child_peaks_kb.extend(
+        int(line.split()[1]) for line in completed.stderr.splitlines() if line.startswith("VmHWM:")
+    )
+    return 1
+
+
+_RUN_SWEEP_HELP = (  # `python -m src.burnout_detector.sweep --help`
+    "import runpy\nsys.argv = ['sweep', '--help']\n"
+    "runpy.run_module('src.burnout_detector.sweep', run_name='__main__')"
+)
+
+
+def startup_cases(repeats: int) -> List[BenchmarkCase]:
+    """
+    Cold-start time of a fresh interpreter: bare, importing each entry point, and printing the sweep CLI's help.
+    Subtract the bare interpreter to get the import cost itself.
+    """
+    @contextmanager
+    def no_fixture():
+        yield None
+
+    cases = [BenchmarkCase(suite="startup", name="interpreter", params={}, fixture=no_fixture,
+                           run=lambda state: _python("pass"), repeats=repeats, in_subprocess=True)]
+    cases += [
+        BenchmarkCase(suite="startup", name="import", params={"module": module}, fixture=no_fixture,
+                      run=lambda state, module=module: _python(f"import {module}"), repeats=repeats,
+                      in_subprocess=True)
+        for module in STARTUP_MODULES
+    ]
+    cases.append(BenchmarkCase(suite="startup", name="cli_help", params={"command": "sweep"}, fixture=no_fixture,
+                               run=lambda state: _python(_RUN_SWEEP_HELP),
+                               repeats=repeats, in_subprocess=True))
+    return cases
+
+
+def build_cases(args: argparse.Namespace) -> List[BenchmarkCase]:
+    cases = []
+    if "micro" in args.suites:
+        cases += micro_cases(args.sizes, args.repeats)
+    if "metrics" in args.suites:
+        cases += metrics_cases(args.metrics_engineers, args.repeats)
+    if "collection" in args.suites:
+        cases += collection_cases(args.collection_records, args.latencies, args.repeats)
+    if "e2e" in args.suites:
+        cases += e2e_cases(args.candidates, args.workers, args.llm_latency, max(args.repeats // 2, 1))
+    if "startup" in args.suites:
+        cases += startup_cases(args.repeats)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.case_id]
+    return cases
+
+
+def _run_isolated(case: BenchmarkCase, argv: List[str]) -> BenchmarkResult:
+    """
+    Measure a case in a fresh interpreter, so that its peak RSS is its own rather than the largest case's so far.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-m", "src.burnout_detector.benchmark", *argv, "--case", case.case_id],
+        cwd=_ROOT, capture_output=True, text=True, check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark {case.case_id} failed:\n{completed.stderr}")
+    return BenchmarkResult(**json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float = 0.1) -> List[str]:
+    """
+    Compare two result lists case by case on minimum wall time, peak RSS and peak allocations.
+
+    Returns:
+        list: One line per case present in both; regressions beyond `threshold` (a ratio, 0.1 = 10%) are flagged.
+    """
+    previous = {result["case_id"]: result for result in baseline}
+    lines = []
+    for result in results:
+        if (before := previous.get(result["case_id"])) is None:
+            continue
+        changes = []
+        for key in ("wall_min_s", "peak_rss_kb", "alloc_peak_bytes"):
+            ratio = result[key] / before[key] if before[key] else 1.0
+            flag = " REGRESSION" if ratio > 1 + threshold else ""
+            changes.append(f"{key} {before[key]} -> {result[key]} ({ratio:.2f}x){flag}")
+        lines.append(f"{result['case_id']}: " + "; ".join(changes))
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark tool parsing, workload metrics, Rootly collection, end-to-end sweeps and startup time."
+    )
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES), help="Suites to run.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000],
+                        help="Payload sizes (records) of the micro benchmarks.")
+    parser.add_argument("--metrics-engineers", type=int, default=10_000,
+                        help="Engineers of the workload metrics benchmark (50 incidents and 26 shifts each).")
+    parser.add_argument("--collection-records", type=int, default=2_000, help="Incidents served to collection runs.")
+    parser.add_argument("--latencies", nargs="+", type=float, default=[0.0, 0.02],
+                        help="Latencies (seconds) the stand-in server adds to each response.")
+    parser.add_argument("--candidates", type=int, default=8, help="Engineers per end-to-end sweep.")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 4], help="Agent pool sizes of the sweeps.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the benchmark model sleeps per call.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument("--filter", help="Only run cases whose ID contains this string.")
+    parser.add_argument("--output", help="JSON file the results are written to.")
+    parser.add_argument("--compare", help="Results JSON of a previous run (e.g. another commit) to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Ratio beyond which a change is a regression.")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every case in this process (faster, but peak RSS is then cumulative).")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # internal: measure one case and print it as JSON
+    args = parser.parse_args(argv)
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    cases = build_cases(args)
+    if args.case:
+        case = next(case for case in cases if case.case_id == args.case)
+        print(json.dumps(asdict(measure(case))))
+        return
+
+    results = []
+    for case in cases:
+        result = measure(case) if args.in_process else _run_isolated(case, argv)
+        results.append(asdict(result))
+        print(f"{result.case_id:<70} min {result.wall_min_s * 1000:9.1f}ms  median {result.wall_median_s * 1000:9.1f}ms"
+              f"  {result.items_per_s:>12.1f} items/s  rss {result.peak_rss_kb / 1024:7.1f}MiB"
+              f"  alloc {result.alloc_peak_bytes / 2 ** 20:7.1f}MiB")
+
+    report = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "isolated": not args.in_process,
+            "argv": argv,
+        },
+        "results": results,
+    }
+    if args.output:
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"Compared with {baseline['meta'].get('git_commit')}:")
+        print("\n".join(compare(results, baseline["results"], args.threshold)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class BurnoutSeverity(str, Enum):
+    NONE = "none"
+    LOW = "low"
+    MODERATE = "moderate"
+    HIGH = "high"
+    SEVERE = "severe"
+    UNKNOWN = "unknown"  # the engineer could not be assessed (e.g. missing data)
+
+
+@dataclass
+class BurnoutResult:
+    engineer_name: str
+    severity: BurnoutSeverity
+    engineer_id: Optional[str] = None  # Rootly user ID
+    reasons: List[str] = field(default_factory=list)  # most likely causes of burnout, most important first
+    supporting_metrics: Dict[str, float] = field(default_factory=dict)  # metric name to the value the verdict rests on
+    additional_information: Optional[str] = None
+    error: Optional[str] = None  # set when the engineer could not be assessed or the output could not be repaired
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["severity"] = self.severity.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BurnoutResult":
+        """
+        Build a result from a dictionary that passed `validate_burnout_result`.
+        """
+        return cls(
+            engineer_name=data["engineer_name"],
+            severity=BurnoutSeverity(data["severity"]),
+            engineer_id=str(data["engineer_id"]) if data.get("engineer_id") is not None else None,
+            reasons=list(data.get("reasons") or []),
+            supporting_metrics={key: float(value) for key, value in (data.get("supporting_metrics") or {}).items()},
+            additional_information=data.get("additional_information"),
+            error=data.get("error"),
+        )
+
+
+BURNOUT_RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "engineer_name": {"type": "string", "description": "Full name of the engineer."},
+        "engineer_id": {"type": ["string", "null"], "description": "Rootly user ID of the engineer, if known."},
+        "severity": {
+            "type": "string",
+            "enum": [severity.value for severity in BurnoutSeverity],
+            "description": "Severity of burnout; \"none\" if there are no signs of burnout.",
+        },
+        "reasons": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Most likely reasons for burnout, most important first; empty if severity is \"none\".",
+        },
+        "supporting_metrics": {
+            "type": "object",
+            "additionalProperties": {"type": "number"},
+            "description": "Workload metrics the verdict rests on, by name, e.g. {\"off_hours_ratio\": 0.4}.",
+        },
+        "additional_information": {"type": ["string", "null"], "description": "Any other relevant information."},
+    },
+    "required": ["engineer_name", "severity", "reasons", "supporting_metrics"],
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _matches_type(value: Any, expected) -> bool:
+    checks = {
+        "string": lambda v: isinstance(v, str),
+        "number": _is_number,
+        "array": lambda v: isinstance(v, list),
+        "object": lambda v: isinstance(v, dict),
+        "null": lambda v: v is None,
+    }
+    expected = expected if isinstance(expected, list) else [expected]
+    return any(checks[name](value) for name in expected)
+
+
+def validate_field(name: str, value: Any) -> Optional[str]:
+    """
+    Validate one field of a result against `BURNOUT_RESULT_SCHEMA`.
+
+    Returns:
+        str: Why the value is invalid, or None if it is valid.
+    """
+    schema = BURNOUT_RESULT_SCHEMA["properties"][name]
+    if not _matches_type(value, schema["type"]):
+        return f"expected {schema['type']}, got {type(value).__name__}"
+    if "enum" in schema and value not in schema["enum"]:
+        return f"expected one of {schema['enum']}, got {value!r}"
+    if "items" in schema and not all(_matches_type(item, schema["items"]["type"]) for item in value):
+        return f"every item must be of type {schema['items']['type']}"
+    if "additionalProperties" in schema and not all(_is_number(item) for item in value.values()):
+        return "every value must be a number"
+    return None
+
+
+def validate_burnout_result(data: dict) -> Dict[str, str]:
+    """
+    Validate a result dictionary against `BURNOUT_RESULT_SCHEMA`, field by field.
+
+    Returns:
+        dict: Field name to the reason it is invalid or missing; empty if the result is valid.
+    """
+    errors = {}
+    for name in BURNOUT_RESULT_SCHEMA["properties"]:
+        if name not in data:
+            if name in BURNOUT_RESULT_SCHEMA["required"]:
+                errors[name] = "missing"
+            continue
+        if (error := validate_field(name, data[name])) is not None:
+            errors[name] = error
+    return errors
+
+
+def normalize_burnout_result(data: dict) -> dict:
+    """
+    Apply the deterministic fixes that do not need a re-ask: severity case and whitespace, a single reason given as
+    a string, a numeric engineer ID, and metric values given as numeric strings.
+    """
+    data = dict(data)
+    if isinstance(data.get("severity"), str):
+        data["severity"] = data["severity"].strip().lower()
+    if isinstance(data.get("reasons"), str):
+        data["reasons"] = [data["reasons"]] if data["reasons"].strip() else []
+    if _is_number(data.get("engineer_id")):
+        data["engineer_id"] = str(data["engineer_id"])
+    if isinstance(data.get("supporting_metrics"), dict):
+        metrics = {}
+        for key, value in data["supporting_metrics"].items():
+            try:
+                metrics[key] = float(value) if isinstance(value, str) else value
+            except ValueError:
+                metrics[key] = value
+        data["supporting_metrics"] = metrics
+    return data
+
+
+def extract_json(output: Any) -> Optional[Any]:
+    """
+    The JSON value in an agent or model output: the output itself if it is already a dict, otherwise the first JSON
+    object in the text (ignoring Markdown code fences and surrounding prose).
+    """
+    if isinstance(output, dict):
+        return output
+    if not isinstance(output, str):
+        return None
+    text = re.sub(r"```(?:json)?", "", output).strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    start = text.find("{")
+    while start != -1:
+        try:
+            return json.JSONDecoder().raw_decode(text[start:])[0]
+        except ValueError:
+            start = text.find("{", start + 1)
+    return None
+
+
+def _ask(model, prompt: str) -> str:
+    from smolagents.models import ChatMessage
+
+    response = model.generate([ChatMessage(role="user", content=[{"type": "text", "text": prompt}])])
+    return response.content if isinstance(response.content, str) else str(response.content)
+
+
+def repair_burnout_result(
+        model,
+        output: Any,
+        data: Optional[dict],
+        errors: Dict[str, str],
+        max_attempts: int = 2,
+) -> Tuple[Optional[dict], Dict[str, str]]:
+    """
+    Repair an invalid result with short, single-completion re-asks instead of re-running the agent.
+
+    If the output contains no JSON object at all, the model is asked once to convert it into the schema. After that,
+    each invalid field is re-asked on its own, with only that field's schema, the invalid value and the original
+    output as context.
+
+    Args:
+        model: The smolagents model to ask.
+        output: The original agent output.
+        data: The parsed result, or None if no JSON object could be extracted.
+        errors: The field errors from `validate_burnout_result`.
+        max_attempts: Re-asks per field.
+
+    Returns:
+        tuple: The repaired result dictionary (None if it could not be recovered) and the remaining field errors.
+    """
+    if not isinstance(data, dict):
+        converted = extract_json(_ask(model, (
+            "Convert the following burnout assessment into a single JSON object matching this JSON schema. "
+            f"Reply with the JSON object only.\n\nSchema:\n{json.dumps(BURNOUT_RESULT_SCHEMA)}\n\n"
+            f"Assessment:\n{output}"
+        )))
+        if not isinstance(converted, dict):
+            return None, {"result": "the output does not contain a JSON object"}
+        data = normalize_burnout_result(converted)
+        errors = validate_burnout_result(data)
+
+    data = dict(data)
+    for name in list(errors):
+        schema = BURNOUT_RESULT_SCHEMA["properties"][name]
+        for _ in range(max_attempts):
+            answer = _ask(model, (
+                f"The field \"{name}\" of a burnout assessment is invalid ({errors[name]}). Reply with only the JSON "
+                f"value for this field, matching this JSON schema: {json.dumps(schema)}\n\n"
+                f"Invalid value: {json.dumps(data.get(name), default=str)}\n\nFull assessment:\n{output}"
+            ))
+            value = extract_json(answer) if schema["type"] == "object" else None
+            if value is None:
+                try:
+                    value = json.loads(re.sub(r"```(?:json)?", "", answer).strip())
+                except ValueError:
+                    value = answer.strip().strip('"') if "string" in schema["type"] else None
+            if validate_field(name, value) is None:
+                data[name] = value
+                del errors[name]
+                break
+    return data, errors
@@ -0,0 +1,76 @@
+import threading
+from contextlib import ExitStack
+from typing import Callable, List, Optional, Tuple
+
+import pytest
+from smolagents.models import ChatMessage, TokenUsage
+
+from src.burnout_detector.llm_utils import LLMUtils
+from src.burnout_detector.tools.rootly_tools.fake_rootly import FakeRootlyServer, SyntheticOrg
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, RootlyClientConfig, use_rootly_client
+
+
+class FakeModel:
+    """
+    Stand-in for the LLM. Each call answers with `code(name, prompt)` as a code action, or with `content(name, prompt)`
+    as is, where `prompt` is the text of the user messages and tool observations, and `name` the candidate named in
+    the agent's task (None if there is no such task, e.g. for a repair re-ask).
+    """
+    model_id = "fake-model"
+
+    def __init__(
+            self,
+            code: Optional[Callable[[Optional[str], str], str]] = None,
+            content: Optional[Callable[[Optional[str], str], str]] = None,
+    ):
+        self.code, self.content = code, content
+        self.prompts: List[str] = []  # user and observation text of every call, in order
+        self.built: List[str] = []  # model ID of every agent that was given this model
+        self._lock = threading.Lock()
+
+    def generate(self, messages, **kwargs):
+        prompt = "\n".join(
+            part["text"] for message in messages if message.role in ("user", "tool-response")
+            for part in message.content if isinstance(part, dict) and "text" in part
+        )
+        with self._lock:
+            self.prompts.append(prompt)
+        name = prompt.split("this engineer: ")[1].split()[0] if "this engineer: " in prompt else None
+        if self.content is not None:
+            content = self.content(name, prompt)
+        else:
+            content = f"<code>\n{self.code(name, prompt)}\n</code>"
+        return ChatMessage(role="assistant", content=content, token_usage=TokenUsage(input_tokens=1, output_tokens=1))
+
+
+@pytest.fixture
+def fake_model(monkeypatch) -> Callable[..., FakeModel]:
+    """
+    Factory building a `FakeModel` (see its arguments) and making it the LLM of every agent built during the test.
+    """
+    def install(code=None, content=None) -> FakeModel:
+        model = FakeModel(code, content)
+
+        def get_llm_model(config):
+            model.built.append(config.model_id)
+            return model
+
+        monkeypatch.setattr(LLMUtils, "get_llm_model", get_llm_model)
+        return model
+    return install
+
+
+@pytest.fixture
+def fake_rootly_client() -> Callable[..., Tuple[FakeRootlyServer, RootlyClient]]:
+    """
+    Factory serving a synthetic organisation from a local Rootly stand-in, with a client for it (without response
+    cache) as the shared client of the tools until the end of the test. The previous shared client is then restored.
+    """
+    with ExitStack() as stack:
+        def serve(org: SyntheticOrg, **server_options) -> Tuple[FakeRootlyServer, RootlyClient]:
+            server = stack.enter_context(FakeRootlyServer(org, **server_options))
+            client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+            stack.callback(client.close)
+            stack.enter_context(use_rootly_client(client))
+            return server, client
+        yield serve
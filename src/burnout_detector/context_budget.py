@@ -0,0 +1,201 @@
+import json
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _default_fields() -> Dict[str, Tuple[str, ...]]:
+    return {
+        "incidents_tool": (
+            "incident_id", "title", "status", "severity_name", "severity_level", "created_at", "started_at",
+            "resolved_at", "environments", "services",
+        ),
+        "users_tool": ("id", "full_name", "email", "time_zone"),
+        "shifts_tool": ("id", "name", "description", "owner_user_id", "owner_group_ids", "created_at"),
+    }
+
+
+_ID_FIELDS = {"incidents_tool": "incident_id"}  # record ID field per tool, "id" for the others
+_CATEGORY_LIMIT = 12  # fields with at most this many distinct values are summarised as value counts
+
+
+@dataclass
+class ContextBudgetConfig:
+    max_step_tokens: int = 2_000  # estimated tokens of tool output the model may see per agent step
+    max_run_tokens: int = 12_000  # estimated tokens of tool output the model may see over a whole run
+    chars_per_token: float = 4.0  # characters per token used to estimate token counts
+    max_items: int = 20  # records of one tool call shown individually; the rest is summarised as statistics
+    max_text_chars: int = 200  # longer string values are cut to this length
+    fields: Dict[str, Tuple[str, ...]] = field(default_factory=_default_fields)  # fields shown per tool
+
+
+@dataclass
+class ContextBudgetStats:
+    observed_tokens: int = 0  # estimated tokens of tool output passed on to the model
+    omitted_tokens: int = 0  # estimated tokens cut from step observations to stay within the budgets
+    duplicates_elided: int = 0  # records not shown again because an earlier step already showed them
+    records_summarised: int = 0  # records folded into tail statistics instead of being shown
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """
+    Estimate the number of tokens of a text from its length.
+    """
+    return int(len(text) / chars_per_token) + 1 if text else 0
+
+
+def summarize_records(records: Iterable[dict]) -> dict:
+    """
+    Aggregate statistics of a list of flat records: their count, value counts of low-cardinality fields (e.g.
+    severity, status) and the range of timestamp fields (names ending in "_at").
+    """
+    records = list(records)
+    summary: dict = {"count": len(records)}
+    values: Dict[str, List] = {}
+    for record in records:
+        for key, value in record.items():
+            values.setdefault(key, []).append(value)
+    for key, column in values.items():
+        if key.endswith("_at"):
+            present = sorted(value for value in column if isinstance(value, str) and value)
+            if present:
+                summary[key] = {"min": present[0], "max": present[-1], "missing": len(column) - len(present)}
+            continue
+        flat = [item for value in column for item in (value if isinstance(value, list) else [value])]
+        if flat and all(isinstance(item, (str, int, bool, type(None))) for item in flat):
+            counts: Dict[str, int] = {}
+            for item in flat:
+                counts[str(item)] = counts.get(str(item), 0) + 1
+            if len(counts) <= _CATEGORY_LIMIT:
+                summary[key] = dict(sorted(counts.items(), key=lambda entry: -entry[1]))
+    return summary
+
+
+class BudgetedResult(list):
+    """
+    A tool result that behaves as the plain list of records in the agent's code, but prints as the compacted,
+    budgeted view its `ContextBudget` rendered when the tool returned, since printed output is what reaches the model.
+    """
+
+    def __init__(self, records: Iterable[dict], view: str):
+        super().__init__(records)
+        self.view = view
+
+    def __str__(self) -> str:
+        return self.view
+
+    __repr__ = __str__
+
+
+class ContextBudget:
+    """
+    Keeps the tool output a `CodeAgent` feeds back to the model within a token budget, for one run.
+
+    Tool results are projected onto the fields the model needs (with long strings cut) and wrapped so that printing
+    them shows at most `max_items` records that no earlier step has shown, followed by statistics of the rest.
+    Independently of how the output was produced, each step's observation is cut to the per-step budget and to what
+    is left of the per-run budget; once the run budget is spent the model is told to answer with what it has.
+    """
+
+    def __init__(self, config: Optional[ContextBudgetConfig] = None):
+        self.config = config if config is not None else ContextBudgetConfig()
+        self._seen: Dict[str, Set[str]] = {}
+        self._stats = ContextBudgetStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ContextBudgetStats:
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def remaining_tokens(self) -> int:
+        with self._lock:
+            return max(self.config.max_run_tokens - self._stats.observed_tokens, 0)
+
+    def _estimate(self, text: str) -> int:
+        return estimate_tokens(text, self.config.chars_per_token)
+
+    def project(self, tool_name: str, records: Iterable[dict]) -> List[dict]:
+        """
+        Keep only the configured fields of each record (all of them for tools without a field list), and cut long
+        strings to `max_text_chars`.
+        """
+        fields = self.config.fields.get(tool_name)
+        limit = self.config.max_text_chars
+        projected = []
+        for record in records:
+            if not isinstance(record, dict):
+                projected.append(record)
+                continue
+            kept = {key: record.get(key) for key in fields} if fields else dict(record)
+            for key, value in kept.items():
+                if isinstance(value, str) and len(value) > limit:
+                    kept[key] = value[:limit] + "…"
+            projected.append(kept)
+        return projected
+
+    def wrap(self, tool_name: str, records: Iterable[dict]) -> BudgetedResult:
+        """
+        Project a tool's records and wrap them for budgeted printing, rendering (and accounting for) their view once.
+        """
+        projected = self.project(tool_name, records)
+        return BudgetedResult(projected, self.render(tool_name, projected))
+
+    def render(self, tool_name: str, records: List[dict]) -> str:
+        """
+        The text shown when the agent prints a tool result: records not shown in earlier steps (at most `max_items`,
+        fewer if needed to fit the step budget), a count of the repeated ones, and statistics of everything not shown.
+        The records shown are remembered as seen, and the view is counted in the stats.
+        """
+        id_field = _ID_FIELDS.get(tool_name, "id")
+        with self._lock:
+            seen = self._seen.setdefault(tool_name, set())
+            fresh = [r for r in records if not isinstance(r, dict) or str(r.get(id_field)) not in seen]
+        duplicates = len(records) - len(fresh)
+        budget = min(self.config.max_step_tokens, self.remaining_tokens)
+
+        shown = min(len(fresh), self.config.max_items)
+        while True:
+            tail = fresh[shown:]
+            lines = [f"{tool_name}: {len(records)} records ({shown} shown below"
+                     + (f", {duplicates} already shown in earlier steps" if duplicates else "")
+                     + (f", {len(tail)} summarised" if tail else "") + ")"]
+            lines += [json.dumps(record, default=str, ensure_ascii=False) for record in fresh[:shown]]
+            if tail:
+                lines.append("Summary of the records not shown: " + json.dumps(
+                    summarize_records(r for r in tail if isinstance(r, dict)), default=str, ensure_ascii=False
+                ))
+            text = "\n".join(lines)
+            if shown == 0 or self._estimate(text) <= budget:
+                break
+            shown //= 2
+
+        with self._lock:
+            seen.update(str(r.get(id_field)) for r in fresh[:shown] if isinstance(r, dict))
+            self._stats.duplicates_elided += duplicates
+            self._stats.records_summarised += len(fresh) - shown
+        return text
+
+    def observe(self, memory_step):
+        """
+        smolagents step callback enforcing the per-step and per-run budgets on the step's observation, before it is
+        written into the model's context for the next step.
+        """
+        observations = getattr(memory_step, "observations", None)
+        if not observations:
+            return
+        tokens = self._estimate(observations)
+        limit = min(self.config.max_step_tokens, self.remaining_tokens)
+        if tokens > limit:
+            if limit <= 0:
+                observations = ("[Tool output omitted: the context budget of this run is used up. Give your final "
+                                "answer with the information you already have.]")
+            else:
+                keep = int(limit * self.config.chars_per_token)
+                observations = (observations[:keep] + f"\n[… {tokens - limit} more tokens of output omitted to stay "
+                                "within the context budget. Print aggregates or fewer fields instead.]")
+            memory_step.observations = observations
+        with self._lock:
+            self._stats.omitted_tokens += max(tokens - limit, 0)
+            self._stats.observed_tokens += min(tokens, max(limit, 0))
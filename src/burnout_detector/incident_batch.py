@@ -0,0 +1,251 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.burnout_detector.workload_metrics import (
+    MISSING_TIME, IncidentColumns, parse_epoch, severity_code,
+)
+
+
+MISSING_CODE = -1  # code of a missing (None) categorical value
+
+CATEGORICAL_FIELDS = ("status", "kind", "severity_name", "severity_level")
+TIMESTAMP_FIELDS = ("created_at", "updated_at", "started_at", "resolved_at")
+TEXT_FIELDS = ("incident_id", "title", "summary")
+MULTI_VALUED_FIELDS = ("environments", "services")
+
+
+def format_epoch(epoch: int) -> Optional[str]:
+    """
+    Render epoch seconds as an ISO 8601 UTC timestamp, or None for MISSING_TIME.
+    """
+    if epoch == MISSING_TIME:
+        return None
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _Interner:
+    """
+    Maps repeated strings onto small integer codes while a batch is being built.
+    """
+    __slots__ = ("categories", "_codes")
+
+    def __init__(self):
+        self.categories: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+
+class IncidentBatch:
+    """
+    Compact struct-of-arrays representation of incidents, with the same fields as `IncidentsTool` output.
+
+    Repeated strings (status, kind, severity, environment and service names) are stored as int32 codes into
+    per-field category lists, timestamps as int64 epoch seconds (MISSING_TIME when absent) and the multi-valued
+    environment and service lists in CSR form (offsets + codes). Filtering and aggregation work on the arrays;
+    dictionaries are only built on demand via `to_dicts`/`__getitem__`. Timestamps are rendered back in UTC with
+    second precision.
+    """
+    __slots__ = ("text", "codes", "categories", "timestamps", "multi_offsets", "multi_codes")
+
+    def __init__(
+            self,
+            text: Dict[str, List[Optional[str]]],
+            codes: Dict[str, np.ndarray],
+            categories: Dict[str, List[str]],
+            timestamps: Dict[str, np.ndarray],
+            multi_offsets: Dict[str, np.ndarray],
+            multi_codes: Dict[str, np.ndarray],
+    ):
+        self.text = text
+        self.codes = codes
+        self.categories = categories
+        self.timestamps = timestamps
+        self.multi_offsets = multi_offsets
+        self.multi_codes = multi_codes
+
+    @classmethod
+    def from_incidents(cls, incidents: Iterable[dict]) -> "IncidentBatch":
+        """
+        Build a batch from processed incident dictionaries. The iterable is consumed one incident at a time, so it can
+        be fed straight from `IncidentsTool.iter_incidents` without materialising the list of dictionaries.
+        """
+        interners = {name: _Interner() for name in (*CATEGORICAL_FIELDS, *MULTI_VALUED_FIELDS)}
+        text = {name: [] for name in TEXT_FIELDS}
+        codes = {name: [] for name in CATEGORICAL_FIELDS}
+        timestamps = {name: [] for name in TIMESTAMP_FIELDS}
+        multi_offsets = {name: [0] for name in MULTI_VALUED_FIELDS}
+        multi_codes = {name: [] for name in MULTI_VALUED_FIELDS}
+
+        for incident in incidents:
+            for name in TEXT_FIELDS:
+                text[name].append(incident.get(name))
+            for name in CATEGORICAL_FIELDS:
+                value = incident.get(name)
+                codes[name].append(interners[name].code(str(value) if value is not None else None))
+            for name in TIMESTAMP_FIELDS:
+                timestamps[name].append(parse_epoch(incident.get(name)))
+            for name in MULTI_VALUED_FIELDS:
+                values = incident.get(name) or []
+                multi_codes[name].extend(interners[name].code(value) for value in values)
+                multi_offsets[name].append(len(multi_codes[name]))
+
+        return cls(
+            text=text,
+            codes={name: np.asarray(values, dtype=np.int32) for name, values in codes.items()},
+            categories={name: interner.categories for name, interner in interners.items()},
+            timestamps={name: np.asarray(values, dtype=np.int64) for name, values in timestamps.items()},
+            multi_offsets={name: np.asarray(values, dtype=np.int64) for name, values in multi_offsets.items()},
+            multi_codes={name: np.asarray(values, dtype=np.int32) for name, values in multi_codes.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.text["incident_id"])
+
+    def __getitem__(self, index: int) -> dict:
+        return self._to_dict(index)
+
+    def _to_dict(self, i: int) -> dict:
+        incident = {}
+        for name in ("incident_id", "title", "status", "kind", "severity_name", "severity_level", "summary",
+                     "created_at", "updated_at", "started_at", "resolved_at", "environments", "services"):
+            if name in self.text:
+                incident[name] = self.text[name][i]
+            elif name in self.codes:
+                code = int(self.codes[name][i])
+                incident[name] = self.categories[name][code] if code != MISSING_CODE else None
+            elif name in self.timestamps:
+                incident[name] = format_epoch(int(self.timestamps[name][i]))
+            else:
+                start, end = self.multi_offsets[name][i], self.multi_offsets[name][i + 1]
+                incident[name] = [self.categories[name][code] for code in self.multi_codes[name][start:end].tolist()]
+        return incident
+
+    def to_dicts(self, indexes: Optional[Sequence[int]] = None) -> Iterator[dict]:
+        """
+        Lazily convert (a subset of) the batch back to the dictionaries returned by `IncidentsTool`.
+        """
+        for i in (range(len(self)) if indexes is None else indexes):
+            yield self._to_dict(int(i))
+
+    def code_of(self, field_name: str, value: Optional[str]) -> int:
+        """
+        The code of a categorical value, or MISSING_CODE - 1 (matching nothing) if the value does not occur.
+        """
+        if value is None:
+            return MISSING_CODE
+        try:
+            return self.categories[field_name].index(str(value))
+        except ValueError:
+            return MISSING_CODE - 1
+
+    def mask(self, created_at_gte: Optional[str] = None, created_at_lte: Optional[str] = None,
+             **equals: Optional[str]) -> np.ndarray:
+        """
+        Boolean mask of the incidents matching all the given filters.
+
+        Args:
+            created_at_gte: Optional ISO 8601 lower bound (inclusive) on `created_at`.
+            created_at_lte: Optional ISO 8601 upper bound (inclusive) on `created_at`.
+            **equals: Categorical fields (status, kind, severity_name, severity_level) and the value they must have.
+        """
+        result = np.ones(len(self), dtype=bool)
+        created_at = self.timestamps["created_at"]
+        if created_at_gte:
+            result &= (created_at != MISSING_TIME) & (created_at >= parse_epoch(created_at_gte))
+        if created_at_lte:
+            result &= (created_at != MISSING_TIME) & (created_at <= parse_epoch(created_at_lte))
+        for field_name, value in equals.items():
+            result &= self.codes[field_name] == self.code_of(field_name, value)
+        return result
+
+    def has_value(self, field_name: str, value: str) -> np.ndarray:
+        """
+        Boolean mask of the incidents whose multi-valued field (environments or services) contains the value.
+        """
+        code = self.code_of(field_name, value)
+        offsets = self.multi_offsets[field_name]
+        hits = np.flatnonzero(self.multi_codes[field_name] == code)
+        result = np.zeros(len(self), dtype=bool)
+        result[np.searchsorted(offsets, hits, side="right") - 1] = True
+        return result
+
+    def select(self, mask: np.ndarray) -> "IncidentBatch":
+        """
+        A new batch with only the incidents selected by a boolean mask. Category lists are shared.
+        """
+        indexes = np.flatnonzero(mask)
+        index_list = indexes.tolist()
+        multi_offsets, multi_codes = {}, {}
+        for name in MULTI_VALUED_FIELDS:
+            offsets = self.multi_offsets[name]
+            lengths = offsets[indexes + 1] - offsets[indexes]
+            positions = np.repeat(offsets[indexes] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+            multi_codes[name] = self.multi_codes[name][positions + np.arange(positions.size)]
+            multi_offsets[name] = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        return IncidentBatch(
+            text={name: [values[i] for i in index_list] for name, values in self.text.items()},
+            codes={name: values[indexes] for name, values in self.codes.items()},
+            categories=self.categories,
+            timestamps={name: values[indexes] for name, values in self.timestamps.items()},
+            multi_offsets=multi_offsets,
+            multi_codes=multi_codes,
+        )
+
+    def value_counts(self, field_name: str, mask: Optional[np.ndarray] = None) -> Dict[Optional[str], int]:
+        """
+        Number of incidents per value of a categorical or multi-valued field, optionally within a mask.
+        """
+        categories = self.categories[field_name]
+        if field_name in self.codes:
+            codes = self.codes[field_name] if mask is None else self.codes[field_name][mask]
+        else:
+            offsets = self.multi_offsets[field_name]
+            codes = self.multi_codes[field_name]
+            if mask is not None:
+                owner = np.repeat(np.arange(len(self)), np.diff(offsets))
+                codes = codes[mask[owner]]
+        counts = np.bincount(codes + 1, minlength=len(categories) + 1)  # shift so MISSING_CODE lands on 0
+        result = {category: int(counts[code + 1]) for code, category in enumerate(categories) if counts[code + 1]}
+        if counts[0]:
+            result[None] = int(counts[0])
+        return result
+
+    def incident_columns(self, engineer: int = 0) -> IncidentColumns:
+        """
+        The workload-metric columns of this batch, attributing every incident to the given engineer index.
+        """
+        started_at = self.timestamps["started_at"]
+        started_at = np.where(started_at != MISSING_TIME, started_at, self.timestamps["created_at"])
+        severity_by_code = {
+            name: np.asarray([severity_code(category) for category in self.categories[name]] + [-1], dtype=np.int8)
+            for name in ("severity_level", "severity_name")
+        }
+        # The -1 entry maps MISSING_CODE (via index -1) onto "no severity", falling back to the severity name.
+        severity = severity_by_code["severity_level"][self.codes["severity_level"]]
+        severity_level_missing = self.codes["severity_level"] == MISSING_CODE
+        severity = np.where(severity_level_missing, severity_by_code["severity_name"][self.codes["severity_name"]], severity)
+        severity = np.where(severity < 0, severity_code(None), severity).astype(np.int8)
+        return IncidentColumns(
+            engineer=np.full(len(self), engineer, dtype=np.int32),
+            started_at=started_at,
+            resolved_at=self.timestamps["resolved_at"].copy(),
+            severity=severity,
+        )
+
+    def nbytes(self) -> int:
+        """
+        Approximate size of the array storage, in bytes (excluding the free-text and category strings).
+        """
+        arrays = [*self.codes.values(), *self.timestamps.values(), *self.multi_offsets.values(),
+                  *self.multi_codes.values()]
+        return sum(array.nbytes for array in arrays)
@@ -0,0 +1,255 @@
+import contextvars
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Sequence
+
+
+TRANSIENT_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+TRANSIENT_ERROR_NAMES = (
+    "RateLimitError", "Timeout", "APITimeoutError", "APIConnectionError", "ServiceUnavailableError",
+    "InternalServerError", "BadGatewayError",
+)
+
+
+@dataclass
+class LLMSchedulerConfig:
+    max_concurrency: int = 4  # maximum number of in-flight LLM requests
+    requests_per_minute: Optional[int] = 60  # provider RPM budget; None for no limit
+    tokens_per_minute: Optional[int] = 200_000  # provider TPM budget (prompt + completion); None for no limit
+    expected_output_tokens: int = 1024  # completion tokens reserved per request until the real usage is known
+    chars_per_token: float = 4.0  # used to estimate prompt tokens before a request is sent
+    max_retries: int = 4  # retries per request on transient provider errors
+    backoff_base: float = 2.0  # base delay for exponential backoff, in seconds
+    backoff_max: float = 60.0  # upper bound on a single backoff delay, in seconds
+
+
+@dataclass
+class LLMRequestResult:
+    prompt: str
+    output: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class LLMSchedulerStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    throttled_seconds: float = 0.0
+
+
+@dataclass
+class _UsageEntry:
+    time: float
+    tokens: int
+
+
+class MinuteBudget:
+    """
+    Sliding one-minute window over request and token usage, for requests-per-minute and tokens-per-minute quotas.
+
+    Requests reserve their estimated tokens up front and the reservation is corrected once the provider reports the
+    real usage, so concurrent requests cannot overshoot the token budget between being sent and completing.
+    """
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int],
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._entries: Deque[_UsageEntry] = deque()
+        self._tokens = 0
+        self._condition = threading.Condition()
+
+    def _expire(self, now: float):
+        while self._entries and now - self._entries[0].time >= self.WINDOW_SECONDS:
+            self._tokens -= self._entries.popleft().tokens
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        waits = [0.0]
+        if self.requests_per_minute and len(self._entries) >= self.requests_per_minute:
+            waits.append(self._entries[len(self._entries) - self.requests_per_minute].time + self.WINDOW_SECONDS - now)
+        if self.tokens_per_minute and self._entries and self._tokens + tokens > self.tokens_per_minute:
+            # Wait until enough of the oldest usage has left the window; a single request larger than the whole
+            # budget is let through once the window is empty.
+            freed = 0
+            for entry in self._entries:
+                freed += entry.tokens
+                if self._tokens - freed + tokens <= self.tokens_per_minute:
+                    break
+            waits.append(entry.time + self.WINDOW_SECONDS - now)
+        return max(waits)
+
+    def reserve(self, tokens: int) -> tuple:
+        """
+        Block until a request of the given estimated size fits both budgets, then record it.
+
+        Returns:
+            tuple: The reservation, to pass to `settle`, and the number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._condition:
+                now = self._clock()
+                self._expire(now)
+                wait = self._wait_time(tokens, now)
+                if wait <= 0:
+                    entry = _UsageEntry(now, tokens)
+                    self._entries.append(entry)
+                    self._tokens += tokens
+                    return entry, waited
+            self._sleep(wait)
+            waited += wait
+
+    def settle(self, entry: _UsageEntry, actual_tokens: int):
+        """
+        Replace a reservation's estimated tokens with the usage the provider reported.
+        """
+        with self._condition:
+            if entry in self._entries:
+                self._tokens += actual_tokens - entry.tokens
+            entry.tokens = actual_tokens
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether an LLM provider error is worth retrying (rate limits, timeouts, overloaded or failing servers).
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code in TRANSIENT_STATUS_CODES:
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class LLMScheduler:
+    """
+    Runs many prompts against an LLM model concurrently, within requests-per-minute and tokens-per-minute budgets.
+
+    Transient provider errors are retried with exponential backoff and full jitter. A request that still fails, or
+    fails with a non-transient error, is reported in its result instead of aborting the other requests.
+    """
+
+    def __init__(self, model, config: Optional[LLMSchedulerConfig] = None):
+        """
+        Args:
+            model: A smolagents model, e.g. the `LiteLLMModel` returned by `LLMUtils.get_llm_model`.
+            config: Optional scheduler configuration.
+        """
+        self.model = model
+        self.config = config if config is not None else LLMSchedulerConfig()
+        self.budget = MinuteBudget(self.config.requests_per_minute, self.config.tokens_per_minute)
+        self.stats = LLMSchedulerStats()
+        self._stats_lock = threading.Lock()
+
+    def estimate_tokens(self, prompt: str) -> int:
+        """
+        Rough prompt + completion token estimate used to reserve budget before a request is sent.
+        """
+        return int(len(prompt) / self.config.chars_per_token) + self.config.expected_output_tokens
+
+    def _record(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def _backoff(self, attempt: int):
+        delay = min(self.config.backoff_max, self.config.backoff_base * (2 ** attempt))
+        time.sleep(random.uniform(0, delay))
+
+    def run_one(self, prompt: str) -> LLMRequestResult:
+        """
+        Send a single prompt, waiting for budget and retrying transient errors.
+        """
+        result = LLMRequestResult(prompt=prompt)
+        from smolagents.models import ChatMessage
+
+        messages = [ChatMessage(role="user", content=[{"type": "text", "text": prompt}])]
+        for attempt in range(self.config.max_retries + 1):
+            result.attempts = attempt + 1
+            reservation, waited = self.budget.reserve(self.estimate_tokens(prompt))
+            self._record(requests=1, retries=1 if attempt else 0, throttled_seconds=waited)
+            try:
+                response = self.model.generate(messages)
+            except Exception as e:
+                self.budget.settle(reservation, 0)  # a failed request still counts against the RPM budget
+                if is_transient_error(e) and attempt < self.config.max_retries:
+                    self._backoff(attempt)
+                    continue
+                result.error = f"{type(e).__name__}: {e}"
+                self._record(failures=1)
+                return result
+
+            usage = getattr(response, "token_usage", None)
+            if usage is not None:
+                result.input_tokens, result.output_tokens = usage.input_tokens, usage.output_tokens
+                self.budget.settle(reservation, usage.input_tokens + usage.output_tokens)
+                self._record(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+            result.output = response.content if isinstance(response.content, str) else str(response.content)
+            return result
+        return result  # not reached: the last attempt either returns its output or its error
+
+    def run(self, prompts: Sequence[str]) -> List[LLMRequestResult]:
+        """
+        Run all prompts with at most `max_concurrency` requests in flight.
+
+        Returns:
+            list: One result per prompt, in the order of the prompts.
+        """
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrency)) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self.run_one, prompt) for prompt in prompts]
+            return [future.result() for future in futures]
+
+
+_ENGINEER_BLOCK = re.compile(
+    r"====\s*Engineer:\s*(?P<name>.+?)\s*====\s*\n(?P<body>.*?)====\s*End of engineer\s*====",
+    re.DOTALL | re.IGNORECASE,
+)
+_FIELD_LINE = re.compile(r"^\s*-\s*(?P<key>[A-Za-z ]+?)\s*:\s*(?P<value>.*)$")
+
+
+def parse_bulk_response(output: str, names: Sequence[str]) -> List[dict]:
+    """
+    Split a `bulk_burnout_detection` response back into one result per candidate.
+
+    Args:
+        output: The raw model output for a batch.
+        names: The candidate names in the batch, in order.
+
+    Returns:
+        list: For each name, a dictionary with "name", "raw" and the reported fields (e.g. "burnout_reason",
+            "burnout_severity"), or with an "error" key if the response contains no block for that candidate.
+    """
+    blocks = {}
+    for match in _ENGINEER_BLOCK.finditer(output or ""):
+        blocks.setdefault(match.group("name").strip().lower(), match.group("body").strip())
+
+    results = []
+    for name in names:
+        body = blocks.get(name.strip().lower())
+        if body is None:
+            results.append({"name": name, "error": "No result for this engineer in the batched response."})
+            continue
+        result = {"name": name, "raw": body}
+        if body.upper().startswith("ERROR"):
+            result["error"] = body
+        for line in body.splitlines():
+            if (field_match := _FIELD_LINE.match(line)) is not None:
+                result[field_match.group("key").strip().lower().replace(" ", "_")] = field_match.group("value").strip()
+        results.append(result)
+    return results
@@ -1,8 +1,11 @@
-from smolagents import LiteLLMModel
 from dataclasses import dataclass
+import copy
+import functools
 import os
-import yaml
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from smolagents import LiteLLMModel
 
 
 @dataclass
@@ -13,7 +16,7 @@ class LLMConfig:
 
 class LLMUtils:
     @staticmethod
-    def get_llm_model(config: LLMConfig) -> LiteLLMModel:
+    def get_llm_model(config: LLMConfig) -> "LiteLLMModel":
         """Get the LLM model based on the model type.
 
         Args:
@@ -21,6 +24,8 @@ class LLMUtils:
         Returns:
             LiteLLMModel: Configured model instance
         """
+        from smolagents import LiteLLMModel  # imported on first use: smolagents takes most of the startup time
+
         model = config.model_id
         match model:
             case model if model.startswith("claude"):
@@ -67,9 +72,10 @@ class LLMUtils:
                 raise ValueError(f"Unsupported model type: {model}")
 
     @staticmethod
-    def load_prompt_template(prompt_path: Optional[str] = None) -> str:
+    def load_prompt_template(prompt_path: Optional[str] = None) -> dict:
         """
-        Read the prompt template from the given path (YAML file).
+        Read the prompt template from the given path (YAML file). The parsed file is cached until it is modified,
+        so repeated calls do not re-read and re-parse it.
 
         Args: 
             prompt_path: The path to the prompt template file. Optional.
@@ -81,6 +87,15 @@ class LLMUtils:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             prompt_path = os.path.join(current_dir, "prompt_templates.yaml")
 
+        prompt_path = os.path.abspath(prompt_path)
+        # Copy so that callers modifying the templates cannot affect the cached version.
+        return copy.deepcopy(LLMUtils._parse_prompt_template(prompt_path, os.path.getmtime(prompt_path)))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _parse_prompt_template(prompt_path: str, modified_time: float) -> dict:
+        import yaml
+
         with open(prompt_path, "r") as file:
             prompt_templates = yaml.safe_load(file)
 
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
-from llm_utils import LLMConfig, LLMUtils
-from typing import List, Optional
+from src.burnout_detector.llm_utils import LLMConfig, LLMUtils
+from typing import TYPE_CHECKING, Dict, List, Optional
 from logging import Logger
 
-from utils import Utils
+from src.burnout_detector.utils import Utils
+from src.burnout_detector.llm_scheduler import LLMScheduler, LLMSchedulerConfig, parse_bulk_response
+from src.burnout_detector.prescreen import PrescreenConfig, PrescreenDecision, Prescreener
+
+if TYPE_CHECKING:
+    from src.burnout_detector.tools.rootly_tools.async_collector import AsyncCollectorConfig
+    from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory
 
 
 @dataclass
@@ -11,6 +17,9 @@ class MultiBurnoutAgentConfig:
     llm_config: LLMConfig
     tools: Optional[List[str]] = None
     batch_size: int = 8
+    collector_config: Optional["AsyncCollectorConfig"] = None
+    scheduler_config: Optional[LLMSchedulerConfig] = None  # concurrency, RPM/TPM budgets and retries for the LLM calls
+    prescreen: Optional[PrescreenConfig] = None  # only send candidates whose workload metrics show risk to the LLM
 
 
 class MultiBurnoutAgent:
@@ -21,6 +30,29 @@ class MultiBurnoutAgent:
     def __init__(self, config: Optional[MultiBurnoutAgentConfig] = None):
         self.config = config
         self.logger = Logger("default")
+        self.user_directory: Optional["UserDirectory"] = None  # built on first collection, then refreshed incrementally
+
+    def collect_burnout_candidates(self, names: List[str]) -> List[dict]:
+        """
+        Concurrently collect the Rootly data of a set of engineers, in the format expected by `detect_burnout`.
+
+        Args:
+            names: Names of the engineers to collect data for.
+
+        Returns:
+            list: One dictionary per name containing "name", "on_call_schedule" and "most_recent_incident" (and
+                "user_id", "email" and "time_zone" for the names matching a Rootly user).
+        """
+        from src.burnout_detector.tools.rootly_tools.async_collector import AsyncRootlyCollector
+        from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory
+
+        if self.user_directory is None:
+            self.user_directory = UserDirectory()
+        collector_config = self.config.collector_config if self.config is not None else None
+        collector = AsyncRootlyCollector(collector_config, client=self.user_directory.client,
+                                         directory=self.user_directory)
+        with self.user_directory.client.run():
+            return collector.collect_sync(names)
 
     @staticmethod
     def _process_burnout_candidates(burnout_candidates: List[dict]) -> List[str]:
@@ -36,21 +68,95 @@ class MultiBurnoutAgent:
             processed_candidates.append(processed)
         return processed_candidates
 
-    def detect_burnout(self, burnout_candidates: List[dict], config_override: Optional[MultiBurnoutAgentConfig] = None):
+    def _prescreen(self, burnout_candidates: List[dict], config: PrescreenConfig) -> Dict[str, PrescreenDecision]:
+        """
+        Screen the candidates that were matched to a Rootly user. Candidates that cannot be screened (unknown user,
+        collection error, or a failure while screening) get no decision and go to the LLM.
+        """
+        time_zones = {
+            str(candidate["user_id"]): candidate.get("time_zone")
+            for candidate in burnout_candidates
+            if candidate.get("user_id") is not None and not candidate.get("error")
+        }
+        try:
+            return Prescreener(config).screen(time_zones)
+        except Exception as e:
+            self.logger.error(f"Error pre-screening burnout candidates, sending all of them to the LLM: {e}")
+            return {}
+
+    def detect_burnout(
+            self,
+            burnout_candidates: List[dict],
+            config_override: Optional[MultiBurnoutAgentConfig] = None
+    ) -> List[dict]:
         """
         Detect whether a set of candidates are burnt out.
 
+        Candidates are grouped into batches of `batch_size`, each batch is sent as one `bulk_burnout_detection`
+        prompt, and the batches are scheduled concurrently within the configured provider budgets. A batch that
+        fails marks each of its candidates with an error without affecting the other batches.
+
+        With `prescreen` configured, the candidates' workload metrics are first scored with cheap rules, and the
+        candidates below the risk threshold get a "none" severity without an LLM call. Every screened candidate's
+        result carries the decision, with the metrics behind it, under "prescreen".
+
         Args:
             burnout_candidates: List of dictionaries containing "name", "on_call_schedule", and information on the
                 most recent incidents handled by the burnout candidate.
             config_override: Optionally override the configuration used during initialization.
+
+        Returns:
+            list: One dictionary per candidate, in input order, with "name" and either the reported fields (e.g.
+                "burnout_reason", "burnout_severity", "additional_information") or an "error".
         """
-        llm_config = self.config.llm_config if config_override is None else config_override
+        config = self.config if config_override is None else config_override
+        llm_config = config.llm_config if config is not None else None
         assert llm_config is not None, "Must provide an LLM config, but got None."
 
-        model = LLMUtils.get_llm_model(llm_config)
+        if not (bulk_burnout_detection := LLMUtils.load_prompt_template()["bulk_burnout_detection"]["template"]):
+            raise ValueError("No prompt template found for bulk burnout detection.")
+
+        decisions = self._prescreen(burnout_candidates, config.prescreen) if config.prescreen is not None else {}
+        screened = [decisions.get(str(candidate.get("user_id"))) for candidate in burnout_candidates]
+        escalated = [
+            candidate for candidate, decision in zip(burnout_candidates, screened)
+            if decision is None or decision.escalate
+        ]
+        if decisions:
+            self.logger.info(f"Pre-screening sent {len(escalated)} of {len(burnout_candidates)} candidates to the LLM.")
+
+        processed_candidates = self._process_burnout_candidates(escalated)
+        batched_candidates = Utils.batchify(processed_candidates, config.batch_size)
+        batched_names = Utils.batchify([candidate["name"] for candidate in escalated], config.batch_size)
+        prompts = [
+            bulk_burnout_detection.format(burnout_candidates="\n\n".join(batch)) for batch in batched_candidates
+        ]
 
-        processed_candidates = self._process_burnout_candidates(burnout_candidates)
-        batched_candidates = Utils.batchify(processed_candidates, self.config.batch_size)
+        llm_results = []
+        if prompts:
+            scheduler = LLMScheduler(LLMUtils.get_llm_model(llm_config), config.scheduler_config)
+            for names, response in zip(batched_names, scheduler.run(prompts)):
+                if response.error is not None:
+                    self.logger.error(f"Error detecting burnout for batch {names}: {response.error}")
+                    llm_results.extend({"name": name, "error": response.error} for name in names)
+                else:
+                    llm_results.extend(parse_bulk_response(response.output, names))
+            self.logger.info(f"Burnout detection scheduler stats: {scheduler.stats}")
 
-        pass
\ No newline at end of file
+        llm_results = iter(llm_results)
+        results = []
+        for candidate, decision in zip(burnout_candidates, screened):
+            if decision is None:
+                results.append(next(llm_results))
+            elif decision.escalate:
+                results.append({**next(llm_results), "prescreen": decision.to_dict()})
+            else:
+                results.append({
+                    "name": candidate["name"],
+                    "burnout_reason": "None (no burnout signal found by pre-screening)",
+                    "burnout_severity": "none",
+                    "additional_information": f"Pre-screening score {decision.score} is below the risk threshold, "
+                                              "so the engineer was not assessed by the LLM.",
+                    "prescreen": decision.to_dict(),
+                })
+        return results
@@ -0,0 +1,155 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from src.burnout_detector.incident_batch import IncidentBatch
+    from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+    from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+    from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+
+@dataclass
+class PrefetchStats:
+    hits: int = 0  # tool calls answered from prefetched data
+    misses: int = 0  # tool calls the prefetched data did not cover, which went to Rootly
+
+
+class Prefetch:
+    """
+    Rootly data for one candidate, fetched concurrently before the agent's first step.
+
+    The candidate is resolved with the same search the agent's `users_tool` call makes; their incidents and on-call
+    shifts over the metrics window, and all schedules, are then fetched in parallel. Schedules are the same for every
+    candidate: with the response cache of the shared Rootly client, a process fetches them once per cache TTL however
+    many candidates it prefetches. Tools given the prefetch (like the context budget, for the duration of a run) answer
+    calls it covers from it, waiting for a fetch still in flight, instead of making the agent wait on Rootly between
+    LLM steps. Calls it does not cover, and calls whose prefetch failed, go to Rootly as usual.
+    """
+
+    def __init__(
+            self,
+            users_tool: "UsersTool",
+            incidents_tool: "IncidentsTool",
+            shifts_tool: "ShiftsTool",
+            burnout_candidate: str,
+            window_days: int,
+            now: Optional[datetime] = None
+    ):
+        self.burnout_candidate = burnout_candidate
+        self.now = now if now is not None else datetime.now(timezone.utc)
+        self.window_start = (self.now - timedelta(days=window_days)).isoformat()
+        self.stats = PrefetchStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="prefetch")
+
+        self._users = self._submit(lambda: list(users_tool.iter_users(search=burnout_candidate)))
+        self._schedules = self._submit(lambda: list(shifts_tool.iter_schedules()))
+        self._incidents = self._submit(lambda: self._for_user(
+            lambda user_id: incidents_tool.fetch_batch(user_id=user_id, created_at_gte=self.window_start)
+        ))
+        self._shifts = self._submit(lambda: self._for_user(
+            lambda user_id: list(shifts_tool.iter_shifts(self.window_start, self.now.isoformat(), user_ids=[user_id]))
+        ))
+
+    def _submit(self, function) -> Future:
+        return self._executor.submit(contextvars.copy_context().run, function)
+
+    def _for_user(self, fetch):
+        return None if (user := self.user()) is None else fetch(user["id"])
+
+    def user(self) -> Optional[dict]:
+        """
+        The candidate's Rootly user (the first search match), or None if nobody matches.
+
+        Raises:
+            Exception: Whatever fetching the users raised.
+        """
+        return next(iter(self._users.result()), None)
+
+    def incidents(self) -> Optional["IncidentBatch"]:
+        """
+        The candidate's incidents created within the window, or None if the candidate is unknown.
+        """
+        return self._incidents.result()
+
+    def shifts(self) -> Optional[List[dict]]:
+        """
+        The candidate's on-call shifts overlapping the window, or None if the candidate is unknown.
+        """
+        return self._shifts.result()
+
+    def schedules(self) -> List[dict]:
+        """
+        All schedules.
+
+        Raises:
+            Exception: Whatever fetching the schedules raised.
+        """
+        return self._schedules.result()
+
+    def lookup(self, tool_name: str, **arguments) -> Optional[list]:
+        """
+        The result of a tool call, if the prefetched data covers it.
+
+        Returns:
+            list: The records the tool would have returned, or None if the call has to go to Rootly.
+        """
+        try:
+            records = self._lookup(tool_name, arguments)
+        except Exception:
+            records = None  # the prefetch failed: let the tool make (and report) the call itself
+        with self._lock:
+            if records is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return records
+
+    def _lookup(self, tool_name: str, arguments: dict) -> Optional[list]:
+        from src.burnout_detector.workload_metrics import MISSING_TIME, parse_epoch
+
+        def created_within(record: dict, gte: Optional[str], lte: Optional[str]) -> bool:
+            created = parse_epoch(record.get("created_at"))
+            return (not gte or created >= parse_epoch(gte)) and (not lte or created <= parse_epoch(lte))
+
+        if tool_name == "users_tool":
+            if arguments.get("email") or arguments.get("search") != self.burnout_candidate:
+                return None
+            return self._users.result()
+
+        if tool_name == "shifts_tool":
+            name, gte, lte = arguments.get("schedule_name"), arguments.get("starts_after"), arguments.get("ends_before")
+            if MISSING_TIME in {parse_epoch(value) for value in (gte, lte) if value}:
+                return None  # a malformed date: leave it to the API to reject
+            return [
+                schedule for schedule in self.schedules()
+                if (not name or schedule.get("name") == name) and created_within(schedule, gte, lte)
+            ]
+
+        if tool_name == "incidents_tool":
+            user, gte, lte = self.user(), arguments.get("created_at_gte"), arguments.get("created_at_lte")
+            if user is None or str(arguments.get("user_id")) != str(user["id"]):
+                return None
+            # Ranges starting before the window are not covered (ranges ending after it are: the prefetch is a
+            # snapshot taken at the start of the run).
+            if not gte or parse_epoch(gte) == MISSING_TIME or parse_epoch(gte) < parse_epoch(self.window_start):
+                return None
+            if lte and parse_epoch(lte) == MISSING_TIME:
+                return None
+            import numpy as np
+
+            incidents = self.incidents()
+            records = list(incidents.to_dicts(np.flatnonzero(incidents.mask(gte, lte))))
+            max_records = arguments.get("max_records")
+            return records[:max_records] if max_records else records
+        return None
+
+    def close(self):
+        """
+        Stop the fetches that have not started yet. Fetches in flight finish in the background.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,204 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from src.burnout_detector.burnout_result import BurnoutResult, BurnoutSeverity
+
+# numpy (through workload_metrics) and the tools are imported on first use, so that importing this module stays fast.
+if TYPE_CHECKING:
+    from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+    from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+    from src.burnout_detector.workload_metrics import WorkloadMetrics
+
+
+@dataclass
+class PrescreenConfig:
+    risk_threshold: float = 1.0  # engineers whose risk score reaches this are sent to the LLM
+    incidents_per_week: float = 3.0  # incident volume at which the volume signal reaches 1.0
+    high_severity_incidents: int = 2  # critical and high severity incidents at which the severity signal reaches 1.0
+    off_hours_ratio: float = 0.4  # share of incidents outside working hours (or on weekends) scoring 1.0
+    min_incidents_for_ratios: int = 3  # fewer incidents than this make the off-hours signal 0, as it is too noisy
+    on_call_hours_per_week: float = 40.0  # on-call load at which the on-call density signal reaches 1.0
+    consecutive_on_call_days: int = 7  # on-call streak at which the streak signal reaches 1.0
+    window_days: int = 90  # how far back the screener looks when it fetches the data itself
+    max_workers: int = 8  # concurrent incident fetches when screening many engineers
+
+
+@dataclass
+class PrescreenDecision:
+    escalate: bool  # whether the engineer should be assessed by the LLM
+    score: float  # the highest signal; at least `risk_threshold` means escalate
+    signals: Dict[str, float] = field(default_factory=dict)  # signal name to its value relative to its threshold
+    metrics: Dict[str, float] = field(default_factory=dict)  # the workload metrics the signals were computed from
+
+    def reasons(self) -> List[str]:
+        """
+        The signals that reached their threshold, strongest first.
+        """
+        return [name for name, value in sorted(self.signals.items(), key=lambda item: -item[1]) if value >= 1.0]
+
+    def to_dict(self) -> dict:
+        return {"escalate": self.escalate, "score": self.score, "signals": dict(self.signals),
+                "metrics": dict(self.metrics)}
+
+
+def prescreen_metrics(metrics: "WorkloadMetrics", window_days: int) -> Dict[str, float]:
+    """
+    The flat, numeric workload metrics the screener scores, as recorded with its decisions.
+    """
+    weeks = max(window_days / 7.0, 1.0)
+    by_severity = metrics.incidents_by_severity
+    return {
+        "incident_count": float(metrics.incident_count),
+        "incidents_per_week": round(metrics.incident_count / weeks, 3),
+        "high_severity_incidents": float(by_severity.get("critical", 0) + by_severity.get("high", 0)),
+        "off_hours_ratio": float(metrics.off_hours_ratio),
+        "weekend_ratio": float(metrics.weekend_ratio),
+        "on_call_hours_per_week": round(metrics.on_call_hours / weeks, 2),
+        "max_consecutive_on_call_days": float(metrics.max_consecutive_on_call_days),
+    }
+
+
+def prescreen(
+        metrics: "WorkloadMetrics",
+        window_days: int,
+        config: Optional[PrescreenConfig] = None
+) -> PrescreenDecision:
+    """
+    Score an engineer's workload with cheap deterministic rules.
+
+    Each signal is a metric divided by its configured threshold, so 1.0 means "at the threshold", and the risk score
+    is the strongest signal: any single dimension at its threshold is enough to send the engineer to the LLM.
+
+    Args:
+        metrics: The engineer's workload metrics.
+        window_days: The number of days the metrics cover, to turn counts and hours into weekly rates.
+        config: Optional screening thresholds.
+    """
+    config = config if config is not None else PrescreenConfig()
+    values = prescreen_metrics(metrics, window_days)
+
+    def ratio(value: float, threshold: float) -> float:
+        return round(value / threshold, 3) if threshold > 0 else 0.0
+
+    off_hours = max(values["off_hours_ratio"], values["weekend_ratio"])
+    signals = {
+        "incident_volume": ratio(values["incidents_per_week"], config.incidents_per_week),
+        "severity": ratio(values["high_severity_incidents"], config.high_severity_incidents),
+        "off_hours": ratio(off_hours, config.off_hours_ratio)
+        if metrics.incident_count >= config.min_incidents_for_ratios else 0.0,
+        "on_call_density": ratio(values["on_call_hours_per_week"], config.on_call_hours_per_week),
+        "on_call_streak": ratio(values["max_consecutive_on_call_days"], config.consecutive_on_call_days),
+    }
+    score = max(signals.values())
+    return PrescreenDecision(score >= config.risk_threshold, score, signals, values)
+
+
+def no_signal_result(engineer_name: str, engineer_id: Optional[str], decision: PrescreenDecision) -> BurnoutResult:
+    """
+    The verdict given without consulting the LLM to an engineer the screener did not escalate.
+    """
+    return BurnoutResult(
+        engineer_name, BurnoutSeverity.NONE, engineer_id=str(engineer_id) if engineer_id is not None else None,
+        supporting_metrics={**decision.metrics, "prescreen_score": decision.score},
+        additional_information=f"No burnout signal: pre-screening scored {decision.score} against a risk threshold "
+                               "that was not reached, so the engineer was not assessed by the LLM.",
+    )
+
+
+def no_signal_text(engineer_name: str, decision: PrescreenDecision) -> str:
+    """
+    `no_signal_result` in the free-text output format.
+    """
+    metrics = ", ".join(f"{name}: {value}" for name, value in decision.metrics.items())
+    return (f"- Engineer name: {engineer_name}\n"
+            f"- Burnout reason: None (no burnout signal found by pre-screening)\n"
+            f"- Burnout severity: none\n"
+            f"- Additional information: Pre-screening score {decision.score} is below the risk threshold, so the "
+            f"engineer was not assessed by the LLM. Metrics: {metrics}.")
+
+
+class Prescreener:
+    """
+    First stage of a two-stage sweep: fetches the incidents and on-call shifts of many engineers, computes their
+    workload metrics in one vectorised pass and scores them, so that only the engineers at risk reach the LLM.
+
+    Incidents are fetched per engineer, concurrently; shifts for all engineers come from one `/v1/shifts` query.
+    """
+
+    def __init__(
+            self,
+            config: Optional[PrescreenConfig] = None,
+            incidents_tool: Optional["IncidentsTool"] = None,
+            shifts_tool: Optional["ShiftsTool"] = None
+    ):
+        self.config = config if config is not None else PrescreenConfig()
+        if incidents_tool is None:
+            from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+            incidents_tool = IncidentsTool()
+        if shifts_tool is None:
+            from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+            shifts_tool = ShiftsTool()
+        self.incidents_tool = incidents_tool
+        self.shifts_tool = shifts_tool
+
+    def collect_metrics(
+            self,
+            time_zones: Dict[str, Optional[str]],
+            api_key: Optional[str] = None,
+            now: Optional[datetime] = None
+    ) -> Dict[str, "WorkloadMetrics"]:
+        """
+        Fetch the engineers' data over the last `window_days` and compute their workload metrics.
+
+        Args:
+            time_zones: Rootly user ID to the user's time zone (None for UTC).
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+            now: Optional reference time. Defaults to the current time.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching fails.
+        """
+        from src.burnout_detector.workload_metrics import compute_workload_metrics, utc_offset_seconds
+
+        if not time_zones:
+            return {}
+        now = now or datetime.now(timezone.utc)
+        window_start = (now - timedelta(days=self.config.window_days)).isoformat()
+        user_ids = list(time_zones)
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix="prescreen") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, self.incidents_tool.fetch_batch,
+                                user_id=user_id, created_at_gte=window_start, api_key=api_key)
+                for user_id in user_ids
+            ]
+            incidents = {user_id: future.result() for user_id, future in zip(user_ids, futures)}
+        shifts: Dict[str, List[dict]] = {user_id: [] for user_id in user_ids}
+        for shift in self.shifts_tool.iter_shifts(window_start, now.isoformat(), user_ids=user_ids, api_key=api_key):
+            if shift.get("user_id") in shifts:
+                shifts[shift["user_id"]].append(shift)
+
+        return compute_workload_metrics(
+            incidents, shifts, now=int(now.timestamp()),
+            utc_offsets_seconds={user_id: utc_offset_seconds(zone, now) for user_id, zone in time_zones.items()},
+        )
+
+    def screen(
+            self,
+            time_zones: Dict[str, Optional[str]],
+            api_key: Optional[str] = None,
+            now: Optional[datetime] = None
+    ) -> Dict[str, PrescreenDecision]:
+        """
+        Fetch, compute and score the workload of many engineers. Takes the same arguments as `collect_metrics`.
+
+        Returns:
+            dict: Rootly user ID to the screening decision.
+        """
+        return {
+            user_id: prescreen(metrics, self.config.window_days, self.config)
+            for user_id, metrics in self.collect_metrics(time_zones, api_key=api_key, now=now).items()
+        }
@@ -0,0 +1,450 @@
+import argparse
+import heapq
+import itertools
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from src.burnout_detector.workload_metrics import (
+    MISSING_TIME, SEVERITY_LEVELS, WorkloadMetricsConfig, local_time_flags, parse_epoch, severity_code,
+)
+
+if TYPE_CHECKING:
+    from src.burnout_detector.stream import WorkloadEvent
+    from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient
+
+
+DIMENSIONS = ("team", "schedule", "service", "environment", "severity")
+MEASURES = (
+    "incidents",  # incidents, each counted once per cell however many of its engineers, services... fall in it
+    "off_hours_incidents",  # incidents that started outside the local working hours of one of their engineers
+    "resolve_hours",  # total time to resolve of the resolved incidents
+    "resolved_incidents",
+    "shifts",  # on-call shifts
+    "on_call_hours",
+    "scored_engineers",  # engineers with a risk score
+    "risk_sum",  # sum of their risk scores; "mean_risk" in query results is risk_sum / scored_engineers
+    "at_risk_engineers",  # engineers whose risk score reaches `risk_threshold`
+)
+_COUNTS = tuple(MEASURES.index(name) for name in ("incidents", "shifts", "scored_engineers"))  # facts per cell
+_FACT_DIMENSIONS = {  # the dimensions each kind of fact is broken down by
+    "incident": ("team", "service", "environment", "severity"),
+    "shift": ("team", "schedule"),
+    "risk": ("team",),
+}
+
+
+@dataclass
+class RollupConfig:
+    risk_threshold: float = 2.0  # risk score from which an engineer counts as at risk (2.0 is "moderate" burnout)
+    window_days: int = 90  # incidents created and shifts ended longer ago than this are dropped from the cube
+    page_size: int = 100  # page[size] of the Rootly pulls
+    metrics: WorkloadMetricsConfig = field(default_factory=WorkloadMetricsConfig)  # working hours for off-hours load
+
+
+@dataclass
+class _Fact:
+    kind: str
+    user_ids: Tuple[str, ...]  # engineers whose team the fact is attributed to
+    dimensions: Dict[str, Tuple]  # dimension -> its values for this fact, without "team"
+    measures: Dict[str, float]
+    applied: Optional[Dict[str, Tuple]] = None  # all dimension values the fact was last aggregated with
+    time: Optional[int] = None  # epoch seconds the window is measured against; None for facts that do not expire
+
+
+class RollupCube:
+    """
+    Pre-aggregated burnout dashboard data: incident load, on-call hours and risk scores by team, schedule, service,
+    environment and severity.
+
+    Every fact (an incident, an on-call shift, or an engineer's risk score) is added to one cell of every group-by
+    over the dimensions it has, so any slice or dice query is a lookup in one precomputed group-by, without touching
+    the facts or Rootly. Facts are keyed, so re-adding a changed incident or shift replaces its contribution, and
+    updates cost one pass over the group-bys of that fact. A fact with several values of a dimension (an incident on
+    two services) counts once under each value and once in every group-by without that dimension.
+
+    The cube covers a sliding window: `sync`, `apply` and `expire` drop the incidents created and the shifts ended
+    more than `window_days` ago, so a cube kept up to date for months matches one freshly loaded with `sync`.
+    """
+
+    def __init__(self, config: Optional[RollupConfig] = None):
+        self.config = config if config is not None else RollupConfig()
+        self._lock = threading.RLock()
+        self._facts: Dict[str, _Fact] = {}
+        self._cells: Dict[FrozenSet[str], Dict[Tuple, List[float]]] = {}
+        self._teams: Dict[str, str] = {}  # engineer ID -> team
+        self._facts_by_user: Dict[str, set] = {}  # engineer ID -> IDs of the facts attributed to their team
+        self._schedules: Dict[str, dict] = {}  # schedule ID -> processed schedule, for names and owner teams
+        self._utc_offsets: Dict[str, int] = {}
+        self._watermark: Optional[str] = None  # newest incident `updated_at` seen by `sync`
+        self._expiry: List[Tuple[int, str]] = []  # heap of (time, fact ID); entries of replaced facts are skipped
+        self._newest: Optional[int] = None  # newest incident time, the end of the window when no time is given
+
+    def _team_values(self, fact: _Fact) -> Tuple:
+        teams = {self._teams[user_id] for user_id in fact.user_ids if user_id in self._teams}
+        if not teams and fact.kind == "shift":
+            teams = set(fact.dimensions.get("_owner_groups", ()))  # fall back to the schedule's owner teams
+        return tuple(sorted(teams)) or (None,)
+
+    def _aggregate(self, dimensions: Dict[str, Tuple], measures: Dict[str, float], sign: int):
+        names = [name for name in DIMENSIONS if name in dimensions]
+        for size in range(len(names) + 1):
+            for group in itertools.combinations(names, size):
+                cells = self._cells.setdefault(frozenset(group), {})
+                for key in set(itertools.product(*(dimensions[name] for name in group))):
+                    totals = cells.setdefault(key, [0.0] * len(MEASURES))
+                    for position, measure in enumerate(MEASURES):
+                        totals[position] += sign * measures.get(measure, 0.0)
+                    if sum(totals[position] for position in _COUNTS) < 0.5:
+                        del cells[key]  # no facts left; sums such as resolve_hours may only be ~0 after rounding
+
+    def _apply(self, fact_id: str, fact: Optional[_Fact]):
+        old = self._facts.pop(fact_id, None)
+        if old is not None:
+            self._aggregate(old.applied, old.measures, -1)
+            for user_id in old.user_ids:
+                self._facts_by_user.get(user_id, set()).discard(fact_id)
+        if fact is not None:
+            fact.applied = {**{k: v for k, v in fact.dimensions.items() if not k.startswith("_")},
+                            "team": self._team_values(fact)}
+            self._aggregate(fact.applied, fact.measures, 1)
+            self._facts[fact_id] = fact
+            if fact.time is not None:
+                heapq.heappush(self._expiry, (fact.time, fact_id))
+            for user_id in fact.user_ids:
+                self._facts_by_user.setdefault(user_id, set()).add(fact_id)
+
+    def add_incident(self, incident: dict, user_ids: Iterable[str]):
+        """
+        Add or replace an incident, as processed by `IncidentsTool`, with the engineers involved in it.
+        """
+        user_ids = tuple(sorted({str(user_id) for user_id in user_ids}))
+        started = parse_epoch(incident.get("started_at"))
+        started = started if started != MISSING_TIME else parse_epoch(incident.get("created_at"))
+        resolved = parse_epoch(incident.get("resolved_at"))
+        off_hours = started != MISSING_TIME and any(
+            local_time_flags(started, self._utc_offsets.get(user_id, 0), self.config.metrics)[0]
+            for user_id in user_ids or ("",)
+        )
+        created = parse_epoch(incident.get("created_at"))
+        created = created if created != MISSING_TIME else started
+        measures = {"incidents": 1.0, "off_hours_incidents": float(off_hours)}
+        if resolved != MISSING_TIME and started != MISSING_TIME and resolved >= started:
+            measures.update(resolve_hours=(resolved - started) / 3600.0, resolved_incidents=1.0)
+        severity = SEVERITY_LEVELS[severity_code(incident.get("severity_level") or incident.get("severity_name"))]
+        dimensions = {
+            "service": tuple(sorted(set(incident.get("services") or []))) or (None,),
+            "environment": tuple(sorted(set(incident.get("environments") or []))) or (None,),
+            "severity": (severity,),
+        }
+        time = created if created != MISSING_TIME else None
+        with self._lock:
+            self._apply(f"incident:{incident.get('incident_id')}",
+                        _Fact("incident", user_ids, dimensions, measures, time=time))
+            if time is not None and (self._newest is None or time > self._newest):
+                self._newest = time
+
+    def add_shift(self, shift: dict):
+        """
+        Add or replace an on-call shift, as returned by `ShiftsTool.iter_shifts`. Shifts of engineers without a known
+        team count towards the owner teams of their schedule.
+        """
+        starts_at, ends_at = parse_epoch(shift.get("starts_at")), parse_epoch(shift.get("ends_at"))
+        hours = (ends_at - starts_at) / 3600.0 if MISSING_TIME not in (starts_at, ends_at) and ends_at > starts_at else 0
+        with self._lock:
+            schedule = self._schedules.get(str(shift.get("schedule_id"))) or {}
+            dimensions = {
+                "schedule": (schedule.get("name") or shift.get("schedule_id"),),
+                "_owner_groups": tuple(str(group) for group in schedule.get("owner_group_ids") or []),
+            }
+            user_ids = (str(shift["user_id"]),) if shift.get("user_id") is not None else ()
+            self._apply(f"shift:{shift.get('id')}", _Fact(
+                "shift", user_ids, dimensions, {"shifts": 1.0, "on_call_hours": hours},
+                time=ends_at if ends_at != MISSING_TIME else None,
+            ))
+
+    def set_risk(self, user_id: str, score: Optional[float]):
+        """
+        Set (or, with None, clear) an engineer's current risk score, e.g. a `ScoreStore` score or a pre-screening
+        score.
+        """
+        fact = None
+        if score is not None:
+            fact = _Fact("risk", (str(user_id),), {}, {
+                "scored_engineers": 1.0, "risk_sum": float(score),
+                "at_risk_engineers": float(score >= self.config.risk_threshold),
+            })
+        with self._lock:
+            self._apply(f"risk:{user_id}", fact)
+
+    def remove(self, kind: str, record_id: str):
+        """
+        Remove an incident, shift or risk fact, e.g. after it was deleted upstream.
+        """
+        with self._lock:
+            self._apply(f"{kind}:{record_id}", None)
+
+    def set_teams(self, teams: Dict[str, str]):
+        """
+        Assign engineers to teams. The facts of engineers whose team changed are re-aggregated.
+        """
+        with self._lock:
+            changed = {str(user_id) for user_id, team in teams.items() if self._teams.get(str(user_id)) != team}
+            self._teams.update({str(user_id): team for user_id, team in teams.items()})
+            for fact_id in {fact_id for user_id in changed for fact_id in self._facts_by_user.get(user_id, ())}:
+                fact = self._facts[fact_id]
+                self._apply(fact_id, _Fact(fact.kind, fact.user_ids, fact.dimensions, fact.measures, time=fact.time))
+
+    def set_schedules(self, schedules: Iterable[dict]):
+        """
+        Register processed schedules (from `ShiftsTool`), for schedule names and owner teams of later shifts.
+        """
+        with self._lock:
+            self._schedules.update({str(schedule["id"]): schedule for schedule in schedules})
+
+    def set_utc_offsets(self, utc_offsets: Dict[str, int]):
+        """
+        Register engineers' UTC offsets in seconds, for the off-hours counts of later incidents.
+        """
+        with self._lock:
+            self._utc_offsets.update({str(user_id): offset for user_id, offset in utc_offsets.items()})
+
+    def apply(self, event: "WorkloadEvent", now: Optional[datetime] = None):
+        """
+        Apply a streaming `WorkloadEvent`, so that the cube can be kept current from the same event source as
+        `StreamingRescorer`, and drop the facts that left the window (see `expire`).
+        """
+        if event.kind == "incident":
+            if event.deleted:
+                self.remove("incident", event.record.get("incident_id"))
+            else:
+                self.add_incident(event.record, event.user_ids)
+        elif event.deleted:
+            self.remove("shift", event.record.get("id"))
+        else:
+            self.add_shift(event.record)
+        self.expire(now)
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop the incidents created and the shifts ended more than `window_days` before `now`.
+
+        Args:
+            now: End of the window. Defaults to the newest incident seen, like the stream's event time.
+
+        Returns:
+            int: Number of facts dropped.
+        """
+        with self._lock:
+            end = int(now.timestamp()) if now is not None else self._newest
+            if end is None:
+                return 0
+            cutoff = end - self.config.window_days * 86400
+            dropped = 0
+            while self._expiry and self._expiry[0][0] < cutoff:
+                time, fact_id = heapq.heappop(self._expiry)
+                fact = self._facts.get(fact_id)
+                if fact is not None and fact.time == time:
+                    self._apply(fact_id, None)
+                    dropped += 1
+            return dropped
+
+    def query(
+            self,
+            group_by: Sequence[str] = (),
+            where: Optional[Dict[str, object]] = None,
+            measures: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        """
+        Slice and dice the precomputed aggregates.
+
+        Args:
+            group_by: Dimensions to break the measures down by, e.g. ("team", "severity").
+            where: Dimension values to restrict to, e.g. {"service": "api"}; a list or set selects any of its values.
+            measures: Measures to return. Defaults to all, plus "mean_risk".
+
+        Returns:
+            list: One dictionary per non-empty cell, with the `group_by` dimensions and the measures, sorted by the
+                dimension values.
+
+        Raises:
+            ValueError: If a dimension or measure is unknown.
+        """
+        where = dict(where or {})
+        unknown = [name for name in (*group_by, *where) if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}; expected some of {DIMENSIONS}.")
+        measures = list(measures) if measures is not None else [*MEASURES, "mean_risk"]
+        if unknown := [name for name in measures if name not in MEASURES and name != "mean_risk"]:
+            raise ValueError(f"Unknown measures {unknown}; expected some of {MEASURES}.")
+
+        group = [name for name in DIMENSIONS if name in group_by or name in where]
+        accepted = {
+            name: set(value) if isinstance(value, (list, tuple, set, frozenset)) else {value}
+            for name, value in where.items()
+        }
+        with self._lock:
+            cells = list(self._cells.get(frozenset(group), {}).items())
+
+        rows: Dict[Tuple, List[float]] = {}
+        for key, totals in cells:
+            values = dict(zip(group, key))
+            if any(values[name] not in accepted[name] for name in accepted):
+                continue
+            out_key = tuple(values[name] for name in group_by)
+            if len(group_by) == len(group):
+                rows[out_key] = totals
+            else:
+                # Several selected values of a filtered dimension: summed, so a fact with more than one of them (an
+                # incident on two selected services) counts once per value.
+                current = rows.setdefault(out_key, [0.0] * len(MEASURES))
+                rows[out_key] = [a + b for a, b in zip(current, totals)]
+
+        result = []
+        for key in sorted(rows, key=lambda key: [(value is None, str(value)) for value in key]):
+            totals = dict(zip(MEASURES, rows[key]))
+            totals["mean_risk"] = totals["risk_sum"] / totals["scored_engineers"] if totals["scored_engineers"] else 0.0
+            row = dict(zip(group_by, key))
+            row.update({name: round(totals[name], 6) for name in measures})
+            result.append(row)
+        return result
+
+    def sync(
+            self,
+            client: Optional["RootlyClient"] = None,
+            api_key: Optional[str] = None,
+            now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Load (on the first call) or update the cube from Rootly: teams, schedules, the incidents created within
+        `window_days` (afterwards only those updated since the last sync) and the shifts of the window.
+
+        Args:
+            client: Optional Rootly client. Defaults to the shared client.
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+            now: End of the window. Defaults to the current time.
+
+        Returns:
+            dict: Number of records loaded per resource.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching fails.
+        """
+        from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+        from src.burnout_detector.tools.rootly_tools.pagination import iter_records
+        from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+        from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+        from src.burnout_detector.tools.rootly_tools.snapshot_store import to_epoch
+
+        client = client if client is not None else get_rootly_client()
+        page_size = self.config.page_size
+        now = now if now is not None else datetime.now(timezone.utc)
+        window_start = (now - timedelta(days=self.config.window_days)).isoformat()
+
+        teams = {}
+        # A sync must see the latest data, so it bypasses the client's response cache.
+        for team in iter_records(client, "/v1/teams", page_size=page_size, api_key=api_key, use_cache=False):
+            for user_id in (team.get("attributes") or {}).get("user_ids") or []:
+                teams.setdefault(str(user_id), (team.get("attributes") or {}).get("name") or str(team.get("id")))
+        schedules = [
+            processed
+            for raw in iter_records(client, "/v1/schedules", page_size=page_size, api_key=api_key, use_cache=False)
+            if (processed := ShiftsTool.process_schedule(raw)) is not None
+        ]
+        self.set_teams(teams)
+        self.set_schedules(schedules)
+
+        params = {"filter[updated_at][gte]": self._watermark} if self._watermark \
+            else IncidentsTool.build_params(created_at_gte=window_start)
+        incidents = 0
+        for raw in iter_records(client, "/v1/incidents", params, page_size=page_size, api_key=api_key,
+                                use_cache=False):
+            if (processed := IncidentsTool.process_incident(raw)) is None:
+                continue
+            self.add_incident(processed, IncidentsTool.related_user_ids(raw))
+            incidents += 1
+            updated_at = processed.get("updated_at")
+            if (epoch := to_epoch(updated_at)) is not None and epoch > (to_epoch(self._watermark) or 0):
+                self._watermark = updated_at
+
+        shifts = 0
+        for shift in ShiftsTool(client=client, page_size=page_size).iter_shifts(window_start, now.isoformat(),
+                                                                                api_key=api_key):
+            self.add_shift(shift)
+            shifts += 1
+        self.expire(now)
+        return {"teams": len(set(teams.values())), "schedules": len(schedules), "incidents": incidents,
+                "shifts": shifts}
+
+    def save(self, path: str):
+        """
+        Write the cube (facts and precomputed aggregates) to a JSON file, replacing it atomically.
+        """
+        with self._lock:
+            state = {
+                "cells": [[sorted(group), [[list(key), totals] for key, totals in cells.items()]]
+                          for group, cells in self._cells.items()],
+                "facts": {fact_id: [fact.kind, fact.user_ids, fact.dimensions, fact.measures, fact.applied, fact.time]
+                          for fact_id, fact in self._facts.items()},
+                "teams": self._teams, "schedules": self._schedules, "utc_offsets": self._utc_offsets,
+                "watermark": self._watermark, "newest": self._newest,
+            }
+        with open(path + ".tmp", "w") as file:
+            json.dump(state, file)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, config: Optional[RollupConfig] = None) -> "RollupCube":
+        """
+        Read a cube written by `save`. The aggregates are loaded as stored, not recomputed.
+        """
+        with open(path) as file:
+            state = json.load(file)
+        cube = cls(config)
+        cube._cells = {
+            frozenset(group): {tuple(key): totals for key, totals in cells} for group, cells in state["cells"]
+        }
+        for fact_id, (kind, user_ids, dimensions, measures, applied, time) in state["facts"].items():
+            cube._facts[fact_id] = _Fact(kind, tuple(user_ids), {k: tuple(v) for k, v in dimensions.items()},
+                                         measures, {k: tuple(v) for k, v in applied.items()}, time)
+            for user_id in user_ids:
+                cube._facts_by_user.setdefault(user_id, set()).add(fact_id)
+            if time is not None:
+                cube._expiry.append((time, fact_id))
+        heapq.heapify(cube._expiry)
+        cube._teams, cube._schedules, cube._utc_offsets = state["teams"], state["schedules"], state["utc_offsets"]
+        cube._watermark, cube._newest = state["watermark"], state["newest"]
+        return cube
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Query (and refresh) the burnout rollup cube.")
+    parser.add_argument("--path", required=True, help="JSON file the cube is kept in.")
+    parser.add_argument("--sync", action="store_true", help="Load new and updated Rootly data before querying.")
+    parser.add_argument("--scores", help="Optional score store whose latest scores set the engineers' risk.")
+    parser.add_argument("--group-by", nargs="*", default=["team"], help=f"Dimensions among {DIMENSIONS}.")
+    parser.add_argument("--where", nargs="*", default=[], help="Filters as dimension=value.")
+    args = parser.parse_args(argv)
+
+    cube = RollupCube.load(args.path) if os.path.exists(args.path) else RollupCube()
+    if args.sync:
+        print(f"Synced: {cube.sync()}")
+    if args.scores:
+        from src.burnout_detector.score_store import ScoreStore, ScoreStoreConfig
+
+        store = ScoreStore(ScoreStoreConfig(path=args.scores))
+        for engineer_id in store.trends(min_points=1):
+            points = store.range(engineer_id)
+            cube.set_risk(engineer_id, points[-1][1] if points else None)
+    if args.sync or args.scores:
+        cube.save(args.path)
+    where = dict(condition.split("=", 1) for condition in args.where)
+    for row in cube.query(args.group_by, where):
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
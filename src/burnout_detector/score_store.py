@@ -0,0 +1,542 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.burnout_detector.burnout_result import BurnoutResult, BurnoutSeverity
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    engineer_id TEXT NOT NULL,
+    series TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    min_ts INTEGER NOT NULL,
+    max_ts INTEGER NOT NULL,
+    min_value REAL NOT NULL,
+    max_value REAL NOT NULL,
+    sum_t REAL NOT NULL,
+    sum_v REAL NOT NULL,
+    sum_tt REAL NOT NULL,
+    sum_tv REAL NOT NULL,
+    PRIMARY KEY (engineer_id, series, block)
+);
+CREATE INDEX IF NOT EXISTS blocks_series_time ON blocks (series, max_ts, min_ts);
+CREATE TABLE IF NOT EXISTS teams (
+    engineer_id TEXT PRIMARY KEY,
+    team TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS teams_team ON teams (team);
+"""
+
+SEVERITY_SCORES = {  # numeric burnout score recorded for each verdict severity; UNKNOWN verdicts are not recorded
+    BurnoutSeverity.NONE: 0.0,
+    BurnoutSeverity.LOW: 1.0,
+    BurnoutSeverity.MODERATE: 2.0,
+    BurnoutSeverity.HIGH: 3.0,
+    BurnoutSeverity.SEVERE: 4.0,
+}
+_SECONDS_PER_DAY = 86400.0
+_T_REFERENCE = 1_577_836_800  # 2020-01-01; regression sums use days since then, to keep them well conditioned
+
+
+@dataclass
+class ScoreStoreConfig:
+    path: str = field(default_factory=lambda: os.getenv("BURNOUT_SCORE_STORE", ":memory:"))  # SQLite file
+    block_seconds: int = 7 * 86400  # time period each block covers; a point in a later period starts a new block
+    scale: int = 1000  # values are stored as fixed-point integers with this many steps per unit
+
+
+@dataclass
+class ScoreStoreStats:
+    engineers: int = 0
+    series: int = 0  # (engineer, series) pairs
+    points: int = 0
+    blocks: int = 0
+    bytes: int = 0  # encoded size of the points
+
+
+@dataclass
+class Trend:
+    engineer_id: str
+    series: str
+    points: int
+    slope_per_day: float  # least-squares slope of the values over time
+    mean: float
+    min: float
+    max: float
+
+
+def _put_varint(buffer: bytearray, value: int):
+    value = (value << 1) if value >= 0 else ((-value) << 1) - 1  # zigzag, so small negative deltas stay small
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varints(data: bytes) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append((value >> 1) if not value & 1 else -((value + 1) >> 1))
+        value, shift = 0, 0
+    return values
+
+
+def decode_block(data: bytes, scale: int) -> Tuple[List[int], List[float]]:
+    """
+    Decode a block's (timestamp, value) pairs, stored as zigzag varint deltas of the epoch seconds and of the
+    fixed-point values.
+    """
+    deltas = _read_varints(data)
+    timestamps, values = [], []
+    timestamp = fixed = 0
+    for i in range(0, len(deltas) - 1, 2):
+        timestamp += deltas[i]
+        fixed += deltas[i + 1]
+        timestamps.append(timestamp)
+        values.append(fixed / scale)
+    return timestamps, values
+
+
+def decode_blocks(blocks: List[bytes], counts: Sequence[int], scale: int):
+    """
+    Vectorised `decode_block` over many blocks.
+
+    Args:
+        blocks: The encoded blocks.
+        counts: The number of points in each block.
+        scale: The fixed-point scale.
+
+    Returns:
+        tuple: numpy arrays of each point's block (position in `blocks`), timestamp and value.
+    """
+    import numpy as np
+
+    buffer = np.frombuffer(b"".join(blocks), dtype=np.uint8)
+    counts = np.asarray(counts, dtype=np.int64)
+    if buffer.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    last_byte = buffer < 0x80
+    varint = np.concatenate(([0], np.cumsum(last_byte)[:-1]))  # the varint each byte belongs to
+    first_byte = np.flatnonzero(np.concatenate(([True], last_byte[:-1])))
+    shift = (np.arange(buffer.size) - first_byte[varint]) * 7
+    # Varints of epoch-second and fixed-point deltas stay far below 2**53, so float64 sums are exact.
+    raw = np.bincount(varint, weights=(buffer & 0x7F) * np.exp2(shift)).astype(np.int64)
+    deltas = ((raw >> 1) ^ -(raw & 1)).reshape(-1, 2)
+
+    block = np.repeat(np.arange(counts.size), counts)
+    starts = np.cumsum(counts) - counts
+    totals = np.cumsum(deltas, axis=0)
+    offsets = np.concatenate(([[0, 0]], totals[starts[counts > 0][1:] - 1])) if counts.any() else totals[:0]
+    decoded = totals - np.repeat(offsets, counts[counts > 0], axis=0)
+    return block, decoded[:, 0], decoded[:, 1] / scale
+
+
+class _Head:
+    """
+    The open (last, unsealed) block of a series, kept in memory so that appending only encodes the new point.
+    """
+
+    def __init__(self, block: int):
+        self.block = block
+        self.data = bytearray()
+        self.count = 0
+        self.last_ts = 0
+        self.last_fixed = 0
+        self.min_ts = self.max_ts = 0
+        self.min_value = self.max_value = 0.0
+        self.sums = [0.0, 0.0, 0.0, 0.0]  # sum of t, v, t*t, t*v, with t in days since _T_REFERENCE
+
+    def add(self, timestamp: int, fixed: int, scale: int):
+        _put_varint(self.data, timestamp - self.last_ts)
+        _put_varint(self.data, fixed - self.last_fixed)
+        self.last_ts, self.last_fixed = timestamp, fixed
+        value, t = fixed / scale, (timestamp - _T_REFERENCE) / _SECONDS_PER_DAY
+        if self.count == 0:
+            self.min_ts = self.max_ts = timestamp
+            self.min_value = self.max_value = value
+        else:
+            self.min_ts, self.max_ts = min(self.min_ts, timestamp), max(self.max_ts, timestamp)
+            self.min_value, self.max_value = min(self.min_value, value), max(self.max_value, value)
+        self.count += 1
+        self.sums[0] += t
+        self.sums[1] += value
+        self.sums[2] += t * t
+        self.sums[3] += t * value
+
+
+class _SeriesIndex:
+    """
+    In-memory summaries (count, time range, value range and regression sums) and encoded points of every block of
+    one series, exposed as numpy columns for vectorised queries. Kept up to date as blocks are written.
+    """
+
+    _COLUMNS = ("code", "min_ts", "max_ts", "count", "min_value", "max_value", "sum_t", "sum_v", "sum_tt", "sum_tv")
+
+    def __init__(self):
+        self.engineers: List[str] = []
+        self.codes: Dict[str, int] = {}  # engineer ID -> position in `engineers`
+        self.rows: Dict[Tuple[str, int], int] = {}  # (engineer ID, block) -> row
+        self.values: Dict[str, list] = {name: [] for name in self._COLUMNS}
+        self.data: List[bytes] = []
+        self._arrays: Optional[dict] = None
+
+    def update(self, engineer_id: str, block: int, count: int, data: bytes, min_ts: int, max_ts: int,
+               min_value: float, max_value: float, sum_t: float, sum_v: float, sum_tt: float, sum_tv: float):
+        if engineer_id not in self.codes:
+            self.codes[engineer_id] = len(self.engineers)
+            self.engineers.append(engineer_id)
+        row = (self.codes[engineer_id], min_ts, max_ts, count, min_value, max_value, sum_t, sum_v, sum_tt, sum_tv)
+        position = self.rows.get((engineer_id, block))
+        if position is None:
+            self.rows[(engineer_id, block)] = len(self.data)
+            self.data.append(bytes(data))
+            for name, value in zip(self._COLUMNS, row):
+                self.values[name].append(value)
+        else:
+            self.data[position] = bytes(data)
+            for name, value in zip(self._COLUMNS, row):
+                self.values[name][position] = value
+        self._arrays = None
+
+    def arrays(self) -> dict:
+        import numpy as np
+
+        if self._arrays is None:
+            self._arrays = {
+                name: np.asarray(values, dtype=np.int64 if name in ("code", "min_ts", "max_ts", "count") else float)
+                for name, values in self.values.items()
+            }
+        return self._arrays
+
+
+class ScoreStore:
+    """
+    Append-only time series of per-engineer burnout scores and supporting metrics, for trend reports without any LLM
+    or Rootly calls.
+
+    Each (engineer, series) is stored in SQLite as one block per `block_seconds` period, its points encoded as
+    varint deltas of the timestamps and of the fixed-point values, so a point typically takes a few bytes. Every
+    block also keeps the count, range and regression sums of its points. Range queries decode only the blocks
+    overlapping the range. Trends over thousands of engineers are computed with numpy from an in-memory index of the
+    block summaries: fully covered blocks contribute their sums, and only the (at most two) periods at the edges of
+    the range are decoded. The index assumes this object is the only writer of the file.
+    """
+
+    def __init__(self, config: Optional[ScoreStoreConfig] = None):
+        self.config = config if config is not None else ScoreStoreConfig()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.config.path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._heads: Dict[Tuple[str, str], _Head] = {}
+        self._indexes: Dict[str, _SeriesIndex] = {}  # series -> block summaries, loaded on the first query
+
+    def _head(
+            self,
+            engineer_id: str,
+            series: str,
+            timestamp: int,
+            touched: Dict[Tuple[str, str, int], _Head]
+    ) -> _Head:
+        """
+        The block a point goes into. The block last appended to is kept per series, so appending in time order
+        loads each block at most once; blocks with points not written yet (`touched`) are never reloaded.
+        """
+        key = (engineer_id, series)
+        block = timestamp // self.config.block_seconds
+        head = self._heads.get(key)
+        if head is not None and head.block == block:
+            return head
+        if (head := touched.get((*key, block))) is not None:
+            self._heads[key] = head
+        else:
+            row = self._connection.execute(
+                "SELECT data FROM blocks WHERE engineer_id = ? AND series = ? AND block = ?", (*key, block)
+            ).fetchone()
+            head = self._heads[key] = _Head(block)
+            if row is not None:
+                for point_timestamp, value in zip(*decode_block(row[0], self.config.scale)):
+                    head.add(point_timestamp, round(value * self.config.scale), self.config.scale)
+        return head
+
+    def _write(self, engineer_id: str, series: str, head: _Head):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO blocks (engineer_id, series, block, count, data, min_ts, max_ts, min_value, "
+            "max_value, sum_t, sum_v, sum_tt, sum_tv) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (engineer_id, series, head.block, head.count, bytes(head.data), head.min_ts, head.max_ts,
+             head.min_value, head.max_value, *head.sums),
+        )
+        if (index := self._indexes.get(series)) is not None:
+            index.update(engineer_id, head.block, head.count, head.data, head.min_ts, head.max_ts, head.min_value,
+                         head.max_value, *head.sums)
+
+    def append_many(self, points: Iterable[Tuple[str, int, Dict[str, float]]]):
+        """
+        Append many points in one transaction.
+
+        Args:
+            points: (engineer ID, epoch seconds, series name to value) triples.
+        """
+        with self._lock, self._connection:
+            touched: Dict[Tuple[str, str, int], _Head] = {}
+            for engineer_id, timestamp, values in points:
+                for series, value in values.items():
+                    if value is None or value != value:
+                        continue
+                    head = self._head(str(engineer_id), series, int(timestamp), touched)
+                    head.add(int(timestamp), round(float(value) * self.config.scale), self.config.scale)
+                    touched[(str(engineer_id), series, head.block)] = head
+            for (engineer_id, series, _), head in touched.items():
+                self._write(engineer_id, series, head)
+
+    def append(self, engineer_id: str, values: Dict[str, float], timestamp: Optional[float] = None):
+        """
+        Append one point per series (e.g. {"score": 3.0, "off_hours_ratio": 0.4}) for an engineer.
+        """
+        self.append_many([(engineer_id, int(timestamp if timestamp is not None else time.time()), values)])
+
+    def record(self, result: BurnoutResult, timestamp: Optional[float] = None, team: Optional[str] = None) -> bool:
+        """
+        Append a verdict: its severity as the "score" series, and each supporting metric as a series of its own.
+        Failed and UNKNOWN verdicts are not recorded.
+
+        Returns:
+            bool: Whether the verdict was recorded.
+        """
+        if result.error is not None or result.severity not in SEVERITY_SCORES:
+            return False
+        engineer_id = result.engineer_id or result.engineer_name
+        self.append(engineer_id, {"score": SEVERITY_SCORES[result.severity], **result.supporting_metrics}, timestamp)
+        if team is not None:
+            self.set_teams({engineer_id: team})
+        return True
+
+    def set_teams(self, teams: Dict[str, str]):
+        """
+        Assign engineers to teams, for team queries. An engineer belongs to one team.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO teams (engineer_id, team) VALUES (?, ?)",
+                [(str(engineer_id), team) for engineer_id, team in teams.items()],
+            )
+
+    def range(
+            self,
+            engineer_id: str,
+            series: str = "score",
+            start: Optional[float] = None,
+            end: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        An engineer's points of a series with start <= timestamp <= end, in time order.
+        """
+        start, end = self._bounds(start, end)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM blocks WHERE engineer_id = ? AND series = ? AND max_ts >= ? AND min_ts <= ? "
+                "ORDER BY block",
+                (str(engineer_id), series, start, end),
+            ).fetchall()
+        points = [
+            point for (data,) in rows for point in zip(*decode_block(data, self.config.scale))
+            if start <= point[0] <= end
+        ]
+        return sorted(points, key=lambda point: point[0])
+
+    @staticmethod
+    def _bounds(start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        return (int(start) if start is not None else -(2 ** 62)), (int(end) if end is not None else 2 ** 62)
+
+    def _index(self, series: str) -> "_SeriesIndex":
+        index = self._indexes.get(series)
+        if index is None:
+            index = self._indexes[series] = _SeriesIndex()
+            for row in self._connection.execute(
+                    "SELECT engineer_id, block, count, data, min_ts, max_ts, min_value, max_value, sum_t, sum_v, "
+                    "sum_tt, sum_tv FROM blocks WHERE series = ?", (series,)
+            ):
+                index.update(*row)
+        return index
+
+    def _select(self, series: str, start: int, end: int, team: Optional[str], engineer_ids: Optional[Iterable[str]]):
+        """
+        The series' block columns, with the masks of the blocks overlapping [start, end] and of those fully inside.
+        """
+        import numpy as np
+
+        with self._lock:
+            if team is not None:
+                engineer_ids = [row[0] for row in self._connection.execute(
+                    "SELECT engineer_id FROM teams WHERE team = ?", (team,)
+                )]
+            index = self._index(series)
+            columns = index.arrays()
+            engineers, data = list(index.engineers), list(index.data)
+            members = None if engineer_ids is None else [
+                index.codes[str(engineer_id)] for engineer_id in engineer_ids if str(engineer_id) in index.codes
+            ]
+        code, min_ts, max_ts = columns["code"], columns["min_ts"], columns["max_ts"]
+        overlapping = (max_ts >= start) & (min_ts <= end)
+        if members is not None:
+            overlapping &= np.isin(code, members)
+        covered = overlapping & (min_ts >= start) & (max_ts <= end)
+        return engineers, data, columns, overlapping, covered
+
+    def trends(
+            self,
+            series: str = "score",
+            start: Optional[float] = None,
+            end: Optional[float] = None,
+            team: Optional[str] = None,
+            engineer_ids: Optional[Iterable[str]] = None,
+            min_points: int = 2
+    ) -> Dict[str, Trend]:
+        """
+        The least-squares trend of a series over [start, end], per engineer, for everyone or for a team or a list of
+        engineers.
+
+        Returns:
+            dict: Engineer ID to their `Trend`, for the engineers with at least `min_points` points in the range.
+        """
+        import numpy as np
+
+        start, end = self._bounds(start, end)
+        engineers, data, columns, overlapping, covered = self._select(series, start, end, team, engineer_ids)
+        n = len(engineers)
+        code = columns["code"][covered]
+        count = np.bincount(code, weights=columns["count"][covered], minlength=n)
+        sums = [np.bincount(code, weights=columns[name][covered], minlength=n)
+                for name in ("sum_t", "sum_v", "sum_tt", "sum_tv")]
+        low, high = np.full(n, np.inf), np.full(n, -np.inf)
+        np.minimum.at(low, code, columns["min_value"][covered])
+        np.maximum.at(high, code, columns["max_value"][covered])
+
+        edges = np.flatnonzero(overlapping & ~covered)
+        if edges.size:
+            blocks, timestamps, values = decode_blocks([data[i] for i in edges], columns["count"][edges],
+                                                       self.config.scale)
+            inside = (timestamps >= start) & (timestamps <= end)
+            code = columns["code"][edges][blocks[inside]]
+            t, values = (timestamps[inside] - _T_REFERENCE) / _SECONDS_PER_DAY, values[inside]
+            count += np.bincount(code, minlength=n)
+            for total, term in zip(sums, (t, values, t * t, t * values)):
+                total += np.bincount(code, weights=term, minlength=n)
+            np.minimum.at(low, code, values)
+            np.maximum.at(high, code, values)
+
+        sum_t, sum_v, sum_tt, sum_tv = sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            denominator = count * sum_tt - sum_t * sum_t
+            slope = np.where((count > 1) & (np.abs(denominator) > 1e-9),
+                             (count * sum_tv - sum_t * sum_v) / denominator, 0.0)
+            mean = sum_v / count
+        return {
+            engineers[i]: Trend(engineers[i], series, int(count[i]), round(float(slope[i]), 6),
+                                round(float(mean[i]), 6), float(low[i]), float(high[i]))
+            for i in np.flatnonzero(count >= max(min_points, 1)).tolist()
+        }
+
+    def rising(
+            self,
+            min_slope_per_day: float,
+            series: str = "score",
+            start: Optional[float] = None,
+            end: Optional[float] = None,
+            team: Optional[str] = None
+    ) -> List[Trend]:
+        """
+        The engineers whose series rose by at least `min_slope_per_day` over the range, steepest first.
+        """
+        trends = self.trends(series, start, end, team=team)
+        return sorted((trend for trend in trends.values() if trend.slope_per_day >= min_slope_per_day),
+                      key=lambda trend: (-trend.slope_per_day, trend.engineer_id))
+
+    def team_rollup(
+            self,
+            team: str,
+            series: str = "score",
+            start: Optional[float] = None,
+            end: Optional[float] = None,
+            bucket_seconds: float = 7 * _SECONDS_PER_DAY
+    ) -> List[dict]:
+        """
+        A team's series aggregated into time buckets: per bucket, the mean and maximum of each member's latest value
+        in the bucket, and how many members had a value.
+
+        Returns:
+            list: One dictionary per non-empty bucket, in time order, with "start", "engineers", "mean" and "max".
+        """
+        import numpy as np
+
+        start, end = self._bounds(start, end)
+        engineers, data, columns, overlapping, _ = self._select(series, start, end, team, None)
+        selected = np.flatnonzero(overlapping)
+        if not selected.size:
+            return []
+        blocks, timestamps, values = decode_blocks([data[i] for i in selected], columns["count"][selected],
+                                                   self.config.scale)
+        inside = (timestamps >= start) & (timestamps <= end)
+        code, timestamps, values = columns["code"][selected][blocks[inside]], timestamps[inside], values[inside]
+        buckets = (timestamps // bucket_seconds * bucket_seconds).astype(np.int64)
+
+        # Each member's latest value per bucket: sort by (bucket, member, time) and keep the last of each group.
+        order = np.lexsort((timestamps, code, buckets))
+        buckets, code, values = buckets[order], code[order], values[order]
+        last = np.ones(buckets.size, dtype=bool)
+        last[:-1] = (buckets[1:] != buckets[:-1]) | (code[1:] != code[:-1])
+        buckets, values = buckets[last], values[last]
+
+        starts, first, members = np.unique(buckets, return_index=True, return_counts=True)
+        means = np.add.reduceat(values, first) / members
+        maxima = np.maximum.reduceat(values, first)
+        return [
+            {"start": int(bucket), "engineers": int(n), "mean": round(float(mean), 6), "max": float(high)}
+            for bucket, n, mean, high in zip(starts, members, means, maxima)
+        ]
+
+    @property
+    def stats(self) -> ScoreStoreStats:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(DISTINCT engineer_id), COUNT(DISTINCT engineer_id || char(0) || series), "
+                "COALESCE(SUM(count), 0), COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM blocks"
+            ).fetchone()
+        return ScoreStoreStats(*row)
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Report burnout score trends from a score store.")
+    parser.add_argument("--path", required=True, help="SQLite score store written by sweeps.")
+    parser.add_argument("--team", help="Only report the members of this team.")
+    parser.add_argument("--series", default="score", help="Series to report (the score or a supporting metric).")
+    parser.add_argument("--days", type=float, default=180.0, help="How far back to look.")
+    parser.add_argument("--min-slope", type=float, default=0.0, help="Only report trends rising at least this per day.")
+    args = parser.parse_args(argv)
+
+    store = ScoreStore(ScoreStoreConfig(path=args.path))
+    end = time.time()
+    for trend in store.rising(args.min_slope, args.series, end - args.days * _SECONDS_PER_DAY, end, team=args.team):
+        print(f"{trend.engineer_id}: {trend.slope_per_day:+.4f}/day over {trend.points} points "
+              f"(mean {trend.mean:.2f}, min {trend.min:.2f}, max {trend.max:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.burnout_detector.workload_metrics import MISSING_TIME, parse_epoch
+
+
+def merge_intervals(
+        groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge overlapping (or back-to-back) intervals within each group, vectorized across all groups.
+
+    The intervals are sorted by group, then start; a running maximum of the ends, offset per group so that it never
+    carries over from one group to the next, marks where a merged interval ends and the next one begins.
+
+    Args:
+        groups: Non-negative integer group of each interval (e.g. an engineer index).
+        starts: Interval starts, in epoch seconds.
+        ends: Interval ends, in epoch seconds.
+
+    Returns:
+        tuple: The group, start and end of each merged interval, sorted by group, then start.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    if groups.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    order = np.lexsort((starts, groups))
+    groups = groups[order]
+    origin = int(np.min(starts))
+    starts = np.asarray(starts, dtype=np.int64)[order] - origin
+    ends = np.asarray(ends, dtype=np.int64)[order] - origin
+    offset = groups * (int(ends.max()) + 1)
+    running_end = np.maximum.accumulate(ends + offset) - offset
+    new_interval = np.empty(groups.size, dtype=bool)
+    new_interval[0] = True
+    new_interval[1:] = (groups[1:] != groups[:-1]) | (starts[1:] > running_end[:-1])
+    first = np.flatnonzero(new_interval)
+    return groups[first], starts[first] + origin, np.maximum.reduceat(ends, first) + origin
+
+
+class ShiftIntervalIndex:
+    """
+    Sorted-array interval index over on-call shifts, for batched "who was on call" queries.
+
+    Shifts are half-open intervals [starts_at, ends_at) in epoch seconds, kept sorted by start. Point queries are
+    answered with a single sweep over the sorted shifts and the sorted query points, keeping the active shifts in a
+    heap ordered by end time, so a batch of m queries over n shifts costs O((n + m) log n) plus the size of the
+    output. Per-user queries use each user's shifts merged into disjoint intervals.
+    """
+
+    def __init__(
+            self,
+            starts_at: np.ndarray,
+            ends_at: np.ndarray,
+            user_ids: Sequence[Optional[str]],
+            schedule_ids: Optional[Sequence[Optional[str]]] = None,
+    ):
+        """
+        Args:
+            starts_at: Shift start times, in epoch seconds.
+            ends_at: Shift end times, in epoch seconds.
+            user_ids: The user on call for each shift.
+            schedule_ids: Optional schedule of each shift.
+        """
+        starts_at = np.asarray(starts_at, dtype=np.int64)
+        ends_at = np.asarray(ends_at, dtype=np.int64)
+        order = np.argsort(starts_at, kind="stable")
+        self.starts_at = starts_at[order]
+        self.ends_at = ends_at[order]
+        self.user_ids: List[Optional[str]] = [user_ids[i] for i in order.tolist()]
+        self.schedule_ids: List[Optional[str]] = (
+            [schedule_ids[i] for i in order.tolist()] if schedule_ids is not None else [None] * len(self.user_ids)
+        )
+        self._merged_by_user = self._merge_by_user()
+
+    @classmethod
+    def from_shifts(cls, shifts: Iterable[dict]) -> "ShiftIntervalIndex":
+        """
+        Build an index from the processed shift dictionaries returned by `ShiftsTool.iter_shifts`. Shifts with a
+        missing or empty time range are skipped.
+        """
+        starts_at, ends_at, user_ids, schedule_ids = [], [], [], []
+        for shift in shifts:
+            start, end = parse_epoch(shift.get("starts_at")), parse_epoch(shift.get("ends_at"))
+            if start == MISSING_TIME or end == MISSING_TIME or end <= start:
+                continue
+            starts_at.append(start)
+            ends_at.append(end)
+            user_ids.append(shift.get("user_id"))
+            schedule_ids.append(shift.get("schedule_id"))
+        return cls(np.asarray(starts_at, dtype=np.int64), np.asarray(ends_at, dtype=np.int64), user_ids, schedule_ids)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def _merge_by_user(self) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        known = np.asarray([user_id is not None for user_id in self.user_ids], dtype=bool)
+        if not known.any():
+            return {}
+        users, codes = np.unique(np.asarray(self.user_ids, dtype=object)[known].astype(str), return_inverse=True)
+        groups, starts, ends = merge_intervals(codes, self.starts_at[known], self.ends_at[known])
+        bounds = np.searchsorted(groups, np.arange(users.size + 1))
+        return {
+            user_id: (starts[bounds[i]:bounds[i + 1]], ends[bounds[i]:bounds[i + 1]])
+            for i, user_id in enumerate(users.tolist())
+        }
+
+    def stab(self, times: Sequence[int]) -> List[np.ndarray]:
+        """
+        Batched point-in-interval query.
+
+        Args:
+            times: Query times, in epoch seconds.
+
+        Returns:
+            list: For each query time, the positions (into this index) of the shifts covering it.
+        """
+        times = np.asarray(times, dtype=np.int64)
+        starts, ends = self.starts_at.tolist(), self.ends_at.tolist()
+        times_list = times.tolist()
+        result: List[Optional[np.ndarray]] = [None] * len(times_list)
+        active: List[Tuple[int, int]] = []  # heap of (end, position) of shifts started so far
+        next_shift = 0
+        for query in np.argsort(times, kind="stable").tolist():
+            t = times_list[query]
+            while next_shift < len(starts) and starts[next_shift] <= t:
+                heapq.heappush(active, (ends[next_shift], next_shift))
+                next_shift += 1
+            while active and active[0][0] <= t:
+                heapq.heappop(active)
+            result[query] = np.sort(np.fromiter((position for _, position in active), dtype=np.int64, count=len(active)))
+        return result
+
+    def overlapping(self, window_starts: Sequence[int], window_ends: Sequence[int]) -> List[np.ndarray]:
+        """
+        Batched range-overlap query: the shifts intersecting each window [start, end).
+
+        A shift overlaps a window if it covers the window's start, or starts inside the window; the first set comes
+        from `stab`, the second is a contiguous range of the start-sorted shifts.
+
+        Returns:
+            list: For each window, the positions of the overlapping shifts.
+        """
+        window_starts = np.asarray(window_starts, dtype=np.int64)
+        window_ends = np.asarray(window_ends, dtype=np.int64)
+        covering = self.stab(window_starts)
+        first = np.searchsorted(self.starts_at, window_starts, side="right")
+        last = np.searchsorted(self.starts_at, window_ends, side="left")
+        return [
+            np.concatenate((covering[i], np.arange(first[i], max(last[i], first[i]), dtype=np.int64)))
+            for i in range(window_starts.size)
+        ]
+
+    def on_call_users(self, times: Sequence[int]) -> List[List[str]]:
+        """
+        The users on call at each of the given times.
+        """
+        return [
+            sorted({self.user_ids[position] for position in positions if self.user_ids[position] is not None})
+            for positions in self.stab(times)
+        ]
+
+    def join_incidents(self, incidents: Sequence[dict], mode: str = "start") -> List[List[str]]:
+        """
+        Attribute incidents (as returned by `IncidentsTool`) to the users on call for them.
+
+        Args:
+            incidents: Processed incident dictionaries.
+            mode: "start" for the users on call when the incident started, or "overlap" for everyone on call at any
+                point between `started_at` and `resolved_at` (unresolved incidents only use their start).
+
+        Returns:
+            list: For each incident, the IDs of the attributed users (empty if its start time is unknown).
+        """
+        starts = np.asarray([
+            parse_epoch(incident.get("started_at") or incident.get("created_at")) for incident in incidents
+        ], dtype=np.int64)
+        known = starts != MISSING_TIME
+        query_starts = np.where(known, starts, 0)
+        if mode == "start":
+            matches = self.stab(query_starts)
+        elif mode == "overlap":
+            ends = np.asarray([parse_epoch(incident.get("resolved_at")) for incident in incidents], dtype=np.int64)
+            ends = np.where((ends == MISSING_TIME) | (ends <= query_starts), query_starts + 1, ends)
+            matches = self.overlapping(query_starts, ends)
+        else:
+            raise ValueError(f"Unsupported join mode: {mode}")
+        return [
+            sorted({self.user_ids[position] for position in positions if self.user_ids[position] is not None})
+            if known[i] else []
+            for i, positions in enumerate(matches)
+        ]
+
+    def on_call_hours(self, user_id: str, window_start: int, window_end: int) -> float:
+        """
+        Total hours a user was on call within [window_start, window_end), counting overlapping shifts once.
+        """
+        starts, ends = self._merged_by_user.get(user_id, (np.empty(0, np.int64), np.empty(0, np.int64)))
+        clipped = np.clip(ends, window_start, window_end) - np.clip(starts, window_start, window_end)
+        return float(clipped.sum()) / 3600.0
+
+    def max_consecutive_on_call_hours(self, user_id: str, max_gap_seconds: int = 0) -> float:
+        """
+        Longest uninterrupted on-call stretch of a user, in hours.
+
+        Args:
+            user_id: The user to query.
+            max_gap_seconds: Gaps between shifts up to this long do not break a stretch (e.g. a short hand-off).
+        """
+        starts, ends = self._merged_by_user.get(user_id, (np.empty(0, np.int64), np.empty(0, np.int64)))
+        if starts.size == 0:
+            return 0.0
+        new_stretch = np.concatenate(([True], starts[1:] - ends[:-1] > max_gap_seconds))
+        stretch = np.cumsum(new_stretch) - 1
+        stretch_starts = starts[new_stretch]
+        stretch_ends = np.zeros(stretch_starts.size, dtype=np.int64)
+        np.maximum.at(stretch_ends, stretch, ends)
+        return float((stretch_ends - stretch_starts).max()) / 3600.0
@@ -1,14 +1,30 @@
-from dataclasses import dataclass
-from llm_utils import LLMConfig, LLMUtils
-from typing import List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from src.burnout_detector.llm_utils import LLMConfig, LLMUtils
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from logging import Logger
-from halo import Halo
+import contextvars
+import json
 import os
-from smolagents import CodeAgent as Agent, LogLevel
+import threading
 
-from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
-from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
-from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.context_budget import ContextBudget, ContextBudgetConfig
+from src.burnout_detector.prefetch import Prefetch
+from src.burnout_detector.prescreen import PrescreenConfig, no_signal_result, no_signal_text, prescreen
+from src.burnout_detector.score_store import ScoreStore, ScoreStoreConfig
+from src.burnout_detector.verdict_cache import VerdictCache, VerdictCacheConfig, verdict_key
+from src.burnout_detector.tracing import Tracer, record_agent_step, trace_model, use_tracer
+from src.burnout_detector.burnout_result import (
+    BURNOUT_RESULT_SCHEMA, BurnoutResult, BurnoutSeverity, extract_json, normalize_burnout_result,
+    repair_burnout_result, validate_burnout_result,
+)
+
+# smolagents (with the tools built on it), numpy, requests and halo are imported on first use, so that importing
+# this module (e.g. for a CLI's --help) stays fast.
+if TYPE_CHECKING:
+    from smolagents import CodeAgent as Agent, LogLevel
+    from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+    from src.burnout_detector.workload_metrics import WorkloadMetrics
 
 
 @dataclass
@@ -16,7 +32,20 @@ class SingleBurnoutAgentConfig:
     llm_config: LLMConfig
     tools: Optional[List[str]] = None
     batch_size: int = 8
-    log_level: LogLevel = LogLevel.OFF
+    log_level: "LogLevel" = -1  # smolagents LogLevel; -1 is LogLevel.OFF
+    snapshot_path: Optional[str] = None  # optional SQLite file to answer Rootly queries from, synced incrementally
+    precompute_metrics: bool = True  # compute workload metrics before the LLM call and include them in the prompt
+    metrics_window_days: int = 90  # how far back the precomputed workload metrics look
+    verdict_cache: Optional[VerdictCacheConfig] = None  # optional persistent cache of verdicts, keyed on their inputs
+    trace_path: Optional[str] = field(default_factory=lambda: os.getenv("BURNOUT_TRACE_PATH"))  # JSONL span export
+    reuse_agent: bool = False  # keep the model and CodeAgent across candidates, resetting the agent's memory between them
+    show_spinner: bool = True  # show a spinner while the agent runs (disable when running agents in parallel)
+    structured_output: bool = False  # return a schema-validated BurnoutResult instead of free text
+    max_repair_attempts: int = 2  # re-asks per invalid field of a structured result before giving up on it
+    context_budget: Optional[ContextBudgetConfig] = field(default_factory=ContextBudgetConfig)  # None: raw tool output
+    prescreen: Optional[PrescreenConfig] = None  # skip the LLM for candidates whose precomputed metrics show no risk
+    score_store: Optional[ScoreStoreConfig] = None  # optional time series the structured verdicts are appended to
+    prefetch: bool = True  # fetch the candidate's Rootly data in parallel before the first LLM step, for the tools
 
 
 class SingleBurnoutAgent:
@@ -24,56 +53,320 @@ class SingleBurnoutAgent:
     Agent for detecting burnout.
     """
 
-    def __init__(self, config: Optional[SingleBurnoutAgentConfig] = None):
+    def __init__(
+            self,
+            config: Optional[SingleBurnoutAgentConfig] = None,
+            snapshot_store: Optional["SnapshotStore"] = None,
+            verdict_cache: Optional[VerdictCache] = None,
+            score_store: Optional[ScoreStore] = None
+    ):
+        """
+        Args:
+            config: The agent configuration.
+            snapshot_store: Optional snapshot store to share with other agents. Defaults to one opened from
+                `config.snapshot_path`, if set.
+            verdict_cache: Optional verdict cache to share with other agents. Defaults to one built from
+                `config.verdict_cache`, if set.
+            score_store: Optional score store to share with other agents. Defaults to one opened from
+                `config.score_store`, if set.
+        """
         self.config = config
         self.logger = Logger("default")
+        if snapshot_store is None and config is not None and config.snapshot_path:
+            from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+            snapshot_store = SnapshotStore(config.snapshot_path)
+        self.snapshot_store = snapshot_store
+        if verdict_cache is None and config is not None and config.verdict_cache is not None:
+            verdict_cache = VerdictCache(config.verdict_cache)
+            if self.snapshot_store is not None:
+                verdict_cache.attach(self.snapshot_store)
+        self.verdict_cache = verdict_cache
+        if score_store is None and config is not None and config.score_store is not None:
+            score_store = ScoreStore(config.score_store)
+        self.score_store = score_store
 
-    def detect_burnout(self, burnout_candidate: str, config_override: Optional[SingleBurnoutAgentConfig] = None):
+        from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+        from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+        from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+        self.users_tool = UsersTool(snapshot_store=self.snapshot_store)
+        self.shifts_tool = ShiftsTool(snapshot_store=self.snapshot_store)
+        self.incidents_tool = IncidentsTool(snapshot_store=self.snapshot_store)
+        self._context_budget: Optional[ContextBudget] = None
+        self._agent: Optional["Agent"] = None
+        self._agent_key: Optional[tuple] = None
+        self._abandoned: Optional[threading.Event] = None  # the current run's abandon signal, if any
+        self.trace_summary: Optional[str] = None  # time split of the last traced run (see `Tracer.format_summary`)
+
+    def _build_workload_summary(
+            self,
+            burnout_candidate: str,
+            config: SingleBurnoutAgentConfig,
+            prefetch: Optional[Prefetch] = None
+    ) -> Tuple[str, Optional[str], list, Optional["WorkloadMetrics"]]:
         """
-        Detect whether a candidate is burnt out.
+        Fetch the candidate's incidents and on-call shifts (or take them from the prefetch, if any) and summarize
+        their workload metrics for the prompt.
 
-        Args:
-            burnout_candidate: The name of the burnout candidate.
-            config_override: Optionally override the configuration used during initialization.
+        Returns:
+            tuple: The summary, the candidate's Rootly user ID (None if unknown), the fetched data (user, incidents
+                and shifts) the verdict depends on, and the workload metrics (None if not available).
         """
-        llm_config = self.config.llm_config if config_override is None else config_override
-        assert llm_config is not None, "Must provide an LLM config, but got None."
+        if not config.precompute_metrics or not os.getenv("ROOTLY_API_KEY"):
+            return "Not available.", None, [], None
+
+        from src.burnout_detector.workload_metrics import (
+            compute_workload_metrics, format_workload_summary, utc_offset_seconds,
+        )
+
+        try:
+            if prefetch is not None:
+                user, now = prefetch.user(), prefetch.now
+            else:
+                user = next(self.users_tool.iter_users(search=burnout_candidate, max_records=1), None)
+                now = datetime.now(timezone.utc)
+            if user is None:
+                return f"Not available (no Rootly user matches '{burnout_candidate}').", None, [], None
 
-        model = LLMUtils.get_llm_model(llm_config)
-        tools = []
-        if os.getenv("ROOTLY_API_KEY"):
-            tools.append(UsersTool())
-            tools.append(ShiftsTool())
-            tools.append(IncidentsTool())
+            if prefetch is not None:
+                incidents, shifts = prefetch.incidents(), prefetch.shifts()
+            else:
+                window_start = (now - timedelta(days=config.metrics_window_days)).isoformat()
+                incidents = self.incidents_tool.fetch_batch(
+                    user_id=user["id"], created_at_gte=window_start
+                )
+                shifts = list(self.shifts_tool.iter_shifts(window_start, now.isoformat(), user_ids=[user["id"]]))
 
-        agent = Agent(
+            utc_offset = utc_offset_seconds(user.get("time_zone"), now)
+            metrics = compute_workload_metrics(
+                {user["id"]: incidents}, {user["id"]: shifts},
+                now=int(now.timestamp()), utc_offsets_seconds={user["id"]: utc_offset},
+            )[user["id"]]
+        except Exception as e:
+            self.logger.error(f"Error precomputing workload metrics: {e}")
+            return f"Not available ({e}).", None, [], None
+
+        summary = f"Rootly user ID {user['id']} ({user.get('full_name') or user.get('name')}):\n" + \
+            format_workload_summary(metrics)
+        return summary, user["id"], [user, list(incidents.to_dicts()), shifts], metrics
+
+    def _build_agent(self, config: SingleBurnoutAgentConfig) -> "Agent":
+        """
+        Build the model and `CodeAgent`. The model and steps always report to the active tracer, if any, so that a
+        reused agent can be traced run by run.
+        """
+        from smolagents import CodeAgent as Agent
+
+        model = trace_model(LLMUtils.get_llm_model(config.llm_config))
+        tools = [self.users_tool, self.shifts_tool, self.incidents_tool] if os.getenv("ROOTLY_API_KEY") else []
+        return Agent(
             model=model, 
             tools=tools,
             additional_authorized_imports=[
                 "datetime",
                 "requests"
-            ]
+            ],
+            step_callbacks=[self._apply_context_budget, record_agent_step, self._stop_if_abandoned],
+            verbosity_level=config.log_level,
+        )
+
+    def _apply_context_budget(self, memory_step):
+        """
+        Step callback applying the current run's context budget, if any, to the step's observation.
+        """
+        if self._context_budget is not None:
+            self._context_budget.observe(memory_step)
+
+    def _stop_if_abandoned(self, memory_step, agent):
+        """
+        Step callback interrupting the current run once its caller has abandoned it, so that it stops calling the LLM
+        and Rootly after the step in progress instead of running to completion in the background.
+        """
+        if self._is_abandoned():
+            agent.interrupt()
+
+    def _get_agent(self, config: SingleBurnoutAgentConfig) -> "Agent":
+        """
+        The `CodeAgent` to run a candidate with. In `reuse_agent` mode it is built once (and rebuilt only if the
+        model settings or tool availability change), and its memory and interpreter state are reset before each run
+        so that nothing leaks from one candidate to the next.
+        """
+        if not config.reuse_agent:
+            return self._build_agent(config)
+
+        key = (config.llm_config.model_id, config.llm_config.temperature, bool(os.getenv("ROOTLY_API_KEY")))
+        if self._agent is None or self._agent_key != key:
+            self._agent, self._agent_key = self._build_agent(config), key
+        # A fresh interpreter, so that nothing the previous candidate's code defined survives; `run(reset=True)` then
+        # clears the memory and sends the (cleared) state and the tools to it.
+        self._agent.state.clear()
+        self._agent.python_executor = self._agent.create_python_executor()
+        return self._agent
+
+    def detect_burnout(
+            self,
+            burnout_candidate: str,
+            config_override: Optional[SingleBurnoutAgentConfig] = None,
+            abandoned: Optional[threading.Event] = None
+    ):
+        """
+        Detect whether a candidate is burnt out.
+
+        Args:
+            burnout_candidate: The name of the burnout candidate.
+            config_override: Optionally override the configuration used during initialization.
+            abandoned: Optional event the caller sets when it gives up on the run (e.g. after a timeout). The agent is
+                interrupted at the end of its current step; whatever the run returns is not written to the verdict
+                cache or score store.
+        """
+        config = self.config if config_override is None else config_override
+        llm_config = config.llm_config if config is not None else None
+        assert llm_config is not None, "Must provide an LLM config, but got None."
+        self._abandoned = abandoned
+        from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+
+        with get_rootly_client().run():  # joins the run of a sweep or stream, if any
+            if not config.trace_path:
+                return self._record_score(self._detect_burnout(burnout_candidate, config))
+
+            tracer = Tracer(config.trace_path)
+            try:
+                with use_tracer(tracer), tracer.span("detect_burnout", "run", candidate=burnout_candidate,
+                                                     model_id=llm_config.model_id):
+                    return self._record_score(self._detect_burnout(burnout_candidate, config))
+            finally:
+                self.trace_summary = tracer.format_summary()
+                self.logger.debug(self.trace_summary)
+
+    def _record_score(self, result):
+        """
+        Append a structured verdict to the score store, if any, so that trends can be reported without re-running.
+        """
+        if self.score_store is not None and isinstance(result, BurnoutResult) and not self._is_abandoned():
+            try:
+                self.score_store.record(result)
+            except Exception as e:
+                self.logger.error(f"Error recording the burnout score: {e}")
+        return result
+
+    def _is_abandoned(self) -> bool:
+        return self._abandoned is not None and self._abandoned.is_set()
+
+    def _detect_burnout(self, burnout_candidate: str, config: SingleBurnoutAgentConfig):
+        """
+        Run the analysis, with the candidate's Rootly data prefetched in parallel when `config.prefetch` is set, so
+        that neither the workload summary nor the agent's first tool calls wait on one request after another.
+        """
+        if not config.prefetch or not os.getenv("ROOTLY_API_KEY"):
+            return self._analyse(burnout_candidate, config, None)
+
+        prefetch = Prefetch(
+            self.users_tool, self.incidents_tool, self.shifts_tool, burnout_candidate, config.metrics_window_days
         )
+        try:
+            return self._analyse(burnout_candidate, config, prefetch)
+        finally:
+            prefetch.close()
+            for tool in (self.users_tool, self.shifts_tool, self.incidents_tool):
+                tool.prefetch = None
+            self.logger.info(f"Prefetched Rootly data for {burnout_candidate}: {prefetch.stats}")
 
-        if (single_burnout_detection := LLMUtils.load_prompt_template()["single_burnout_detection"]["template"]):
+    def _analyse(self, burnout_candidate: str, config: SingleBurnoutAgentConfig, prefetch: Optional[Prefetch]):
+        llm_config = config.llm_config
+        prompt_templates = LLMUtils.load_prompt_template()
+        if (single_burnout_detection := prompt_templates["single_burnout_detection"]["template"]):
+            if config.structured_output:
+                output_format = prompt_templates["output_format_json"]["template"].format(
+                    schema=json.dumps(BURNOUT_RESULT_SCHEMA, indent=2)
+                )
+            else:
+                output_format = prompt_templates["output_format_text"]["template"]
+            workload_summary, user_id, data, metrics = self._build_workload_summary(burnout_candidate, config, prefetch)
+            if config.prescreen is not None and metrics is not None:
+                decision = prescreen(metrics, config.metrics_window_days, config.prescreen)
+                if not decision.escalate:
+                    self.logger.info(f"Pre-screening found no burnout signal for {burnout_candidate}: {decision}")
+                    if config.structured_output:
+                        return no_signal_result(burnout_candidate, user_id, decision)
+                    return no_signal_text(burnout_candidate, decision)
             prompt = single_burnout_detection.format(
-                burnout_candidate=burnout_candidate
+                burnout_candidate=burnout_candidate,
+                workload_summary=workload_summary,
+                output_format=output_format.strip()
             )
         else:
             raise ValueError("No prompt template found for single burnout detection.")
-        
-        spinner = Halo(text="Detecting burnout...", spinner="dots")
+
+        cache_key = None
+        # Only verdicts on the candidate's Rootly data are cached: without it the key is just the prompt, and no data
+        # change could ever invalidate the verdict.
+        if self.verdict_cache is not None and data and user_id is not None:
+            cache_key = verdict_key(llm_config.model_id, llm_config.temperature, prompt, data)
+            if (cached := self.verdict_cache.get(cache_key)) is not None:
+                self.logger.info(f"Using cached burnout verdict for {burnout_candidate}.")
+                return BurnoutResult.from_dict(json.loads(cached)) if config.structured_output else cached
+
+        agent = self._get_agent(config)
+        self._context_budget = ContextBudget(config.context_budget) if config.context_budget is not None else None
+        run_context = contextvars.copy_context()
+        for tool in (self.users_tool, self.shifts_tool, self.incidents_tool):
+            tool.context_budget = self._context_budget
+            tool.prefetch = prefetch
+            tool.run_context = run_context
+
+        from halo import Halo
+        spinner = Halo(text="Detecting burnout...", spinner="dots", enabled=config.show_spinner)
         self.logger.info(prompt)
         spinner.start()
 
+        result = None
         try:
-            result = agent.run(prompt)
+            result = agent.run(prompt, reset=True)
             spinner.stop()
             self.logger.info(result)
+            if config.structured_output:
+                result = self._structure_result(result, burnout_candidate, user_id, agent.model, config)
+                cacheable = json.dumps(result.to_dict()) if result.error is None else None
+            else:
+                cacheable = result if isinstance(result, str) and not result.strip().startswith("ERROR") else None
+            if cache_key is not None and cacheable is not None and not self._is_abandoned():
+                self.verdict_cache.put(cache_key, cacheable, user_id=user_id)
         except Exception as e:
             spinner.fail("Analysis failed.")
             self.logger.error(f"Error detecting burnout: {e}")
+            if config.structured_output:
+                result = BurnoutResult(burnout_candidate, BurnoutSeverity.UNKNOWN, engineer_id=user_id,
+                                       error=f"Error detecting burnout: {e}")
+        finally:
+            for tool in (self.users_tool, self.shifts_tool, self.incidents_tool):
+                tool.run_context = None
 
         return result
 
+    @staticmethod
+    def _structure_result(
+            output,
+            burnout_candidate: str,
+            user_id: Optional[str],
+            model,
+            config: SingleBurnoutAgentConfig
+    ) -> BurnoutResult:
+        """
+        Validate the agent's output against the result schema, repairing only the invalid fields with short re-asks.
+        """
+        if isinstance(output, str) and output.strip().startswith("ERROR"):
+            return BurnoutResult(burnout_candidate, BurnoutSeverity.UNKNOWN, engineer_id=user_id, error=output.strip())
+
+        data = extract_json(output)
+        data = normalize_burnout_result(data) if isinstance(data, dict) else None
+        if data is not None and user_id is not None and not data.get("engineer_id"):
+            data["engineer_id"] = str(user_id)
+        errors = validate_burnout_result(data) if data is not None else {"result": "no JSON object in the output"}
+        if errors:
+            data, errors = repair_burnout_result(model, output, data, errors, config.max_repair_attempts)
+        if data is None or errors:
+            return BurnoutResult(burnout_candidate, BurnoutSeverity.UNKNOWN, engineer_id=user_id,
+                                 error=f"Invalid burnout result: {errors}")
+        return BurnoutResult.from_dict(data)
+
 
@@ -0,0 +1,477 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.burnout_detector.prescreen import PrescreenConfig, PrescreenDecision, prescreen
+from src.burnout_detector.workload_metrics import (
+    MISSING_TIME, SEVERITY_LEVELS, WorkloadMetrics, WorkloadMetricsConfig, local_time_flags, parse_epoch, severity_code,
+)
+
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class StreamConfig:
+    window_days: int = 7  # sliding window the per-engineer workload state covers
+    prescreen: PrescreenConfig = field(default_factory=PrescreenConfig)  # thresholds defining "at risk"
+    debounce_seconds: float = 900.0  # quiet time after an engineer's last event before they are re-scored
+    max_delay_seconds: float = 3600.0  # longest debouncing may postpone a re-score during a continuous storm
+    cooldown_seconds: float = 6 * 3600.0  # minimum time between two agent runs for the same engineer
+    max_runs_per_hour: int = 30  # agent runs per hour across all engineers; further due re-scores wait
+    metrics: WorkloadMetricsConfig = field(default_factory=WorkloadMetricsConfig)  # working hours for off-hours load
+
+
+@dataclass
+class StreamStats:
+    events: int = 0  # events applied
+    ignored: int = 0  # events without engineers, timestamps, or older than the window
+    engineers: int = 0  # engineers with workload state
+    crossings: int = 0  # times an engineer's risk rose to the threshold
+    debounced: int = 0  # events that postponed an already pending re-score instead of starting another
+    triggers: int = 0  # agent runs started
+    cancelled: int = 0  # pending re-scores dropped because the risk fell back below the threshold first
+    deferred: int = 0  # due re-scores held back by the hourly run budget
+
+
+@dataclass
+class WorkloadEvent:
+    kind: str  # "incident" or "shift"
+    record: dict  # the processed record, as returned by `IncidentsTool` or `ShiftsTool.iter_shifts`
+    user_ids: List[str] = field(default_factory=list)  # engineers the record counts towards
+    deleted: bool = False  # the record was removed upstream and no longer counts
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WorkloadEvent":
+        """
+        Parse an event of the form {"type": "incident" | "shift", "op": "upsert" | "delete", "user_ids": [...],
+        "data": {...}}. `data` is a processed record or a raw JSON:API record (e.g. a webhook payload); for raw
+        incidents without "user_ids", the engineers are taken from the incident's user roles.
+
+        Raises:
+            ValueError: If the event type is unknown.
+        """
+        kind = data.get("type")
+        record = data.get("data") or {}
+        user_ids = [str(user_id) for user_id in data.get("user_ids") or []]
+        if kind == "incident":
+            if "attributes" in record:
+                from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+                user_ids = user_ids or IncidentsTool.related_user_ids(record)
+                record = IncidentsTool.process_incident(record) or {}
+        elif kind == "shift":
+            if "attributes" in record:
+                from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+                record = ShiftsTool.process_shift(record) or {}
+            if not user_ids and record.get("user_id") is not None:
+                user_ids = [str(record["user_id"])]
+        else:
+            raise ValueError(f"Unknown event type: {kind!r}")
+        return cls(kind, record, user_ids, deleted=data.get("op") == "delete")
+
+
+class JsonlEventSource:
+    """
+    Reads events from a JSON Lines file, one `WorkloadEvent.from_dict` object per line. With `follow`, keeps tailing
+    the file for appended events (like `tail -f`), yielding None whenever no new event arrived for `poll_interval`
+    seconds so that consumers can act on the passing time.
+    """
+
+    def __init__(self, path: str, follow: bool = False, poll_interval: float = 1.0):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+
+    def __iter__(self) -> Iterator[Optional[WorkloadEvent]]:
+        with open(self.path) as file:
+            partial = ""
+            while True:
+                line = file.readline()
+                if line.endswith("\n") or (line and not self.follow):
+                    line, partial = partial + line, ""
+                    if line.strip():
+                        yield WorkloadEvent.from_dict(json.loads(line))
+                elif not self.follow:
+                    return
+                else:
+                    partial += line  # an event still being written
+                    yield None
+                    time.sleep(self.poll_interval)
+
+
+class QueueEventSource:
+    """
+    In-process event source, standing in for a message queue: producers `put` events (as `WorkloadEvent`s or their
+    dictionary form) and `close` the source when done. Yields None after `idle_timeout` seconds without events.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, idle_timeout: float = 1.0):
+        self.idle_timeout = idle_timeout
+        self._queue: "queue.Queue" = queue.Queue()
+
+    def put(self, event):
+        self._queue.put(event if isinstance(event, WorkloadEvent) else WorkloadEvent.from_dict(event))
+
+    def close(self):
+        self._queue.put(self._CLOSED)
+
+    def __iter__(self) -> Iterator[Optional[WorkloadEvent]]:
+        while True:
+            try:
+                event = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                yield None
+                continue
+            if event is self._CLOSED:
+                return
+            yield event
+
+
+class _EngineerWorkload:
+    """
+    One engineer's incidents and shifts within the sliding window, with running totals. Records enter and leave
+    through time-ordered queues, so updates and expiry cost O(1) amortised per event.
+    """
+
+    def __init__(self):
+        self.incidents: Dict[str, Tuple[int, int, bool, bool]] = {}  # ID -> (start, severity code, off hours, weekend)
+        self.incident_order: Deque[Tuple[int, str]] = deque()
+        self.incident_count = 0
+        self.by_severity = [0] * len(SEVERITY_LEVELS)
+        self.off_hours = 0
+        self.weekend = 0
+        self.shifts: Dict[str, Tuple[int, int]] = {}  # ID -> (end, on-call seconds)
+        self.shift_order: Deque[Tuple[int, str]] = deque()
+        self.on_call_seconds = 0
+        self.escalated = False  # risk at or above the threshold at the last evaluation
+        self.pending_since: Optional[float] = None  # stream time the current crossing was first seen, if not yet run
+        self.due_at: Optional[float] = None  # stream time the pending re-score is due
+        self.last_run: Optional[float] = None  # stream time of the last agent run
+
+    def _add_incident(self, incident_id: str, entry: Tuple[int, int, bool, bool], sign: int):
+        _, severity, off_hours, weekend = entry
+        self.incident_count += sign
+        self.by_severity[severity] += sign
+        self.off_hours += sign * off_hours
+        self.weekend += sign * weekend
+        if sign > 0:
+            self.incidents[incident_id] = entry
+        else:
+            del self.incidents[incident_id]
+
+    def upsert_incident(self, incident_id: str, entry: Optional[Tuple[int, int, bool, bool]]):
+        if incident_id in self.incidents:
+            self._add_incident(incident_id, self.incidents[incident_id], -1)
+        if entry is not None:
+            self._add_incident(incident_id, entry, 1)
+            self.incident_order.append((entry[0], incident_id))
+
+    def upsert_shift(self, shift_id: str, entry: Optional[Tuple[int, int]]):
+        if shift_id in self.shifts:
+            self.on_call_seconds -= self.shifts.pop(shift_id)[1]
+        if entry is not None:
+            self.shifts[shift_id] = entry
+            self.on_call_seconds += entry[1]
+            self.shift_order.append((entry[0], shift_id))
+
+    def expire(self, cutoff: int):
+        """
+        Drop the incidents that started, and the shifts that ended, before `cutoff`. Queue entries superseded by a
+        later update of the same record are discarded without touching the totals.
+        """
+        while self.incident_order and self.incident_order[0][0] < cutoff:
+            started, incident_id = self.incident_order.popleft()
+            if (entry := self.incidents.get(incident_id)) is not None and entry[0] == started:
+                self._add_incident(incident_id, entry, -1)
+        while self.shift_order and self.shift_order[0][0] < cutoff:
+            ended, shift_id = self.shift_order.popleft()
+            if (entry := self.shifts.get(shift_id)) is not None and entry[0] == ended:
+                self.on_call_seconds -= self.shifts.pop(shift_id)[1]
+
+
+class StreamingRescorer:
+    """
+    Keeps per-engineer sliding-window workload state up to date from a stream of incident and shift events, and
+    re-runs the burnout agent only for engineers whose risk crosses the pre-screening threshold.
+
+    Risk is scored with the same rules as `prescreen` (on-call streaks are not tracked in the stream). When an
+    engineer's risk rises to the threshold, the re-score is debounced: it waits until `debounce_seconds` pass without
+    further events for them (at most `max_delay_seconds`), so an incident storm results in one run per engineer. An
+    engineer is not re-run within `cooldown_seconds` of their last run, nor again until their risk has fallen below
+    the threshold and crossed it anew, and at most `max_runs_per_hour` runs start per hour, highest risk first.
+
+    Time is stream time: the latest incident start seen, advanced by the wall clock while the stream is idle, so
+    replaying a recorded stream behaves as it did live. Not thread-safe; feed it from one thread.
+    """
+
+    def __init__(
+            self,
+            config: Optional[StreamConfig] = None,
+            on_trigger: Optional[Callable[[str, PrescreenDecision], Any]] = None,
+            utc_offsets: Optional[Dict[str, int]] = None,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            config: Optional streaming configuration.
+            on_trigger: Called with the Rootly user ID and the risk decision of each engineer to re-run, e.g. to
+                submit them to a `SingleBurnoutAgentPool`. It should return quickly.
+            utc_offsets: Optional user ID to UTC offset in seconds, for the off-hours signals.
+            clock: Monotonic wall clock, used to advance stream time while the stream is idle.
+        """
+        self.config = config if config is not None else StreamConfig()
+        self.on_trigger = on_trigger
+        self.utc_offsets = dict(utc_offsets or {})
+        self.clock = clock
+        self._engineers: Dict[str, _EngineerWorkload] = {}
+        self._pending: Set[str] = set()
+        self._runs: Deque[float] = deque()  # stream times of the runs in the last hour
+        self._watermark: Optional[float] = None
+        self._watermark_clock = clock()
+        self._stats = StreamStats()
+
+    @property
+    def stats(self) -> StreamStats:
+        return replace(self._stats, engineers=len(self._engineers))
+
+    @property
+    def now(self) -> float:
+        """
+        The current stream time, in epoch seconds.
+        """
+        if self._watermark is None:
+            return time.time()
+        return self._watermark + max(self.clock() - self._watermark_clock, 0.0)
+
+    def _advance(self, timestamp: int):
+        if timestamp != MISSING_TIME and (self._watermark is None or timestamp > self.now):
+            self._watermark, self._watermark_clock = float(timestamp), self.clock()
+
+    @property
+    def _window_seconds(self) -> int:
+        return self.config.window_days * _SECONDS_PER_DAY
+
+    def apply(self, event: WorkloadEvent) -> List[str]:
+        """
+        Apply one event to the workload state of the engineers it concerns and re-evaluate their risk.
+
+        Returns:
+            list: The user IDs whose state changed.
+        """
+        record = event.record
+        if event.kind == "incident":
+            record_id = record.get("incident_id")
+            started = parse_epoch(record.get("started_at"))
+            started = started if started != MISSING_TIME else parse_epoch(record.get("created_at"))
+            timestamp = started
+        else:
+            record_id = record.get("id")
+            started, timestamp = parse_epoch(record.get("starts_at")), parse_epoch(record.get("ends_at"))
+        if not event.user_ids or record_id is None or (not event.deleted and timestamp == MISSING_TIME):
+            self._stats.ignored += 1
+            return []
+
+        if event.kind == "incident":
+            self._advance(timestamp)
+        if not event.deleted and self._watermark is not None and timestamp < self.now - self._window_seconds:
+            self._stats.ignored += 1
+            return []
+
+        self._stats.events += 1
+        record_id = str(record_id)
+        for user_id in event.user_ids:
+            state = self._engineers.setdefault(user_id, _EngineerWorkload())
+            if event.kind == "incident":
+                entry = None
+                if not event.deleted:
+                    entry = (
+                        started,
+                        severity_code(record.get("severity_level") or record.get("severity_name")),
+                        *local_time_flags(started, self.utc_offsets.get(user_id, 0), self.config.metrics),
+                    )
+                state.upsert_incident(record_id, entry)
+            else:
+                state.upsert_shift(record_id, None if event.deleted or timestamp <= started
+                                   else (timestamp, timestamp - started))
+            self._evaluate(user_id, state, touched=True)
+        return list(event.user_ids)
+
+    def metrics(self, user_id: str) -> WorkloadMetrics:
+        """
+        The engineer's workload over the current window.
+        """
+        state = self._engineers.get(user_id) or _EngineerWorkload()
+        if self._watermark is not None:
+            state.expire(int(self.now) - self._window_seconds)
+        return WorkloadMetrics(
+            engineer_id=user_id,
+            incident_count=state.incident_count,
+            incidents_by_severity={
+                level: count for level, count in zip(SEVERITY_LEVELS, state.by_severity) if count
+            },
+            off_hours_ratio=round(state.off_hours / state.incident_count, 3) if state.incident_count else 0.0,
+            weekend_ratio=round(state.weekend / state.incident_count, 3) if state.incident_count else 0.0,
+            on_call_hours=round(state.on_call_seconds / 3600.0, 2),
+            rolling_incident_counts={self.config.window_days: state.incident_count},
+        )
+
+    def decision(self, user_id: str) -> PrescreenDecision:
+        """
+        The engineer's current risk decision.
+        """
+        return prescreen(self.metrics(user_id), self.config.window_days, self.config.prescreen)
+
+    def _evaluate(self, user_id: str, state: _EngineerWorkload, touched: bool) -> PrescreenDecision:
+        decision = self.decision(user_id)
+        now = self.now
+        if not decision.escalate:
+            state.escalated = False
+            if state.pending_since is not None:
+                state.pending_since = state.due_at = None
+                self._pending.discard(user_id)
+                self._stats.cancelled += 1
+            return decision
+
+        if not state.escalated:
+            state.escalated = True
+            state.pending_since = now
+            self._pending.add(user_id)
+            self._stats.crossings += 1
+        elif state.pending_since is not None and touched:
+            self._stats.debounced += 1
+        if state.pending_since is not None and touched:
+            state.due_at = min(now + self.config.debounce_seconds, state.pending_since + self.config.max_delay_seconds)
+        return decision
+
+    def tick(self, flush: bool = False) -> List[Tuple[str, PrescreenDecision]]:
+        """
+        Start the re-scores that are due, highest risk first, within the hourly run budget.
+
+        Args:
+            flush: Start pending re-scores without waiting for their debounce delay (cooldowns and the run budget
+                still apply), e.g. at the end of a finite stream.
+
+        Returns:
+            list: The (user ID, decision) pairs passed to `on_trigger`.
+        """
+        now = self.now
+        while self._runs and self._runs[0] <= now - 3600:
+            self._runs.popleft()
+
+        due = []
+        for user_id in list(self._pending):
+            state = self._engineers[user_id]
+            ready_at = state.due_at if not flush else now
+            if state.last_run is not None:
+                ready_at = max(ready_at, state.last_run + self.config.cooldown_seconds)
+            if ready_at <= now:
+                decision = self._evaluate(user_id, state, touched=False)
+                if decision.escalate:
+                    due.append((user_id, decision))
+
+        triggered = []
+        for user_id, decision in sorted(due, key=lambda item: (-item[1].score, item[0])):
+            if len(self._runs) >= self.config.max_runs_per_hour:
+                self._stats.deferred += 1
+                continue
+            state = self._engineers[user_id]
+            state.pending_since = state.due_at = None
+            state.last_run = now
+            self._pending.discard(user_id)
+            self._runs.append(now)
+            self._stats.triggers += 1
+            if self.on_trigger is not None:
+                self.on_trigger(user_id, decision)
+            triggered.append((user_id, decision))
+        return triggered
+
+    def run(self, source: Iterable[Optional[WorkloadEvent]], flush: bool = True) -> StreamStats:
+        """
+        Consume a source until it is exhausted, applying its events and starting due re-scores as time passes.
+
+        Args:
+            source: Events, or None for an idle tick (see `JsonlEventSource` and `QueueEventSource`).
+            flush: At the end of the stream, start the re-scores still waiting for their debounce delay.
+        """
+        for event in source:
+            if event is not None:
+                self.apply(event)
+            self.tick()
+        if flush:
+            self.tick(flush=True)
+        return self.stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Re-run the burnout detector as incident and shift events arrive.")
+    parser.add_argument("--events", required=True, help="JSONL file of incident and shift events.")
+    parser.add_argument("--follow", action="store_true", help="Keep reading events appended to the file.")
+    parser.add_argument("--output", required=True, help="JSONL file the verdicts of re-scored engineers go to.")
+    parser.add_argument("--window-days", type=int, default=7, help="Sliding window of the workload state.")
+    parser.add_argument("--debounce", type=float, default=900.0, help="Seconds of quiet before re-scoring.")
+    parser.add_argument("--cooldown", type=float, default=6 * 3600.0, help="Seconds between runs per engineer.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of engineers analysed in parallel.")
+    parser.add_argument("--model", default="gpt-4o-mini", help="LLM model ID.")
+    parser.add_argument("--structured", action="store_true", help="Write schema-validated JSON verdicts.")
+    args = parser.parse_args(argv)
+
+    from src.burnout_detector.agent_pool import SingleBurnoutAgentPool
+    from src.burnout_detector.burnout_result import BurnoutResult
+    from src.burnout_detector.llm_utils import LLMConfig
+    from src.burnout_detector.single_burnout_agent import SingleBurnoutAgentConfig
+    from src.burnout_detector.sweep import display_name
+    from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+    from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory
+    from src.burnout_detector.workload_metrics import utc_offset_seconds
+
+    # The whole stream is one Rootly run: the request budget, if any, covers every request the stream makes until it
+    # ends, so with --follow it caps the requests of the process's whole lifetime rather than of a batch of re-scores.
+    with get_rootly_client().run():
+        directory = UserDirectory()
+        directory.refresh()
+        utc_offsets = {str(user["id"]): utc_offset_seconds(user.get("time_zone")) for user in directory.users()}
+        pool = SingleBurnoutAgentPool(
+            SingleBurnoutAgentConfig(llm_config=LLMConfig(model_id=args.model), structured_output=args.structured),
+            size=args.workers,
+        )
+        executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="stream-rescore")
+        lock = threading.Lock()
+
+        def rescore(user_id: str, decision: PrescreenDecision):
+            name = display_name(directory.get(user_id) or {}) or user_id
+            record = {"user_id": user_id, "candidate": name, "prescreen": decision.to_dict()}
+            try:
+                result = pool.detect_burnout(name)
+                record.update(status="ok", result=result.to_dict() if isinstance(result, BurnoutResult) else result)
+            except Exception as e:
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+            record["finished_at"] = datetime.now(timezone.utc).isoformat()
+            with lock, open(args.output, "a") as output:
+                output.write(json.dumps(record, default=str) + "\n")
+
+        if os.path.dirname(args.output):
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        rescorer = StreamingRescorer(
+            StreamConfig(window_days=args.window_days, debounce_seconds=args.debounce, cooldown_seconds=args.cooldown),
+            on_trigger=lambda user_id, decision: executor.submit(rescore, user_id, decision),
+            utc_offsets=utc_offsets,
+        )
+        try:
+            stats = rescorer.run(JsonlEventSource(args.events, follow=args.follow))
+        finally:
+            executor.shutdown(wait=True)
+    print(f"Stream finished: {stats.events} events, {stats.crossings} threshold crossings, {stats.triggers} "
+          f"re-scores ({stats.debounced} events debounced). Verdicts in {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
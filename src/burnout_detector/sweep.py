@@ -0,0 +1,264 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, TextIO
+
+from src.burnout_detector.agent_pool import SingleBurnoutAgentPool
+from src.burnout_detector.burnout_result import BurnoutResult
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.prescreen import PrescreenConfig
+from src.burnout_detector.score_store import ScoreStoreConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgentConfig
+
+if TYPE_CHECKING:
+    from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient
+
+
+@dataclass
+class SweepConfig:
+    output_path: str  # JSONL file verdicts are streamed to; also the checkpoint an interrupted sweep resumes from
+    workers: int = 4  # number of candidates analysed in parallel
+    candidate_timeout: Optional[float] = 900.0  # seconds before a candidate is abandoned and recorded as timed out
+    retry_failed: bool = False  # on resume, also re-run candidates whose previous attempt errored or timed out
+
+
+def display_name(user: dict) -> Optional[str]:
+    """
+    The name a processed Rootly user is analysed under.
+    """
+    return user.get("full_name") or user.get("name") or user.get("email")
+
+
+def team_members(team_id: str, client: Optional["RootlyClient"] = None, api_key: Optional[str] = None) -> List[str]:
+    """
+    Names of the members of a Rootly team.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+    from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+    client = client if client is not None else get_rootly_client()
+    team = client.get_json(f"/v1/teams/{team_id}", api_key=api_key).get("data") or {}
+    names = []
+    for user_id in (team.get("attributes") or {}).get("user_ids") or []:
+        user = UsersTool.process_user(client.get_json(f"/v1/users/{user_id}", api_key=api_key).get("data") or {})
+        if user is not None and (name := display_name(user)):
+            names.append(name)
+    return names
+
+
+def schedule_members(schedule_id: str, days: int = 30, client: Optional["RootlyClient"] = None,
+                     api_key: Optional[str] = None) -> List[str]:
+    """
+    Names of the users with an on-call shift on a Rootly schedule in the last `days` days.
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails.
+    """
+    from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+    from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+    from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+    client = client if client is not None else get_rootly_client()
+    now = datetime.now(timezone.utc)
+    user_ids = dict.fromkeys(
+        shift["user_id"]
+        for shift in ShiftsTool(client=client).iter_shifts(
+            (now - timedelta(days=days)).isoformat(), now.isoformat(), schedule_ids=[schedule_id], api_key=api_key
+        )
+        if shift.get("user_id")
+    )
+    names = []
+    for user_id in user_ids:
+        user = UsersTool.process_user(client.get_json(f"/v1/users/{user_id}", api_key=api_key).get("data") or {})
+        if user is not None and (name := display_name(user)):
+            names.append(name)
+    return names
+
+
+def completed_candidates(output_path: str, retry_failed: bool = False) -> Set[str]:
+    """
+    Candidates already recorded in a sweep's output, which a resumed sweep skips. Truncated last lines (from an
+    interrupted write) are ignored.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok" or not retry_failed:
+                done.add(record.get("candidate"))
+    return done
+
+
+class SweepRunner:
+    """
+    Runs `SingleBurnoutAgent` over many engineers with a pool of long-lived agents.
+
+    Each verdict is appended to the output JSONL as soon as it completes, and flushed to disk, so the output doubles
+    as the checkpoint: re-running the same sweep skips every candidate already recorded. A candidate running past
+    `candidate_timeout` is recorded as timed out and abandoned: its agent is interrupted at the end of the current step
+    and its late result is discarded (and not written to the verdict cache or score store). Candidates run on threads,
+    which cannot be killed, so the abandoned run keeps its worker slot until it has stopped; at most `workers` runs are
+    ever live, however many candidates time out.
+    """
+
+    def __init__(self, agent_config: SingleBurnoutAgentConfig, config: SweepConfig):
+        self.agent_config = agent_config
+        self.config = config
+        self.pool = SingleBurnoutAgentPool(agent_config, size=config.workers)
+
+    def _write(self, output: TextIO, record: dict):
+        output.write(json.dumps(record, default=str) + "\n")
+        output.flush()
+        os.fsync(output.fileno())
+
+    def _run_candidate(self, candidate: str, results: "queue.Queue[dict]", started: Dict[str, float],
+                       abandoned: threading.Event):
+        started[candidate] = time.monotonic()
+        record = {"candidate": candidate}
+        try:
+            result = self.pool.detect_burnout(candidate, abandoned=abandoned)
+            if isinstance(result, BurnoutResult):
+                record.update(status="ok" if result.error is None else "error", result=result.to_dict())
+                if result.error is not None:
+                    record["error"] = result.error
+            elif result is None:
+                record.update(status="error", error="The agent did not produce a result.")
+            elif isinstance(result, str) and result.strip().startswith("ERROR"):
+                record.update(status="error", result=result, error=result.strip())
+            else:
+                record.update(status="ok", result=result)
+        except Exception as e:
+            record.update(status="error", error=f"{type(e).__name__}: {e}")
+        record["duration_s"] = round(time.monotonic() - started[candidate], 3)
+        results.put(record)
+
+    def run(self, candidates: Iterable[str]) -> Dict[str, int]:
+        """
+        Analyse the candidates not already recorded in the output.
+
+        Returns:
+            dict: Number of candidates per outcome in this run ("ok", "error", "timeout"), plus "skipped".
+        """
+        from src.burnout_detector.tools.rootly_tools.rootly_client import get_rootly_client
+
+        done = completed_candidates(self.config.output_path, self.config.retry_failed)
+        candidates = list(dict.fromkeys(candidates))
+        pending = [candidate for candidate in candidates if candidate not in done]
+        counts = {"ok": 0, "error": 0, "timeout": 0, "skipped": len(candidates) - len(pending)}
+        if os.path.dirname(self.config.output_path):
+            os.makedirs(os.path.dirname(self.config.output_path), exist_ok=True)
+
+        results: "queue.Queue[dict]" = queue.Queue()
+        started: Dict[str, float] = {}
+        abandoned: Dict[str, threading.Event] = {}
+        running: Set[str] = set()
+        stopping: Set[str] = set()  # abandoned after a timeout, but still finishing their current step
+        timeout = self.config.candidate_timeout
+        with get_rootly_client().run(), open(self.config.output_path, "a") as output:
+            while pending or running:
+                while pending and len(running) + len(stopping) < self.config.workers:
+                    candidate = pending.pop(0)
+                    running.add(candidate)
+                    abandoned[candidate] = threading.Event()
+                    threading.Thread(
+                        target=self._run_candidate, args=(candidate, results, started, abandoned[candidate]),
+                        daemon=True,
+                        name=f"sweep-{candidate}",
+                    ).start()
+
+                wait = None
+                if timeout is not None:
+                    now = time.monotonic()
+                    wait = max(0.0, min(
+                        (started[candidate] + timeout - now if candidate in started else timeout)
+                        for candidate in running
+                    )) if running else None
+                try:
+                    record = results.get(timeout=wait)
+                except queue.Empty:
+                    record = None
+
+                if record is not None:
+                    if record["candidate"] not in running:
+                        stopping.discard(record["candidate"])  # an abandoned run stopped: its slot is free again
+                        continue
+                    running.discard(record["candidate"])
+                    record["finished_at"] = datetime.now(timezone.utc).isoformat()
+                    self._write(output, record)
+                    counts[record["status"]] += 1
+
+                if timeout is not None:
+                    now = time.monotonic()
+                    for candidate in [c for c in running if c in started and now - started[c] >= timeout]:
+                        running.discard(candidate)
+                        stopping.add(candidate)
+                        abandoned[candidate].set()
+                        self._write(output, {
+                            "candidate": candidate,
+                            "status": "timeout",
+                            "error": f"No verdict after {timeout} seconds.",
+                            "duration_s": round(now - started[candidate], 3),
+                            "finished_at": datetime.now(timezone.utc).isoformat(),
+                        })
+                        counts["timeout"] += 1
+        return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run the burnout detector over many engineers.")
+    parser.add_argument("--names", nargs="*", default=[], help="Names of the engineers to analyse.")
+    parser.add_argument("--names-file", help="File with one engineer name per line.")
+    parser.add_argument("--team", help="Rootly team ID whose members are analysed.")
+    parser.add_argument("--schedule", help="Rootly schedule ID whose recent on-call users are analysed.")
+    parser.add_argument("--schedule-days", type=int, default=30, help="How far back to look for schedule members.")
+    parser.add_argument("--output", required=True, help="JSONL output file; re-running with it resumes the sweep.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of engineers analysed in parallel.")
+    parser.add_argument("--timeout", type=float, default=900.0, help="Per-engineer timeout in seconds (0 for none).")
+    parser.add_argument("--retry-failed", action="store_true", help="Re-run engineers that errored or timed out.")
+    parser.add_argument("--model", default="gpt-4o-mini", help="LLM model ID.")
+    parser.add_argument("--snapshot-path", help="Optional SQLite snapshot of the Rootly data to share across runs.")
+    parser.add_argument("--structured", action="store_true", help="Write schema-validated JSON verdicts.")
+    parser.add_argument("--prescreen", action="store_true",
+                        help="Only send engineers whose workload metrics show risk to the LLM.")
+    parser.add_argument("--score-store", help="Optional SQLite score store the structured verdicts are appended to.")
+    args = parser.parse_args(argv)
+
+    candidates = list(args.names)
+    if args.names_file:
+        with open(args.names_file) as file:
+            candidates.extend(line.strip() for line in file if line.strip())
+    if args.team:
+        candidates.extend(team_members(args.team))
+    if args.schedule:
+        candidates.extend(schedule_members(args.schedule, days=args.schedule_days))
+    if not candidates:
+        parser.error("No engineers to analyse: pass --names, --names-file, --team or --schedule.")
+
+    runner = SweepRunner(
+        SingleBurnoutAgentConfig(llm_config=LLMConfig(model_id=args.model), snapshot_path=args.snapshot_path,
+                                 structured_output=args.structured,
+                                 prescreen=PrescreenConfig() if args.prescreen else None,
+                                 score_store=ScoreStoreConfig(path=args.score_store) if args.score_store else None),
+        SweepConfig(output_path=args.output, workers=args.workers, candidate_timeout=args.timeout or None,
+                    retry_failed=args.retry_failed),
+    )
+    counts = runner.run(candidates)
+    print(f"Sweep finished: {counts['ok']} ok, {counts['error']} errors, {counts['timeout']} timeouts, "
+          f"{counts['skipped']} already done. Verdicts in {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from src.burnout_detector.agent_pool import SingleBurnoutAgentPool
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+
+
+def _echo(name, prompt):
+    """
+    Answer with the candidate's name and whether a variable from a previous run is still visible to the code.
+    """
+    return (
+        "try:\n    previous = marker\nexcept Exception:\n    previous = None\n"
+        f"marker = {name!r}\nfinal_answer(f'{name} after {{previous}}')"
+    )
+
+
+def test_reused_agent_resets_between_candidates(monkeypatch, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    model = fake_model(code=_echo)
+    config = SingleBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), reuse_agent=True, show_spinner=False,
+                                      trace_path=None)
+    agent = SingleBurnoutAgent(config)
+    assert agent.detect_burnout("Ada") == "Ada after None"
+    assert agent.detect_burnout("Bob") == "Bob after None"  # nothing leaks from the previous candidate
+    assert len(model.built) == 1
+
+
+def test_agent_pool_runs_candidates_in_parallel(monkeypatch, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    model = fake_model(code=_echo)
+    pool = SingleBurnoutAgentPool(SingleBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), trace_path=None),
+                                  size=2)
+    names = ["Ada", "Bob", "Cy", "Dee", "Eve"]
+    assert pool.detect_burnout_many(names) == [f"{name} after None" for name in names]
+    assert len(model.built) <= 2
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__])
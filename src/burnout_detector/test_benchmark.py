@@ -0,0 +1,42 @@
+import json
+
+from src.burnout_detector import benchmark
+from src.burnout_detector.llm_utils import LLMUtils
+
+
+def test_benchmark_writes_comparable_results(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    argv = ["--suites", "micro", "collection", "e2e", "--sizes", "100", "--collection-records", "100",
+            "--latencies", "0", "--candidates", "2", "--workers", "2", "--repeats", "2", "--in-process"]
+    get_llm_model = LLMUtils.__dict__["get_llm_model"]
+    benchmark.main(argv + ["--output", str(output)])
+    assert LLMUtils.__dict__["get_llm_model"] is get_llm_model
+
+    report = json.loads(output.read_text())
+    results = {result["case_id"]: result for result in report["results"]}
+    assert results["micro/process_incidents[records=100]"]["items"] == 100
+    assert results["collection/incidents[records=100,latency_s=0.0]"]["items"] == 100
+    assert results["e2e/single_agent_sweep[candidates=2,workers=2,llm_latency_s=0.0]"]["items"] == 2
+    assert results["e2e/multi_agent_sweep[candidates=2,llm_latency_s=0.0]"]["items"] == 2
+    for result in results.values():
+        assert result["wall_min_s"] > 0 and result["peak_rss_kb"] > 0 and len(result["wall_s"]) >= 1
+
+    slower = [dict(result, wall_min_s=result["wall_min_s"] * 2) for result in report["results"]]
+    lines = benchmark.compare(slower, report["results"])
+    assert len(lines) == len(results) and all("REGRESSION" in line for line in lines)
+    assert not any("REGRESSION" in line for line in benchmark.compare(report["results"], report["results"]))
+
+
+def test_workload_metrics_stay_fast_at_organization_scale():
+    # 10k engineers, 500k incidents and 260k shifts: a full-organization sweep. Took 0.36s; a per-engineer Python loop
+    # over the shifts had pushed it past 0.9s.
+    (case,) = benchmark.metrics_cases(engineers=10_000, repeats=1)
+    result = benchmark.measure(case)
+    assert result.items == 10_000
+    assert result.wall_min_s < 1.0
+
+
+def test_startup_cases_report_the_child_interpreter_memory():
+    interpreter = next(case for case in benchmark.startup_cases(repeats=1) if case.name == "interpreter")
+    # A bare child interpreter is far smaller than this process, which has the test suite's dependencies loaded.
+    assert 0 < benchmark.measure(interpreter).peak_rss_kb < benchmark._peak_rss_kb()
@@ -0,0 +1,49 @@
+from src.burnout_detector.burnout_result import (
+    BurnoutSeverity, extract_json, normalize_burnout_result, validate_burnout_result,
+)
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+
+
+def _structured_answer(name, prompt):
+    """
+    Answer the agent prompt with a result whose "reasons" field is invalid, and the repair re-ask with a fixed value.
+    """
+    if 'The field "reasons"' in prompt:
+        return '```json\n["Too many off-hours pages"]\n```'
+    return (
+        "<code>\nfinal_answer({'engineer_name': 'Ada Lovelace', 'severity': 'High ', 'reasons': 3, "
+        "'supporting_metrics': {'off_hours_ratio': '0.6'}})\n</code>"
+    )
+
+
+def test_validation_and_normalization():
+    data = extract_json('Here you go:\n```json\n{"engineer_name": "Ada", "severity": "SEVERE", "reasons": "pages", '
+                        '"supporting_metrics": {"on_call_hours": "120"}}\n```')
+    assert validate_burnout_result(data) == {
+        "severity": "expected one of ['none', 'low', 'moderate', 'high', 'severe', 'unknown'], got 'SEVERE'",
+        "reasons": "expected array, got str",
+        "supporting_metrics": "every value must be a number",
+    }
+    assert validate_burnout_result(normalize_burnout_result(data)) == {}
+    assert validate_burnout_result({"engineer_name": "Ada"}).keys() == {"severity", "reasons", "supporting_metrics"}
+
+
+def test_structured_output_repairs_only_invalid_field(monkeypatch, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    model = fake_model(content=_structured_answer)
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), structured_output=True, show_spinner=False, trace_path=None,
+    ))
+    result = agent.detect_burnout("Ada")
+
+    assert result.error is None
+    assert result.severity is BurnoutSeverity.HIGH
+    assert result.reasons == ["Too many off-hours pages"]
+    assert result.supporting_metrics == {"off_hours_ratio": 0.6}
+    assert '"enum"' in model.prompts[0]  # the schema is part of the agent prompt
+    assert len(model.prompts) == 2  # one agent step and one re-ask for the "reasons" field only
+
+
+if __name__ == "__main__":
+    test_validation_and_normalization()
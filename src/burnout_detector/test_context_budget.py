@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+from src.burnout_detector.context_budget import ContextBudget, ContextBudgetConfig, summarize_records
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.tools.rootly_tools.fake_rootly import SyntheticOrg, SyntheticOrgConfig
+
+
+def _incidents(count: int) -> list:
+    return [
+        {"incident_id": str(i), "title": f"Incident {i}", "status": "resolved" if i % 3 else "started",
+         "severity_name": f"SEV{i % 2}", "created_at": f"2025-05-{1 + i % 28:02d}T00:00:00Z", "summary": "x" * 5000}
+        for i in range(count)
+    ]
+
+
+def test_render_projects_dedupes_and_summarises():
+    budget = ContextBudget(ContextBudgetConfig(max_items=5, max_step_tokens=10_000))
+    result = budget.wrap("incidents_tool", _incidents(12))
+    assert len(result) == 12 and "summary" not in result[0]  # the agent's code still sees every record
+
+    first = str(result)
+    assert str(result) == first  # printing again renders the same view
+    assert first.startswith("incidents_tool: 12 records (5 shown below, 7 summarised)")
+    assert '"count": 7' in first and "severity_name" in first and "xxxx" not in first
+
+    again = str(budget.wrap("incidents_tool", _incidents(12)))
+    assert "5 already shown in earlier steps" in again and '"incident_id": "0"' not in again
+    assert budget.stats.duplicates_elided == 5 and budget.stats.records_summarised == 9
+
+    summary = summarize_records(_incidents(6))
+    assert summary["count"] == 6 and summary["status"] == {"resolved": 4, "started": 2}
+    assert summary["created_at"] == {"min": "2025-05-01T00:00:00Z", "max": "2025-05-06T00:00:00Z", "missing": 0}
+
+
+def test_observations_are_cut_to_step_and_run_budgets():
+    budget = ContextBudget(ContextBudgetConfig(max_step_tokens=100, max_run_tokens=150))
+    step = SimpleNamespace(observations="a" * 2_000)
+    budget.observe(step)
+    assert len(step.observations) < 600 and "omitted" in step.observations
+    step = SimpleNamespace(observations="b" * 2_000)
+    budget.observe(step)
+    assert step.observations.startswith("b" * 200) and len(step.observations) < 400
+    step = SimpleNamespace(observations="c" * 10)
+    budget.observe(step)
+    assert "context budget of this run is used up" in step.observations
+    assert budget.remaining_tokens == 0
+
+
+def test_agent_sees_budgeted_tool_output(monkeypatch, fake_model, fake_rootly_client):
+    observations = []
+
+    def print_incidents_twice(name, prompt):
+        observations[:] = prompt.split("Execution logs:")[1:]
+        return "print(incidents_tool(user_id=1))" if len(observations) < 2 else "final_answer('done')"
+
+    fake_model(code=print_incidents_twice)
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    org = SyntheticOrg(SyntheticOrgConfig(users=3, schedules=1, incidents=150, now="2025-06-01T00:00:00Z"))
+    fake_rootly_client(org)
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False, precompute_metrics=False,
+        context_budget=ContextBudgetConfig(max_items=10),
+    ))
+    assert agent.detect_burnout("Ada") == "done"
+
+    first, second = observations
+    assert "(10 shown below" in first and "summarised" in first and "Summary of the records not shown" in first
+    assert "10 already shown in earlier steps" in second
+    assert len(first) < 4 * ContextBudgetConfig().max_step_tokens + 500
@@ -1,7 +1,15 @@
+import os
+
+import pytest
+
 from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
 from src.burnout_detector.llm_utils import LLMConfig
 
 
+@pytest.mark.skipif(
+    not (os.getenv("OPENAI_API_KEY") and os.getenv("ROOTLY_API_KEY")),
+    reason="needs a live LLM and Rootly API (set OPENAI_API_KEY and ROOTLY_API_KEY)",
+)
 def test_single_detector_agent():
     config = SingleBurnoutAgentConfig(
         llm_config=LLMConfig(
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.burnout_detector.incident_batch import IncidentBatch
+from src.burnout_detector.workload_metrics import build_incident_columns, compute_workload_metrics, parse_epoch
+
+
+INCIDENTS = [
+    {
+        "incident_id": "1", "title": "DB down", "status": "resolved", "kind": "normal", "severity_name": "SEV1",
+        "severity_level": "critical", "summary": None, "created_at": "2025-06-07T02:00:00Z",
+        "updated_at": "2025-06-07T04:00:00Z", "started_at": "2025-06-07T02:00:00Z",
+        "resolved_at": "2025-06-07T04:00:00Z", "environments": ["production"], "services": ["db", "api"],
+    },
+    {
+        "incident_id": "2", "title": "Slow API", "status": "started", "kind": "normal", "severity_name": "SEV3",
+        "severity_level": None, "summary": "p99 latency", "created_at": "2025-06-09T10:00:00Z",
+        "updated_at": "2025-06-09T10:30:00Z", "started_at": None, "resolved_at": None,
+        "environments": [], "services": ["api"],
+    },
+    {
+        "incident_id": "3", "title": "Cert expiry", "status": "resolved", "kind": "scheduled", "severity_name": None,
+        "severity_level": "low", "summary": None, "created_at": "2025-06-10T08:00:00Z",
+        "updated_at": "2025-06-10T09:00:00Z", "started_at": "2025-06-10T08:00:00Z",
+        "resolved_at": "2025-06-10T09:00:00Z", "environments": ["staging"], "services": [],
+    },
+]
+
+
+def test_incident_batch():
+    batch = IncidentBatch.from_incidents(iter(INCIDENTS))
+    assert len(batch) == 3
+    assert list(batch.to_dicts()) == INCIDENTS
+    assert batch[1] == INCIDENTS[1]
+
+    assert batch.mask(status="resolved").tolist() == [True, False, True]
+    assert batch.mask(created_at_gte="2025-06-08T00:00:00Z", kind="normal").tolist() == [False, True, False]
+    assert batch.mask(status="unknown-status").tolist() == [False, False, False]
+    assert batch.has_value("services", "api").tolist() == [True, True, False]
+    assert batch.value_counts("status") == {"resolved": 2, "started": 1}
+    assert batch.value_counts("severity_level") == {"critical": 1, "low": 1, None: 1}
+    assert batch.value_counts("services", mask=batch.mask(status="resolved")) == {"db": 1, "api": 1}
+
+    selected = batch.select(batch.mask(status="resolved"))
+    assert list(selected.to_dicts()) == [INCIDENTS[0], INCIDENTS[2]]
+
+    # The columnar path into the workload metrics matches the dictionary path.
+    from_batch = build_incident_columns(["42"], {"42": batch})
+    from_dicts = build_incident_columns(["42"], {"42": INCIDENTS})
+    for name in ("engineer", "started_at", "resolved_at", "severity"):
+        assert np.array_equal(getattr(from_batch, name), getattr(from_dicts, name))
+    now = parse_epoch("2025-06-11T00:00:00Z")
+    assert compute_workload_metrics({"42": batch}, now=now) == compute_workload_metrics({"42": INCIDENTS}, now=now)
+
+
+if __name__ == "__main__":
+    test_incident_batch()
@@ -0,0 +1,78 @@
+import threading
+
+from smolagents.models import ChatMessage, TokenUsage
+
+from src.burnout_detector.llm_scheduler import LLMScheduler, LLMSchedulerConfig, MinuteBudget, parse_bulk_response
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+
+class _FakeModel:
+    """
+    Answers bulk prompts with one block per "Name: ..." line, failing transiently on its first call and permanently
+    for prompts mentioning "Broken".
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate(self, messages):
+        prompt = messages[0].content[0]["text"]
+        with self.lock:
+            self.calls += 1
+            first_call = self.calls == 1
+        if first_call:
+            raise _RateLimitError("slow down")
+        if "Broken" in prompt:
+            raise ValueError("context length exceeded")
+        names = [line[len("Name: "):] for line in prompt.splitlines() if line.startswith("Name: ")]
+        output = "\n".join(
+            f"==== Engineer: {name} ====\n- Burnout reason: Too many pages\n- Burnout severity: High\n"
+            f"==== End of engineer ====" for name in names
+        )
+        return ChatMessage(role="assistant", content=output, token_usage=TokenUsage(input_tokens=10, output_tokens=5))
+
+
+def test_scheduler_retries_and_isolates_failures():
+    model = _FakeModel()
+    scheduler = LLMScheduler(model, LLMSchedulerConfig(max_concurrency=3, backoff_base=0.0))
+    prompts = ["Name: Ada\nName: Bob", "Name: Broken", "Name: Cy"]
+    results = scheduler.run(prompts)
+
+    assert [result.prompt for result in results] == prompts
+    assert results[1].error is not None and "context length" in results[1].error
+    assert all(results[i].output for i in (0, 2))
+    assert scheduler.stats.retries == 1
+    assert scheduler.stats.failures == 1
+
+    parsed = parse_bulk_response(results[0].output, ["Ada", "Bob", "Eve"])
+    assert parsed[0] == {"name": "Ada", "raw": parsed[0]["raw"], "burnout_reason": "Too many pages",
+                         "burnout_severity": "High"}
+    assert parsed[1]["burnout_severity"] == "High"
+    assert "error" in parsed[2]
+
+
+def test_minute_budget_waits_for_window():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    budget = MinuteBudget(requests_per_minute=2, tokens_per_minute=100, clock=lambda: now[0], sleep=sleep)
+    first, _ = budget.reserve(60)
+    budget.settle(first, 30)
+    budget.reserve(60)  # fits once the first reservation is settled at its real usage
+    assert sleeps == []
+    now[0] = 10.0
+    _, waited = budget.reserve(10)  # over the RPM budget until the first request leaves the window
+    assert waited == 50.0
+
+
+if __name__ == "__main__":
+    test_scheduler_retries_and_isolates_failures()
+    test_minute_budget_waits_for_window()
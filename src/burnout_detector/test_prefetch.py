@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.prefetch import Prefetch
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.tools.rootly_tools.fake_rootly import SyntheticOrg, SyntheticOrgConfig
+from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+
+def test_agent_tool_calls_are_served_from_the_prefetch(monkeypatch, fake_model, fake_rootly_client):
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    org = SyntheticOrg(SyntheticOrgConfig(users=5, schedules=2, incidents=200))
+    name = org.records["users"][0]["attributes"]["full_name"]
+    created_at_gte = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    # Look the candidate up with every tool in one code action, and answer with the record counts.
+    fake_model(code=lambda _, prompt: (
+        f"users = users_tool(search={name!r})\n"
+        f"incidents = incidents_tool(user_id=int(users[0]['id']), created_at_gte={created_at_gte!r})\n"
+        "schedules = shifts_tool()\n"
+        "final_answer(f'{len(users)} {len(incidents)} {len(schedules)}')"
+    ))
+    server, _ = fake_rootly_client(org)
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False, context_budget=None,
+    ))
+    answer = agent.detect_burnout(name)
+    prefetched_paths = sorted(path.split("?")[0] for path in server.stats.paths)
+
+    user_id = org.records["users"][0]["id"]
+    expected = [
+        len(list(UsersTool().iter_users(search=name))),
+        len(list(IncidentsTool().iter_incidents(user_id, created_at_gte))),
+        len(list(ShiftsTool().iter_schedules())),
+    ]
+
+    assert answer == " ".join(map(str, expected)) and expected[1] > 0
+    # One request per resource, all made before the first step; none from the tool calls.
+    assert prefetched_paths == ["/v1/incidents", "/v1/schedules", "/v1/shifts", "/v1/users"]
+    assert all(tool.prefetch is None for tool in (agent.users_tool, agent.incidents_tool, agent.shifts_tool))
+
+
+def test_calls_outside_the_prefetch_go_to_rootly(fake_rootly_client):
+    org = SyntheticOrg(SyntheticOrgConfig(users=5, schedules=2, incidents=100, now="2025-06-01T00:00:00Z"))
+    name = org.records["users"][1]["attributes"]["full_name"]
+    now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    fake_rootly_client(org)
+    prefetch = Prefetch(UsersTool(), IncidentsTool(), ShiftsTool(), name, window_days=30, now=now)
+    user_id = prefetch.user()["id"]
+    in_window = prefetch.lookup("incidents_tool", user_id=int(user_id), created_at_gte="2025-05-15T00:00:00Z",
+                                created_at_lte="2025-05-20T00:00:00Z")
+    expected = list(IncidentsTool().iter_incidents(user_id, "2025-05-15T00:00:00Z", "2025-05-20T00:00:00Z"))
+    assert in_window == expected
+    assert prefetch.lookup("incidents_tool", user_id=int(user_id), created_at_gte="2025-04-01T00:00:00Z") is None
+    assert prefetch.lookup("incidents_tool", user_id=999, created_at_gte="2025-05-15T00:00:00Z") is None
+    assert prefetch.lookup("users_tool", search="someone else") is None
+    assert [s["name"] for s in prefetch.lookup("shifts_tool", schedule_name="Schedule 1")] == ["Schedule 1"]
+    assert prefetch.stats.hits == 2 and prefetch.stats.misses == 3
+    prefetch.close()
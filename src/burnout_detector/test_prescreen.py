@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from src.burnout_detector.burnout_result import BurnoutSeverity
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.multi_burnout_agent import MultiBurnoutAgent, MultiBurnoutAgentConfig
+from src.burnout_detector.prescreen import PrescreenConfig, Prescreener, prescreen
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.tools.rootly_tools.fake_rootly import SyntheticOrg, SyntheticOrgConfig
+from src.burnout_detector.workload_metrics import WorkloadMetrics
+
+
+def _no_llm_call(name, prompt):
+    raise AssertionError("the LLM must not be called for pre-screened candidates")
+
+
+def test_prescreen_signals():
+    quiet = WorkloadMetrics("1", incident_count=2, incidents_by_severity={"low": 2}, off_hours_ratio=1.0,
+                            on_call_hours=120.0, max_consecutive_on_call_days=2)
+    decision = prescreen(quiet, 28)
+    # Two incidents, both at night, are too few for the off-hours ratio to count.
+    assert not decision.escalate and decision.signals["off_hours"] == 0.0
+    assert decision.metrics["on_call_hours_per_week"] == 30.0 and decision.reasons() == []
+
+    busy = WorkloadMetrics("2", incident_count=20, incidents_by_severity={"critical": 1, "high": 3, "low": 16},
+                           off_hours_ratio=0.5, on_call_hours=200.0, max_consecutive_on_call_days=10)
+    decision = prescreen(busy, 28)
+    assert decision.escalate and decision.score == decision.signals["severity"] == 2.0
+    assert decision.reasons() == ["severity", "incident_volume", "on_call_streak", "off_hours", "on_call_density"]
+    assert not prescreen(busy, 28, PrescreenConfig(risk_threshold=2.5)).escalate
+
+
+def test_prescreener_fetches_and_scores_many_engineers(fake_rootly_client):
+    org = SyntheticOrg(SyntheticOrgConfig(users=6, schedules=2, incidents=300, now="2025-06-01T00:00:00Z"))
+    fake_rootly_client(org)
+    screener = Prescreener(PrescreenConfig(window_days=30))
+    time_zones = {user["id"]: None for user in org.records["users"]}
+    decisions = screener.screen(time_zones, api_key="test", now=datetime(2025, 6, 1, tzinfo=timezone.utc))
+
+    assert set(decisions) == set(time_zones)
+    assert sum(decision.metrics["incident_count"] for decision in decisions.values()) > 0
+    assert any(decision.metrics["on_call_hours_per_week"] > 0 for decision in decisions.values())
+
+
+def test_agents_skip_the_llm_below_the_risk_threshold(monkeypatch, fake_model, fake_rootly_client):
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    model = fake_model(code=_no_llm_call)
+    org = SyntheticOrg(SyntheticOrgConfig(users=3, schedules=1, incidents=30, now="2025-06-01T00:00:00Z"))
+    names = [user["attributes"]["full_name"] for user in org.records["users"]]
+    screen = PrescreenConfig(risk_threshold=1_000.0)
+    fake_rootly_client(org)
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False, structured_output=True,
+        prescreen=screen,
+    ))
+    result = agent.detect_burnout(names[0])
+    text = agent.detect_burnout(names[0], SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False, prescreen=screen,
+    ))
+
+    multi = MultiBurnoutAgent(MultiBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), prescreen=screen))
+    results = multi.detect_burnout(multi.collect_burnout_candidates(names))
+
+    assert result.severity == BurnoutSeverity.NONE and result.engineer_id == org.records["users"][0]["id"]
+    assert "incident_count" in result.supporting_metrics and "prescreen_score" in result.supporting_metrics
+    assert "- Burnout severity: none" in text and "incident_count" in text
+    assert [r["name"] for r in results] == names
+    assert all(r["burnout_severity"] == "none" and not r["prescreen"]["escalate"] for r in results)
+    assert "on_call_hours_per_week" in results[0]["prescreen"]["metrics"]
+    assert model.prompts == []
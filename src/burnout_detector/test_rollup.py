@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.burnout_detector.rollup import RollupConfig, RollupCube
+from src.burnout_detector.stream import WorkloadEvent
+from src.burnout_detector.tools.rootly_tools.fake_rootly import SyntheticOrg, SyntheticOrgConfig
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def _incident(incident_id: str, severity: str, services, started_at="2025-06-02T23:00:00Z", **extra) -> dict:
+    return {"incident_id": incident_id, "severity_level": severity, "services": services, "environments": ["prod"],
+            "started_at": started_at, **extra}
+
+
+def test_slices_count_multi_valued_facts_once_and_follow_updates():
+    cube = RollupCube()
+    cube.set_teams({"1": "sre", "2": "sre", "3": "web"})
+    cube.add_incident(_incident("a", "critical", ["api", "db"], resolved_at="2025-06-03T01:00:00Z"), ["1", "2", "3"])
+    cube.add_incident(_incident("b", "low", ["api"], started_at="2025-06-03T10:00:00Z"), ["3"])
+
+    assert cube.query(measures=["incidents", "off_hours_incidents", "resolve_hours"]) == [
+        {"incidents": 2, "off_hours_incidents": 1, "resolve_hours": 2.0}
+    ]
+    assert cube.query(["team"], measures=["incidents"]) == [{"team": "sre", "incidents": 1},
+                                                            {"team": "web", "incidents": 2}]
+    assert cube.query(["service"], {"team": "sre"}, ["incidents"]) == [{"service": "api", "incidents": 1},
+                                                                      {"service": "db", "incidents": 1}]
+    assert cube.query(["severity"], {"service": "api", "team": ["web"]}, ["incidents"]) == [
+        {"severity": "critical", "incidents": 1}, {"severity": "low", "incidents": 1},
+    ]
+
+    # An update replaces the incident's contribution, a delete removes it, and a re-org moves it.
+    cube.add_incident(_incident("a", "high", ["db"]), ["1"])
+    cube.apply(WorkloadEvent("incident", {"incident_id": "b"}, ["3"], deleted=True))
+    cube.set_teams({"1": "web"})
+    assert cube.query(["team", "severity", "service"], measures=["incidents"]) == [
+        {"team": "web", "severity": "high", "service": "db", "incidents": 1}
+    ]
+    with pytest.raises(ValueError):
+        cube.query(["region"])
+
+
+def test_shifts_and_risk_scores(tmp_path):
+    cube = RollupCube()
+    cube.set_schedules([{"id": "s1", "name": "Primary", "owner_group_ids": ["platform"]}])
+    cube.set_teams({"1": "sre"})
+    cube.add_shift({"id": "x", "schedule_id": "s1", "user_id": "1",
+                    "starts_at": "2025-06-01T00:00:00Z", "ends_at": "2025-06-01T12:00:00Z"})
+    cube.add_shift({"id": "y", "schedule_id": "s1", "user_id": "9",  # no known team: the schedule's owner team
+                    "starts_at": "2025-06-01T12:00:00Z", "ends_at": "2025-06-02T00:00:00Z"})
+    for user_id, score in (("1", 3.0), ("2", 1.0), ("1", 2.0)):
+        cube.set_risk(user_id, score)
+    cube.set_teams({"2": "sre"})
+
+    assert cube.query(["team", "schedule"], measures=["shifts", "on_call_hours"]) == [
+        {"team": "platform", "schedule": "Primary", "shifts": 1, "on_call_hours": 12.0},
+        {"team": "sre", "schedule": "Primary", "shifts": 1, "on_call_hours": 12.0},
+    ]
+    assert cube.query(["team"], {"team": "sre"}, ["scored_engineers", "at_risk_engineers", "mean_risk"]) == [
+        {"team": "sre", "scored_engineers": 2, "at_risk_engineers": 1, "mean_risk": 1.5}
+    ]
+
+    path = str(tmp_path / "cube.json")
+    cube.save(path)
+    loaded = RollupCube.load(path)
+    assert loaded.query(["team"]) == cube.query(["team"])
+    loaded.set_risk("2", None)
+    assert loaded.query(["team"], {"team": "sre"}, ["mean_risk"]) == [{"team": "sre", "mean_risk": 2.0}]
+
+
+def test_facts_leave_the_window_and_empty_cells_are_dropped():
+    cube = RollupCube(RollupConfig(window_days=7))
+    cube.apply(WorkloadEvent("incident", _incident("a", "high", ["api"], created_at="2025-06-01T00:00:00Z",
+                                                   resolved_at="2025-06-03T01:00:07Z"), ["1"]))
+    cube.apply(WorkloadEvent("shift", {"id": "s", "user_id": "1", "starts_at": "2025-06-01T00:00:00Z",
+                                       "ends_at": "2025-06-01T12:00:00Z"}, ["1"]))
+    cube.apply(WorkloadEvent("incident", _incident("b", "low", ["db"], created_at="2025-06-05T00:00:00Z",
+                                                   resolved_at="2025-06-05T00:00:01Z"), ["1"]))
+    assert cube.query(measures=["incidents", "shifts"]) == [{"incidents": 2, "shifts": 1}]
+
+    # A week after "a" was created, the event time has moved past it and past the shift.
+    cube.apply(WorkloadEvent("incident", _incident("c", "low", ["db"], created_at="2025-06-09T00:00:00Z"), ["1"]))
+    assert cube.query(["service"], measures=["incidents"]) == [{"service": "db", "incidents": 2}]
+    assert cube.query(["schedule"]) == []
+
+    # Removing the rest leaves no cells behind, even where float sums are only ~0.
+    cube.remove("incident", "b")
+    cube.remove("incident", "c")
+    assert cube.query() == [] and cube.query(["severity", "service"]) == []
+    assert cube.expire(datetime(2026, 1, 1, tzinfo=timezone.utc)) == 0
+
+
+def test_sync_matches_the_records_and_is_incremental(fake_rootly_client):
+    org = SyntheticOrg(SyntheticOrgConfig(users=20, incidents=150, now="2025-06-01T00:00:00Z"))
+    _, client = fake_rootly_client(org)
+    cube = RollupCube()
+    counts = cube.sync(client, api_key="test", now=NOW)
+    assert counts["incidents"] > 0 and counts["shifts"] > 0 and counts["teams"] == 5
+    total = cube.query(measures=["incidents"])[0]["incidents"]
+    assert total == counts["incidents"]
+    by_severity = cube.query(["severity"], measures=["incidents"])
+    assert sum(row["incidents"] for row in by_severity) == total
+    assert sum(row["incidents"] for row in cube.query(["team"], measures=["incidents"])) >= total
+
+    # A second sync only re-reads the incidents updated since the first; the totals do not change.
+    assert cube.sync(client, api_key="test", now=NOW)["incidents"] < counts["incidents"]
+    assert cube.query(measures=["incidents"])[0]["incidents"] == total
+
+
+def test_sync_watermark_skips_unparsable_updated_at(fake_rootly_client):
+    org = SyntheticOrg(SyntheticOrgConfig(users=5, incidents=20, now="2025-06-01T00:00:00Z"))
+    for incident in org.records["incidents"][::2]:
+        incident["attributes"]["updated_at"] = "yesterday"  # sorts after every ISO timestamp as a string
+    newest = max(incident["attributes"]["updated_at"] for incident in org.records["incidents"][1::2])
+    _, client = fake_rootly_client(org)
+    cube = RollupCube()
+    cube.sync(client, api_key="test", now=NOW)
+    assert cube._watermark == newest
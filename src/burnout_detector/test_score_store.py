@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.burnout_detector.burnout_result import BurnoutResult, BurnoutSeverity
+from src.burnout_detector.score_store import ScoreStore, ScoreStoreConfig, decode_block, decode_blocks
+
+DAY = 86400
+T0 = 1_735_689_600  # 2025-01-01
+
+
+def test_points_round_trip_across_blocks_and_reopening(tmp_path):
+    path = str(tmp_path / "scores.db")
+    store = ScoreStore(ScoreStoreConfig(path=path, block_seconds=DAY))
+    points = [(T0 + 3600, 2.5), (T0, -1.25), (T0 + 7200, 0.001), (T0 + DAY, 4.0), (T0 + 2 * DAY, 3.0)]
+    for timestamp, value in points:
+        store.append("u1", {"score": value}, timestamp)
+    store.append_many([("u1", T0 + 3 * DAY, {"score": 1.0, "off_hours_ratio": 0.4}), ("u2", T0, {"score": 0.0})])
+    store.close()
+
+    store = ScoreStore(ScoreStoreConfig(path=path, block_seconds=DAY))
+    store.append("u1", {"score": 2.0}, T0 + 4 * DAY)  # appends to the block of its day
+    assert store.range("u1") == sorted(points + [(T0 + 3 * DAY, 1.0), (T0 + 4 * DAY, 2.0)])
+    assert store.range("u1", start=T0 + DAY, end=T0 + 3 * DAY) == [(T0 + DAY, 4.0), (T0 + 2 * DAY, 3.0),
+                                                                     (T0 + 3 * DAY, 1.0)]
+    assert store.range("u1", "off_hours_ratio") == [(T0 + 3 * DAY, 0.4)]
+    stats = store.stats
+    assert stats.engineers == 2 and stats.series == 3 and stats.points == 9 and stats.blocks == 7
+    assert stats.bytes < 9 * 8  # a few bytes per point
+    assert decode_block(bytes([2, 4]), 1000) == ([1], [0.002])
+    blocks, timestamps, values = decode_blocks([bytes([2, 4]), b"", bytes([2, 3, 0, 2])], [1, 0, 2], 1000)
+    assert blocks.tolist() == [0, 2, 2] and timestamps.tolist() == [1, 1, 1]
+    assert values.tolist() == [0.002, -0.002, -0.001]
+
+
+def test_trends_match_a_full_regression_and_team_rollups():
+    store = ScoreStore(ScoreStoreConfig(block_seconds=14 * DAY))
+    rng = np.random.default_rng(0)
+    slopes = {f"u{i}": (0.01 if i % 2 else -0.005) for i in range(200)}
+    series = {}
+    for engineer_id, slope in slopes.items():
+        days = np.sort(rng.uniform(0, 180, 40))
+        values = np.round(np.clip(1.5 + slope * days + rng.normal(0, 0.1, days.size), 0, 4), 3)
+        series[engineer_id] = (T0 + (days * DAY).astype(int), values)
+        store.append_many((engineer_id, int(t), {"score": float(v)}) for t, v in zip(*series[engineer_id]))
+    store.set_teams({engineer_id: "odd" if int(engineer_id[1:]) % 2 else "even" for engineer_id in slopes})
+
+    start, end = T0 + 30 * DAY, T0 + 150 * DAY  # cuts through blocks at both ends
+    trends = store.trends(start=start, end=end)
+    for engineer_id, (timestamps, values) in series.items():
+        inside = (timestamps >= start) & (timestamps <= end)
+        expected = np.polyfit(timestamps[inside] / DAY, values[inside], 1)[0]
+        assert trends[engineer_id].points == inside.sum()
+        assert abs(trends[engineer_id].slope_per_day - expected) < 1e-4
+
+    rising = store.rising(0.007, start=start, end=end, team="odd")
+    assert {trend.engineer_id for trend in rising} == {e for e, slope in slopes.items() if slope > 0}
+    assert store.rising(0.007, start=start, end=end, team="even") == []
+
+    rollup = store.team_rollup("odd", bucket_seconds=30 * DAY)
+    assert len(rollup) >= 6 and rollup[-1]["mean"] > rollup[0]["mean"]
+    assert all(bucket["engineers"] <= 100 for bucket in rollup)
+
+
+def test_record_verdicts():
+    store = ScoreStore()
+    result = BurnoutResult("Ada", BurnoutSeverity.HIGH, engineer_id="7", supporting_metrics={"incident_count": 12})
+    assert store.record(result, timestamp=T0, team="sre")
+    assert not store.record(BurnoutResult("Bob", BurnoutSeverity.UNKNOWN, error="no data"), timestamp=T0)
+    assert store.range("7") == [(T0, 3.0)] and store.range("7", "incident_count") == [(T0, 12.0)]
+    assert store.team_rollup("sre") == [{"start": T0 // (7 * DAY) * 7 * DAY, "engineers": 1, "mean": 3.0, "max": 3.0}]
+
+
+def test_points_alternating_between_blocks_in_one_call_are_all_kept():
+    store = ScoreStore(ScoreStoreConfig(block_seconds=DAY))
+    points = [(10 * DAY + 5, 1.0), (9 * DAY + 5, 2.0), (10 * DAY + 6, 3.0), (9 * DAY + 6, 4.0)]
+    store.append_many(("e", timestamp, {"score": value}) for timestamp, value in points)
+    store.append_many([("e", 10 * DAY + 7, {"score": 5.0}), ("e", 9 * DAY + 7, {"score": 6.0})])
+    assert store.range("e") == sorted(points + [(10 * DAY + 7, 5.0), (9 * DAY + 7, 6.0)])
+    assert store.stats.points == 6
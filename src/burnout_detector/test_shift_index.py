@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.burnout_detector.shift_index import ShiftIntervalIndex, merge_intervals
+from src.burnout_detector.workload_metrics import parse_epoch
+
+
+SHIFTS = [
+    {"user_id": "1", "starts_at": "2025-06-01T00:00:00Z", "ends_at": "2025-06-02T00:00:00Z"},
+    {"user_id": "1", "starts_at": "2025-06-02T00:00:00Z", "ends_at": "2025-06-02T12:00:00Z"},
+    {"user_id": "2", "starts_at": "2025-06-01T12:00:00Z", "ends_at": "2025-06-03T00:00:00Z"},
+    {"user_id": "3", "starts_at": "2025-06-05T00:00:00Z", "ends_at": "2025-06-06T00:00:00Z"},
+]
+
+
+def test_shift_index_queries():
+    index = ShiftIntervalIndex.from_shifts(SHIFTS)
+    times = [parse_epoch(t) for t in ("2025-06-01T06:00:00Z", "2025-06-02T06:00:00Z", "2025-06-04T00:00:00Z")]
+    assert index.on_call_users(times) == [["1"], ["1", "2"], []]
+
+    incidents = [
+        {"started_at": "2025-06-01T13:00:00Z", "resolved_at": "2025-06-01T14:00:00Z"},
+        {"started_at": "2025-06-03T23:00:00Z", "resolved_at": "2025-06-05T01:00:00Z"},
+        {"started_at": None},
+    ]
+    assert index.join_incidents(incidents) == [["1", "2"], [], []]
+    assert index.join_incidents(incidents, mode="overlap") == [["1", "2"], ["3"], []]
+
+    window = parse_epoch("2025-06-01T12:00:00Z"), parse_epoch("2025-06-02T06:00:00Z")
+    assert index.on_call_hours("1", *window) == 18.0
+    assert index.max_consecutive_on_call_hours("1") == 36.0
+    assert index.max_consecutive_on_call_hours("3") == 24.0
+
+
+def test_merge_intervals_keeps_groups_apart():
+    groups = np.array([1, 0, 1, 0, 1, 2])
+    starts = np.array([10, 0, 0, 5, 30, 3])
+    ends = np.array([20, 8, 10, 6, 40, 4])
+    merged_groups, merged_starts, merged_ends = merge_intervals(groups, starts, ends)
+    # Group 0's [5, 6) lies inside [0, 8); group 1's [0, 10) and [10, 20) touch; group 2 ends before group 1 began.
+    assert merged_groups.tolist() == [0, 1, 1, 2]
+    assert merged_starts.tolist() == [0, 0, 30, 3]
+    assert merged_ends.tolist() == [8, 20, 40, 4]
+
+
+if __name__ == "__main__":
+    test_shift_index_queries()
+    test_merge_intervals_keeps_groups_apart()
@@ -0,0 +1,17 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.burnout_detector.benchmark import STARTUP_MODULES
+
+
+def test_entry_points_do_not_import_heavy_dependencies():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    heavy = ["smolagents", "litellm", "numpy", "requests", "yaml", "halo"]
+    for module in STARTUP_MODULES:
+        if module.endswith("_tool"):
+            continue  # tools are smolagents Tools
+        code = f"import json, sys, {module}; print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+        loaded = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        assert json.loads(loaded) == [], f"importing {module} loads {loaded.strip()}"
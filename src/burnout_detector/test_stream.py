@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timezone
+
+from src.burnout_detector.stream import (
+    JsonlEventSource, QueueEventSource, StreamConfig, StreamingRescorer, WorkloadEvent,
+)
+from src.burnout_detector.workload_metrics import parse_epoch
+
+T0 = parse_epoch("2025-06-02T00:00:00Z")
+
+
+def _incident(incident_id: str, user_id: str, at: int, severity: str = "critical", **extra) -> WorkloadEvent:
+    started_at = datetime.fromtimestamp(at, timezone.utc).isoformat()
+    return WorkloadEvent("incident", {"incident_id": incident_id, "started_at": started_at,
+                                      "severity_level": severity, **extra}, [user_id])
+
+
+def test_storm_is_debounced_into_one_rescore_per_crossing():
+    triggered = []
+    rescorer = StreamingRescorer(StreamConfig(), on_trigger=lambda user_id, decision: triggered.append(user_id),
+                                 clock=lambda: 0.0)
+    for i in range(10):  # an incident storm on a Monday night
+        rescorer.apply(_incident(f"a{i}", "1", T0 + i * 60))
+        assert rescorer.tick() == []
+    rescorer.apply(_incident("b0", "2", T0 + 9 * 60 + 901, severity="low"))
+    assert [user_id for user_id, _ in rescorer.tick()] == ["1"] and triggered == ["1"]
+    stats = rescorer.stats
+    assert stats.crossings == 1 and stats.debounced == 8 and stats.triggers == 1 and stats.engineers == 2
+
+    # Still at risk: more incidents do not re-run the agent.
+    rescorer.apply(_incident("a10", "1", T0 + 3 * 3600))
+    assert rescorer.tick(flush=True) == []
+
+    # A week later the old incidents have left the window; a new crossing re-runs the agent.
+    later = T0 + 8 * 86400
+    rescorer.apply(_incident("a11", "1", later))
+    assert not rescorer.decision("1").escalate and rescorer.metrics("1").incident_count == 1
+    rescorer.apply(_incident("a12", "1", later + 60))
+    assert rescorer.tick() == [] and [user_id for user_id, _ in rescorer.tick(flush=True)] == ["1"]
+    assert rescorer.stats.crossings == 2 and triggered == ["1", "1"]
+
+
+def test_updates_deletes_and_run_budget():
+    rescorer = StreamingRescorer(StreamConfig(max_runs_per_hour=1, debounce_seconds=0), clock=lambda: 0.0)
+    rescorer.apply(_incident("1", "1", T0, severity="low"))
+    rescorer.apply(_incident("1", "1", T0, severity="critical", resolved_at="2025-06-02T01:00:00Z"))
+    assert rescorer.metrics("1").incidents_by_severity == {"critical": 1}
+    rescorer.apply(WorkloadEvent("incident", {"incident_id": "1"}, ["1"], deleted=True))
+    assert rescorer.metrics("1").incident_count == 0
+
+    for user_id in ("2", "3"):
+        for i in range(2):
+            rescorer.apply(_incident(f"{user_id}-{i}", user_id, T0 + i))
+    assert len(rescorer.tick()) == 1 and rescorer.stats.deferred == 1
+    assert rescorer.tick() == [] and rescorer.stats.deferred == 2  # the other one waits for the next hour
+
+
+def test_replays_raw_events_from_a_file(tmp_path):
+    path = tmp_path / "events.jsonl"
+    raw_incident = {
+        "id": "99", "type": "incidents",
+        "attributes": {
+            "title": "Database down", "started_at": "2025-06-02T23:00:00Z",
+            "severity": {"data": {"attributes": {"severity": "critical"}}},
+            "started_by": {"data": {"id": "7"}},
+        },
+    }
+    events = [
+        {"type": "shift", "op": "upsert",
+         "data": {"id": "s1", "user_id": "7", "starts_at": "2025-06-01T00:00:00Z", "ends_at": "2025-06-03T00:00:00Z"}},
+        {"type": "incident", "op": "upsert", "data": raw_incident},
+        {"type": "incident", "op": "upsert", "data": {**raw_incident, "id": "100"}},
+    ]
+    path.write_text("".join(json.dumps(event) + "\n" for event in events))
+
+    triggered = []
+    rescorer = StreamingRescorer(on_trigger=lambda user_id, decision: triggered.append((user_id, decision)),
+                                 clock=lambda: 0.0)
+    stats = rescorer.run(JsonlEventSource(str(path)))
+    assert stats.events == 3 and [user_id for user_id, _ in triggered] == ["7"]
+    assert triggered[0][1].metrics["on_call_hours_per_week"] == 48.0
+    assert rescorer.metrics("7").off_hours_ratio == 1.0
+
+    source = QueueEventSource(idle_timeout=0.01)
+    source.put(events[1])
+    source.close()
+    assert [event.user_ids for event in source] == [["7"]]
@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.score_store import ScoreStoreConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.sweep import SweepConfig, SweepRunner
+
+
+def _sweep_answer(name, prompt):
+    """
+    A verdict naming the candidate; "Slow" candidates take two seconds, "Missing" ones return an ERROR.
+    """
+    if name.startswith("Slow"):
+        time.sleep(2.0)
+    answer = f"ERROR: no data for {name}" if name.startswith("Missing") else f"- Engineer name: {name}"
+    return f"final_answer({answer!r})"
+
+
+def test_sweep_streams_and_resumes(tmp_path, monkeypatch, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    fake_model(code=_sweep_answer)
+    agent_config = SingleBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), trace_path=None)
+    output = tmp_path / "sweep.jsonl"
+    names = ["Ada", "Bob", "Slow", "Missing", "Cy"]
+
+    runner = SweepRunner(agent_config, SweepConfig(str(output), workers=2, candidate_timeout=1.5))
+    counts = runner.run(names)
+    assert counts == {"ok": 3, "error": 1, "timeout": 1, "skipped": 0}
+    time.sleep(1.0)  # the abandoned "Slow" run stops and returns its agent
+    assert runner.pool._agents.qsize() == 2
+    records = {record["candidate"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert records["Ada"]["result"] == "- Engineer name: Ada"
+    assert records["Slow"]["status"] == "timeout"
+    assert records["Missing"]["status"] == "error"
+
+    # Resuming skips everything already recorded; with retry_failed only the failures run again.
+    assert SweepRunner(agent_config, SweepConfig(str(output)))\
+        .run(names) == {"ok": 0, "error": 0, "timeout": 0, "skipped": 5}
+    counts = SweepRunner(agent_config, SweepConfig(str(output), candidate_timeout=None, retry_failed=True)).run(names)
+    assert counts == {"ok": 1, "error": 1, "timeout": 0, "skipped": 3}
+
+
+def test_timed_out_runs_stop_and_keep_their_slot_until_then(tmp_path, monkeypatch, fake_model):
+    lock = threading.Lock()
+    live, peak = [0], [0]
+
+    def answer(name, prompt):
+        with lock:
+            live[0] += 1
+            peak[0] = max(peak[0], live[0])
+        time.sleep(0.3)
+        with lock:
+            live[0] -= 1
+        return "print('still working')" if name == "Looping" else f"final_answer('- Engineer name: {name}')"
+
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    model = fake_model(code=answer)
+    agent_config = SingleBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), trace_path=None)
+    runner = SweepRunner(agent_config, SweepConfig(str(tmp_path / "sweep.jsonl"), workers=1, candidate_timeout=1.0))
+    assert runner.run(["Looping", "Ada", "Bob"]) == {"ok": 2, "error": 0, "timeout": 1, "skipped": 0}
+
+    # The looping run was interrupted after its step in progress, and the next candidate only started then.
+    calls = len(model.prompts)
+    time.sleep(0.7)
+    assert len(model.prompts) == calls and peak[0] == 1
+
+
+def test_abandoned_runs_are_not_recorded(monkeypatch, fake_model):
+    abandoned = threading.Event()
+
+    def answer(name, prompt):
+        abandoned.set()  # the caller gives up while the model is still answering
+        return (
+            "final_answer({'engineer_name': 'Ada', 'engineer_id': '1', 'severity': 'high', "
+            "'reasons': ['pages'], 'supporting_metrics': {}})"
+        )
+
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    fake_model(code=answer)
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False, structured_output=True,
+        score_store=ScoreStoreConfig(),
+    ))
+    assert agent.detect_burnout("Ada", abandoned=abandoned).severity.value == "high"
+    assert agent.score_store.range("1") == []
+    abandoned.clear()
+    agent.detect_burnout("Ada")
+    assert len(agent.score_store.range("1")) == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__])
@@ -0,0 +1,79 @@
+import json
+import threading
+
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.tools.rootly_tools.fake_rootly import SyntheticOrg, SyntheticOrgConfig
+from src.burnout_detector.tracing import Tracer, trace_span, use_tracer
+
+
+def test_tracer_nests_and_exports_spans(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path))
+    with use_tracer(tracer):
+        with trace_span("run", "run"):
+            with trace_span("GET", "http", endpoint="/v1/users") as span:
+                span.set(status=200, bytes=512)
+    with trace_span("untraced", "http") as span:
+        assert span is None
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["kind"] for line in lines] == ["http", "run"]
+    assert lines[0]["parent_id"] == lines[1]["span_id"]
+    summary = tracer.summary()
+    assert summary["http_statuses"] == {"200": 1}
+    assert summary["http_bytes"] == 512
+
+
+def test_concurrent_runs_report_to_their_own_tracer(tmp_path):
+    tracers = [Tracer(str(tmp_path / f"trace-{i}.jsonl")) for i in range(2)]
+    both_active = threading.Barrier(2)
+
+    def run(tracer: Tracer):
+        with use_tracer(tracer), trace_span("run", "run"):
+            both_active.wait()  # both tracers are active at the same time
+            with trace_span("GET", "http"):
+                pass
+            both_active.wait()
+
+    threads = [threading.Thread(target=run, args=(tracer,)) for tracer in tracers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [tracer.summary()["spans"]["http"]["count"] for tracer in tracers] == [1, 1]
+
+
+def test_single_agent_run_is_traced(tmp_path, monkeypatch, capsys, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    fake_model(code=lambda name, prompt: f"final_answer('- Engineer name: {name}')")
+    path = tmp_path / "trace.jsonl"
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(llm_config=LLMConfig("fake-model"), trace_path=str(path)))
+    assert agent.detect_burnout("Ada") == "- Engineer name: Ada"
+
+    kinds = [json.loads(line)["kind"] for line in path.read_text().splitlines()]
+    assert kinds.count("llm") == 1 and kinds.count("agent_step") == 1 and kinds[-1] == "run"
+    assert "LLM" in agent.trace_summary and "Trace " not in capsys.readouterr().out
+
+
+def test_tool_calls_from_the_agent_code_are_traced(tmp_path, monkeypatch, fake_model, fake_rootly_client):
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    fake_model(code=lambda name, prompt: f"users = users_tool(search='{name}')\nfinal_answer(str(len(users)))")
+    fake_rootly_client(SyntheticOrg(SyntheticOrgConfig(users=3, schedules=1, incidents=10, now="2025-06-01T00:00:00Z")))
+    path = tmp_path / "trace.jsonl"
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=str(path), show_spinner=False, prefetch=False,
+        precompute_metrics=False,
+    ))
+    agent.detect_burnout("Ada")
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    tool = next(span for span in spans if span["kind"] == "tool")
+    assert tool["name"] == "users_tool"
+    assert any(span["kind"] == "http" and span["parent_id"] == tool["span_id"] for span in spans)
+    assert agent.users_tool.run_context is None
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    test_tracer_nests_and_exports_spans(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,47 @@
+from src.burnout_detector.llm_utils import LLMConfig
+from src.burnout_detector.single_burnout_agent import SingleBurnoutAgent, SingleBurnoutAgentConfig
+from src.burnout_detector.verdict_cache import VerdictCache, VerdictCacheConfig, verdict_key
+
+
+def test_verdict_key_normalizes_tool_outputs():
+    incidents = [{"incident_id": "1", "status": "resolved"}, {"status": "started", "incident_id": "2"}]
+    key = verdict_key("gpt-4o-mini", 0.2, "prompt", [incidents])
+    assert key == verdict_key("gpt-4o-mini", 0.2, "prompt", [list(reversed(incidents))])
+    assert key != verdict_key("gpt-4o-mini", 0.3, "prompt", [incidents])
+    assert key != verdict_key("gpt-4o-mini", 0.2, "prompt", [incidents[:1]])
+
+
+def test_verdict_cache_eviction_and_invalidation(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    cache = VerdictCache(VerdictCacheConfig(path=path, max_bytes=25))
+    cache.put("a", "x" * 10, user_id="1")
+    cache.put("b", "y" * 10, user_id="2")
+    assert cache.get("a") == "x" * 10  # "a" is now more recently used than "b"
+    cache.put("c", "z" * 10, user_id="1")
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+    cache.close()
+
+    # Verdicts persist across processes, and data changes for a user drop only that user's verdicts.
+    cache = VerdictCache(VerdictCacheConfig(path=path))
+    cache.put("d", "w", user_id="3")
+    cache.on_data_changed("incidents", {"1"})
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.get("d") == "w"
+    cache.on_data_changed("schedules", set())
+    assert cache.get("d") is None
+
+
+def test_verdicts_without_rootly_data_are_not_cached(tmp_path, monkeypatch, fake_model):
+    monkeypatch.delenv("ROOTLY_API_KEY", raising=False)
+    model = fake_model(code=lambda name, prompt: f"final_answer('verdict {len(model.prompts)}')")
+    agent = SingleBurnoutAgent(SingleBurnoutAgentConfig(
+        llm_config=LLMConfig("fake-model"), trace_path=None, show_spinner=False,
+        verdict_cache=VerdictCacheConfig(path=str(tmp_path / "verdicts.sqlite")),
+    ))
+    assert [agent.detect_burnout("Ada") for _ in range(2)] == ["verdict 1", "verdict 2"]
+    assert agent.verdict_cache.stats.stores == 0
+
+
+if __name__ == "__main__":
+    test_verdict_key_normalizes_tool_outputs()
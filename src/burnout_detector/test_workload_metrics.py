@@ -0,0 +1,40 @@
+from src.burnout_detector.workload_metrics import compute_workload_metrics, format_workload_summary, parse_epoch
+
+
+def test_workload_metrics():
+    incidents = {
+        "42": [
+            # Saturday 02:00 UTC: off-hours and weekend.
+            {"started_at": "2025-06-07T02:00:00Z", "resolved_at": "2025-06-07T04:00:00Z", "severity_level": "critical"},
+            # Monday 10:00 UTC: working hours.
+            {"started_at": "2025-06-09T10:00:00Z", "resolved_at": "2025-06-09T11:00:00Z", "severity_level": "low"},
+            # Months earlier, unresolved, only a creation time.
+            {"created_at": "2025-01-15T10:00:00Z", "severity_name": "SEV1"},
+        ],
+    }
+    shifts = {
+        "42": [
+            {"starts_at": "2025-06-01T00:00:00Z", "ends_at": "2025-06-04T12:00:00Z"},
+            # Overlaps the previous shift by six hours, which count once.
+            {"starts_at": "2025-06-04T06:00:00Z", "ends_at": "2025-06-04T18:00:00Z"},
+            {"starts_at": "2025-06-05T00:00:00Z", "ends_at": "2025-06-05T12:00:00Z"},
+            {"starts_at": "2025-06-08T00:00:00Z", "ends_at": "2025-06-08T06:00:00Z"},
+        ],
+    }
+    metrics = compute_workload_metrics(incidents, shifts, now=parse_epoch("2025-06-10T00:00:00Z"))["42"]
+    print(format_workload_summary(metrics))
+
+    assert metrics.incident_count == 3
+    assert metrics.incidents_by_severity == {"critical": 1, "high": 1, "low": 1}
+    assert metrics.time_to_resolve_p50_hours == 1.0
+    assert metrics.time_to_resolve_max_hours == 2.0
+    assert metrics.off_hours_ratio == round(1 / 3, 3)
+    assert metrics.weekend_ratio == round(1 / 3, 3)
+    assert metrics.rolling_incident_counts == {7: 2, 30: 2, 90: 2}
+    assert metrics.on_call_hours == 84.0 + 6.0 + 12.0 + 6.0
+    assert metrics.max_consecutive_on_call_days == 5
+    assert metrics.max_consecutive_on_call_hours == 90.0
+
+
+if __name__ == "__main__":
+    test_workload_metrics()
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.pagination import DEFAULT_PAGE_SIZE, iter_records
+from src.burnout_detector.tools.rootly_tools.rate_limiter import on_admission
+from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory
+
+
+def _default_endpoint_limits() -> Dict[str, int]:
+    return {
+        "/v1/users": 8,
+        "/v1/schedules": 2,
+        "/v1/incidents": 8,
+    }
+
+
+@dataclass
+class AsyncCollectorConfig:
+    max_concurrency: int = 16  # maximum number of Rootly requests in flight; keep <= the client's pool_maxsize
+    endpoint_limits: Dict[str, int] = field(default_factory=_default_endpoint_limits)  # per-endpoint in-flight caps
+    candidate_timeout: float = 30.0  # seconds allowed for each request of a single engineer, once it is sent
+    sweep_timeout: Optional[float] = None  # seconds allowed for the whole sweep; None for no limit
+    page_size: int = DEFAULT_PAGE_SIZE  # page[size] used for paginated endpoints
+
+
+class AsyncRootlyCollector:
+    """
+    Collects users, schedules and incidents for many engineers concurrently.
+
+    Requests go through the (blocking) pooled Rootly client on a dedicated thread pool, while asyncio bounds how many
+    are in flight overall and per endpoint. The organisation-wide schedule list is fetched once per sweep and shared
+    between all engineers, and names are resolved to users in one pass through a `UserDirectory` instead of one
+    user search per engineer.
+    """
+
+    def __init__(
+            self,
+            config: Optional[AsyncCollectorConfig] = None,
+            client: Optional[RootlyClient] = None,
+            directory: Optional[UserDirectory] = None
+    ):
+        """
+        Args:
+            config: Optional collector configuration.
+            client: Optional Rootly client. Defaults to the shared client.
+            directory: Optional user directory, e.g. one kept across sweeps. Defaults to a new one on `client`.
+        """
+        self.config = config if config is not None else AsyncCollectorConfig()
+        self.client = client if client is not None else get_rootly_client()
+        self.directory = directory if directory is not None else UserDirectory(client=self.client)
+
+    async def collect(self, names: List[str], api_key: Optional[str] = None) -> List[dict]:
+        """
+        Collect the burnout candidate data of the given engineers.
+
+        Args:
+            names: Names (or search strings) of the engineers to collect data for.
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+
+        Returns:
+            list: One dictionary per name, in input order, with the "name", "on_call_schedule" and
+                "most_recent_incident" keys expected by `MultiBurnoutAgent`. Candidates whose collection failed or
+                timed out also carry an "error" key.
+        """
+        if not names:
+            return []
+
+        api_key = api_key if api_key is not None else os.getenv("ROOTLY_API_KEY")
+        executor = ThreadPoolExecutor(max_workers=self.config.max_concurrency, thread_name_prefix="rootly-collect")
+        global_limit = asyncio.Semaphore(self.config.max_concurrency)
+        endpoint_limits = {
+            endpoint: asyncio.Semaphore(limit) for endpoint, limit in self.config.endpoint_limits.items()
+        }
+
+        async def fetch(endpoint: str, fn: Callable, *args, timeout: Optional[float] = None):
+            async with endpoint_limits.get(endpoint, contextlib.nullcontext()), global_limit:
+                loop = asyncio.get_running_loop()
+                if timeout is None:
+                    return await loop.run_in_executor(executor, contextvars.copy_context().run, fn, *args)
+
+                # The timeout starts once the client's rate limiter sends the first request, so queueing behind
+                # other engineers' requests in a large sweep does not count against it; the sweep as a whole is
+                # bounded by `sweep_timeout`.
+                admitted = asyncio.Event()
+
+                def run():
+                    with on_admission(lambda: loop.call_soon_threadsafe(admitted.set)):
+                        return fn(*args)
+
+                result = loop.run_in_executor(executor, contextvars.copy_context().run, run)
+                admission = asyncio.ensure_future(admitted.wait())
+                try:
+                    await asyncio.wait({result, admission}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    admission.cancel()
+                return await asyncio.wait_for(result, timeout=timeout)
+
+        schedules_task = asyncio.ensure_future(fetch("/v1/schedules", self._fetch_schedules, api_key))
+        users_task = asyncio.ensure_future(fetch("/v1/users", self.directory.resolve_many, names, api_key))
+        tasks = [
+            asyncio.ensure_future(self._collect_candidate(name, fetch, schedules_task, users_task, api_key))
+            for name in names
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.config.sweep_timeout)
+            for task in pending:
+                task.cancel()
+
+            candidates = []
+            for name, task in zip(names, tasks):
+                if task in done and task.exception() is None:
+                    candidates.append(task.result())
+                else:
+                    error = "sweep timed out" if task in pending else str(task.exception())
+                    candidates.append(self._empty_candidate(name, error))
+            return candidates
+        finally:
+            schedules_task.cancel()
+            users_task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def collect_sync(self, names: List[str], api_key: Optional[str] = None) -> List[dict]:
+        """
+        Blocking wrapper around `collect`, for callers without a running event loop.
+        """
+        return asyncio.run(self.collect(names, api_key=api_key))
+
+    async def _collect_candidate(self, name: str, fetch: Callable, schedules_task: asyncio.Future,
+                                 users_task: asyncio.Future, api_key: Optional[str]) -> dict:
+        try:
+            return await self._collect_candidate_data(name, fetch, schedules_task, users_task, api_key)
+        except asyncio.TimeoutError:
+            return self._empty_candidate(name, f"timed out after {self.config.candidate_timeout}s")
+        except Exception as e:
+            return self._empty_candidate(name, f"{type(e).__name__}: {e}")
+
+    async def _collect_candidate_data(self, name: str, fetch: Callable, schedules_task: asyncio.Future,
+                                      users_task: asyncio.Future, api_key: Optional[str]) -> dict:
+        user = (await asyncio.shield(users_task)).get(name)
+        if user is None:
+            return self._empty_candidate(name, "no matching Rootly user")
+
+        incident, schedules = await asyncio.gather(
+            fetch("/v1/incidents", self._fetch_most_recent_incident, user["id"], api_key,
+                  timeout=self.config.candidate_timeout),
+            asyncio.shield(schedules_task),
+        )
+        return {
+            "name": user.get("full_name") or user.get("name") or name,
+            "user_id": user["id"],
+            "email": user.get("email"),
+            "time_zone": user.get("time_zone"),
+            "on_call_schedule": [
+                schedule for schedule in schedules if str(schedule.get("owner_user_id")) == str(user["id"])
+            ],
+            "most_recent_incident": incident,
+        }
+
+    def _fetch_schedules(self, api_key: Optional[str]) -> List[dict]:
+        return [
+            processed
+            for schedule_data_item in iter_records(
+                self.client, "/v1/schedules", page_size=self.config.page_size, api_key=api_key
+            )
+            if (processed := ShiftsTool.process_schedule(schedule_data_item)) is not None
+        ]
+
+    def _fetch_most_recent_incident(self, user_id: str, api_key: Optional[str]) -> Optional[dict]:
+        params = IncidentsTool.build_params(user_id=user_id)
+        params["sort"] = "-created_at"
+        for incident_data in iter_records(
+                self.client, "/v1/incidents", params, page_size=1, max_records=1, api_key=api_key
+        ):
+            return IncidentsTool.process_incident(incident_data)
+        return None
+
+    @staticmethod
+    def _empty_candidate(name: str, error: str) -> dict:
+        return {
+            "name": name,
+            "on_call_schedule": [],
+            "most_recent_incident": None,
+            "error": error,
+        }
@@ -0,0 +1,403 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse
+
+import requests
+
+
+_BASE_URL_PLACEHOLDER = "__ROOTLY_BASE_URL__"  # stands in for the API host inside recorded fixtures
+_FIRST_NAMES = ("Ada", "Grace", "Alan", "Edsger", "Barbara", "Ken", "Margaret", "Linus", "Radia", "Donald")
+_LAST_NAMES = ("Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Thompson", "Hamilton", "Torvalds", "Perlman")
+_TIME_ZONES = ("UTC", "America/New_York", "America/Los_Angeles", "Europe/London", "Asia/Kolkata")
+_SEVERITIES = (("SEV0", "critical"), ("SEV1", "high"), ("SEV2", "medium"), ("SEV3", "low"))
+_ENVIRONMENTS = ("production", "staging")
+_SERVICES = ("api", "database", "payments", "search", "auth", "web")
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse(timestamp: Optional[str]) -> Optional[datetime]:
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class SyntheticOrgConfig:
+    users: int = 50  # number of users
+    schedules: int = 5  # number of on-call schedules, each rotating through a slice of the users
+    teams: int = 5  # number of teams, each with a slice of the users
+    incidents: int = 500  # number of incidents, spread over the history window
+    history_days: int = 90  # how far back incidents and shifts go
+    shift_hours: int = 24  # length of each on-call shift
+    unresolved_ratio: float = 0.1  # share of incidents that are still open
+    seed: int = 0  # seed of the generator, so the same config always yields the same org
+    now: Optional[str] = None  # ISO 8601 end of the history window; defaults to the current hour
+
+
+class SyntheticOrg:
+    """
+    A generated Rootly organisation, held as raw JSON:API records per resource.
+    """
+
+    def __init__(self, config: Optional[SyntheticOrgConfig] = None):
+        self.config = config if config is not None else SyntheticOrgConfig()
+        self.records: Dict[str, List[dict]] = self._generate()
+
+    def _generate(self) -> Dict[str, List[dict]]:
+        config = self.config
+        rng = random.Random(config.seed)
+        now = _parse(config.now) or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        start = now - timedelta(days=config.history_days)
+
+        users = []
+        for i in range(1, config.users + 1):
+            first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+            created = _iso(start - timedelta(days=rng.randint(1, 365)))
+            users.append({"id": str(i), "type": "users", "attributes": {
+                "name": f"{first} {last} {i}", "full_name": f"{first} {last} {i}", "first_name": first,
+                "last_name": f"{last} {i}", "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "slack_id": f"U{i:06d}", "time_zone": rng.choice(_TIME_ZONES), "created_at": created,
+                "updated_at": created,
+            }})
+
+        def members(index: int, groups: int) -> List[int]:
+            return [i for i in range(1, config.users + 1) if i % max(groups, 1) == index % max(groups, 1)]
+
+        teams = [
+            {"id": str(t), "type": "teams", "attributes": {
+                "name": f"Team {t}", "user_ids": members(t, config.teams), "created_at": _iso(start),
+                "updated_at": _iso(start),
+            }}
+            for t in range(1, config.teams + 1)
+        ]
+
+        schedules, shifts = [], []
+        for s in range(1, config.schedules + 1):
+            rotation = members(s, config.schedules) or [1]
+            schedules.append({"id": f"sched-{s}", "type": "schedules", "attributes": {
+                "name": f"Schedule {s}", "description": f"Primary on-call for team {s}", "all_time_coverage": True,
+                "slack_user_group": None, "owner_group_ids": [str(s)], "owner_user_id": rotation[0],
+                "created_at": _iso(start), "updated_at": _iso(start),
+            }})
+            shift_start, k = start, 0
+            while shift_start < now:
+                shift_end = shift_start + timedelta(hours=config.shift_hours)
+                shifts.append({"id": f"shift-{s}-{k}", "type": "shifts", "attributes": {
+                    "schedule_id": f"sched-{s}", "rotation_id": f"rot-{s}", "user_id": rotation[k % len(rotation)],
+                    "starts_at": _iso(shift_start), "ends_at": _iso(shift_end), "is_override": False,
+                }})
+                shift_start, k = shift_end, k + 1
+
+        incidents = []
+        window_seconds = int((now - start).total_seconds())
+        for i in range(1, config.incidents + 1):
+            created = start + timedelta(seconds=rng.randrange(window_seconds))
+            resolved = None
+            if rng.random() >= config.unresolved_ratio:
+                resolved = min(created + timedelta(minutes=rng.randint(5, 48 * 60)), now)
+            severity_name, severity_level = rng.choice(_SEVERITIES)
+            owner, resolver = rng.randint(1, config.users), rng.randint(1, config.users)
+            incidents.append({"id": str(i), "type": "incidents", "attributes": {
+                "title": f"{rng.choice(_SERVICES).title()} degradation #{i}",
+                "status": "resolved" if resolved is not None else rng.choice(("started", "mitigated")),
+                "kind": "normal",
+                "summary": None,
+                "severity": {"data": {"id": severity_name, "attributes": {
+                    "name": severity_name, "severity": severity_level,
+                }}},
+                "environments": [{"data": {"attributes": {"name": rng.choice(_ENVIRONMENTS)}}}],
+                "services": [{"data": {"attributes": {"name": name}}} for name in rng.sample(_SERVICES, 2)],
+                "user": {"data": {"id": str(owner)}},
+                "started_by": {"data": {"id": str(owner)}},
+                "mitigated_by": {"data": {"id": str(resolver)}} if resolved is not None else None,
+                "resolved_by": {"data": {"id": str(resolver)}} if resolved is not None else None,
+                "created_at": _iso(created),
+                "started_at": _iso(created),
+                "resolved_at": _iso(resolved) if resolved is not None else None,
+                "updated_at": _iso(resolved or created),
+            }})
+
+        return {"users": users, "teams": teams, "schedules": schedules, "shifts": shifts, "incidents": incidents}
+
+    def query(self, resource: str, query: Dict[str, List[str]]) -> List[dict]:
+        """
+        The records of a resource matching the supported JSON:API filters, in the order the API would return them.
+        """
+        def first(name: str) -> Optional[str]:
+            return (query.get(name) or [None])[0]
+
+        def in_range(timestamp: Optional[str], gte: Optional[str], lte: Optional[str]) -> bool:
+            moment = _parse(timestamp)
+            if (gte or lte) and moment is None:
+                return False
+            return (not gte or moment >= _parse(gte)) and (not lte or moment <= _parse(lte))
+
+        records = self.records.get(resource, [])
+        if resource == "users":
+            search, email = (first("filter[search]") or "").lower(), first("filter[email]")
+            records = [
+                r for r in records
+                if (not search or any(search in (r["attributes"].get(k) or "").lower() for k in ("name", "email")))
+                and (not email or r["attributes"]["email"] == email)
+                and in_range(r["attributes"]["updated_at"], first("filter[updated_at][gte]"), None)
+            ]
+        elif resource == "schedules":
+            name = first("filter[name]")
+            records = [
+                r for r in records
+                if (not name or r["attributes"]["name"] == name)
+                and in_range(r["attributes"]["created_at"], first("filter[created_at][gte]"),
+                             first("filter[created_at][lte]"))
+            ]
+        elif resource == "shifts":
+            window_start, window_end = _parse(first("from")), _parse(first("to"))
+            user_ids, schedule_ids = set(query.get("user_ids[]", [])), set(query.get("schedule_ids[]", []))
+            records = [
+                r for r in records
+                if (window_end is None or _parse(r["attributes"]["starts_at"]) < window_end)
+                and (window_start is None or _parse(r["attributes"]["ends_at"]) > window_start)
+                and (not user_ids or str(r["attributes"]["user_id"]) in user_ids)
+                and (not schedule_ids or r["attributes"]["schedule_id"] in schedule_ids)
+            ]
+        elif resource == "incidents":
+            user_id = first("filter[user_id]")
+            records = [
+                r for r in records
+                if (not user_id or user_id in {
+                    ((r["attributes"].get(role) or {}).get("data") or {}).get("id")
+                    for role in ("user", "started_by", "mitigated_by", "resolved_by")
+                })
+                and in_range(r["attributes"]["created_at"], first("filter[created_at][gte]"),
+                             first("filter[created_at][lte]"))
+                and in_range(r["attributes"]["updated_at"], first("filter[updated_at][gte]"), None)
+            ]
+        if (sort := first("sort")) is not None:
+            key = sort.lstrip("-")
+            records = sorted(records, key=lambda r: r["attributes"].get(key) or "", reverse=sort.startswith("-"))
+        return records
+
+    def get(self, resource: str, record_id: str) -> Optional[dict]:
+        return next((r for r in self.records.get(resource, []) if r["id"] == record_id), None)
+
+
+@dataclass
+class FaultConfig:
+    latency_seconds: float = 0.0  # fixed delay added to every response
+    latency_jitter_seconds: float = 0.0  # extra uniformly random delay, up to this many seconds
+    rate_limit_ratio: float = 0.0  # share of requests answered with HTTP 429
+    server_error_ratio: float = 0.0  # share of requests answered with HTTP 503
+    retry_after_seconds: Optional[float] = 0.0  # Retry-After sent with injected 429s; None to omit the header
+    seed: int = 0  # seed of the fault injection, so runs are reproducible
+
+
+@dataclass
+class FakeRootlyStats:
+    requests: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    paths: List[str] = field(default_factory=list)
+
+
+class _FakeRootlyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fake: FakeRootlyServer = self.server.fake_rootly
+        status, headers, body = fake.handle(self.path, dict(self.headers))
+        if "gzip" in self.headers.get("Accept-Encoding", "") and body:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeRootlyServer:
+    """
+    In-process stand-in for the Rootly API, for offline tests, load tests and benchmarks.
+
+    It serves /v1/users, /v1/teams, /v1/schedules, /v1/shifts and /v1/incidents (plus single-record lookups) with
+    JSON:API pagination (`page[size]`, `page[number]`, `links.next`) and the filters the tools use. It runs in one of
+    three modes:
+
+    - synthetic (default): answers from a generated `SyntheticOrg`;
+    - record (`upstream` and `fixtures_dir`): proxies every request to the real API and saves the responses;
+    - replay (`fixtures_dir` only): answers from previously recorded responses, 404 for anything not recorded.
+
+    Latency, 429s and 5xx can be injected in every mode. Point the tools at it with
+    `RootlyClientConfig(base_url=server.base_url)` or the ROOTLY_API_BASE_URL environment variable.
+    """
+
+    def __init__(
+            self,
+            org: Optional[SyntheticOrg] = None,
+            faults: Optional[FaultConfig] = None,
+            fixtures_dir: Optional[str] = None,
+            upstream: Optional[str] = None,
+            default_page_size: int = 20,
+            host: str = "127.0.0.1",
+            port: int = 0,
+    ):
+        """
+        Args:
+            org: The synthetic org to serve. Defaults to a `SyntheticOrg` with the default config.
+            faults: Optional latency and error injection.
+            fixtures_dir: Directory recorded responses are written to (record mode) or read from (replay mode).
+            upstream: Base URL of the real API to record from, e.g. "https://api.rootly.com".
+            default_page_size: Page size used when a request does not set `page[size]`.
+            host: Interface to listen on.
+            port: Port to listen on; 0 picks a free port.
+        """
+        self.faults = faults if faults is not None else FaultConfig()
+        self.fixtures_dir = fixtures_dir
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.org = org if org is not None or fixtures_dir else SyntheticOrg()
+        self.default_page_size = default_page_size
+        self.stats = FakeRootlyStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.faults.seed)
+        self._server = ThreadingHTTPServer((host, port), _FakeRootlyHandler)
+        self._server.daemon_threads = True
+        self._server.fake_rootly = self
+        self._thread: Optional[threading.Thread] = None
+        if fixtures_dir:
+            os.makedirs(fixtures_dir, exist_ok=True)
+
+    @property
+    def mode(self) -> str:
+        if self.fixtures_dir and self.upstream:
+            return "record"
+        return "replay" if self.fixtures_dir else "synthetic"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeRootlyServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="fake-rootly")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeRootlyServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def fixture_name(path: str) -> str:
+        """
+        File name of the recorded response for a request path (with its query string), independent of parameter order.
+        """
+        url = urlparse(path)
+        canonical = url.path + "?" + urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32] + ".json"
+
+    def _inject_fault(self) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        with self._lock:
+            delay = self.faults.latency_seconds + self._rng.uniform(0, self.faults.latency_jitter_seconds)
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.faults.rate_limit_ratio:
+            with self._lock:
+                self.stats.rate_limited += 1
+            headers = {"Content-Type": "application/json"}
+            if self.faults.retry_after_seconds is not None:
+                headers["Retry-After"] = str(self.faults.retry_after_seconds)
+            return 429, headers, json.dumps({"errors": [{"title": "Rate limit exceeded"}]}).encode()
+        if roll < self.faults.rate_limit_ratio + self.faults.server_error_ratio:
+            with self._lock:
+                self.stats.server_errors += 1
+            return 503, {"Content-Type": "application/json"}, json.dumps({"errors": [{"title": "Unavailable"}]}).encode()
+        return None
+
+    def handle(self, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one GET request: (status, headers, body).
+        """
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.paths.append(path)
+        if (fault := self._inject_fault()) is not None:
+            return fault
+        if self.mode == "record":
+            return self._record(path, headers)
+        if self.mode == "replay":
+            return self._replay(path)
+        return self._synthetic(path)
+
+    def _json(self, status: int, payload: dict) -> Tuple[int, Dict[str, str], bytes]:
+        return status, {"Content-Type": "application/vnd.api+json"}, json.dumps(payload).encode()
+
+    def _synthetic(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlparse(path)
+        parts = [part for part in url.path.split("/") if part]
+        if len(parts) < 2 or parts[0] != "v1" or parts[1] not in self.org.records:
+            return self._json(404, {"errors": [{"title": "Not found"}]})
+        resource = parts[1]
+        if len(parts) == 3:
+            record = self.org.get(resource, parts[2])
+            return self._json(200, {"data": record}) if record else self._json(404, {"errors": [{"title": "Not found"}]})
+
+        query = parse_qs(url.query, keep_blank_values=True)
+        records = self.org.query(resource, query)
+        size = int((query.get("page[size]") or [self.default_page_size])[0])
+        number = int((query.get("page[number]") or [1])[0])
+        page = records[(number - 1) * size:number * size]
+        next_url = None
+        if number * size < len(records):
+            next_query = {**query, "page[number]": [str(number + 1)], "page[size]": [str(size)]}
+            next_url = f"{self.base_url}{url.path}?{urlencode(next_query, doseq=True)}"
+        return self._json(200, {
+            "data": page,
+            "links": {"self": f"{self.base_url}{path}", "next": next_url},
+            "meta": {"current_page": number, "total_count": len(records),
+                     "total_pages": (len(records) + size - 1) // size if size else 1},
+        })
+
+    def _record(self, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        forwarded = {name: value for name, value in headers.items() if name.lower() in ("authorization", "accept")}
+        response = requests.get(self.upstream + path, headers=forwarded, timeout=(5, 60))
+        body = response.text.replace(self.upstream, _BASE_URL_PLACEHOLDER)
+        if response.ok:  # credentials are never written: only the path and the response body are stored
+            with open(os.path.join(self.fixtures_dir, self.fixture_name(path)), "w") as file:
+                json.dump({"path": path, "status": response.status_code, "body": body}, file)
+        return response.status_code, {"Content-Type": response.headers.get("Content-Type", "application/json")}, \
+            body.replace(_BASE_URL_PLACEHOLDER, self.base_url).encode()
+
+    def _replay(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        fixture_path = os.path.join(self.fixtures_dir, self.fixture_name(path))
+        if not os.path.exists(fixture_path):
+            return self._json(404, {"errors": [{"title": f"No recorded response for {path}"}]})
+        with open(fixture_path) as file:
+            fixture = json.load(file)
+        return fixture["status"], {"Content-Type": "application/vnd.api+json"}, \
+            fixture["body"].replace(_BASE_URL_PLACEHOLDER, self.base_url).encode()
@@ -1,7 +1,14 @@
 import os
 import requests
+from typing import Iterator, List, Optional
 from smolagents import Tool
 
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.pagination import DEFAULT_PAGE_SIZE, iter_records
+from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+from src.burnout_detector.incident_batch import IncidentBatch
+from src.burnout_detector.tracing import traced_tool_forward
+
 # The requests library must be installed in the environment where this tool is run.
 
 class IncidentsTool(Tool):
@@ -30,11 +37,186 @@ class IncidentsTool(Tool):
             "description": "Optional: Filter incidents created on or before this ISO 8601 datetime string (e.g., '2025-05-23T23:59:59Z'). Inclusive.",
             "required": False,
             "nullable": True
+        },
+        "max_records": {
+            "type": "integer",
+            "description": "Optional: Maximum number of incidents to return. If not set, all matching incidents are returned across every page.",
+            "required": False,
+            "nullable": True
         }
     }
     output_type: str = "object" 
 
-    def forward(self, user_id: int = None, created_at_gte: str = None, created_at_lte: str = None):
+    def __init__(
+            self,
+            client: Optional[RootlyClient] = None,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            snapshot_store: Optional[SnapshotStore] = None
+    ):
+        """
+        Args:
+            client: Optional Rootly client. Defaults to the shared client.
+            page_size: Number of incidents requested per page.
+            snapshot_store: Optional local snapshot store. When given, incidents are synced incrementally into it and
+                queries are answered from it.
+        """
+        super().__init__()
+        self.client = client if client is not None else get_rootly_client()
+        self.page_size = page_size
+        self.snapshot_store = snapshot_store
+        # Set by the agent for the duration of a run (see context_budget.py) to compact what the model sees.
+        self.context_budget = None
+        # Set by the agent for the duration of a run (see prefetch.py) to serve data fetched before its first step.
+        self.prefetch = None
+        # Set by the agent for the duration of a run (see tracing.py) to trace calls made from the agent's code.
+        self.run_context = None
+
+    @staticmethod
+    def build_params(user_id: int = None, created_at_gte: str = None, created_at_lte: str = None) -> dict:
+        """
+        Build the JSON:API filter parameters for the /v1/incidents endpoint.
+        """
+        params = {}
+        if user_id is not None:
+            params["filter[user_id]"] = user_id
+        if created_at_gte:
+            params["filter[created_at][gte]"] = created_at_gte
+        if created_at_lte:
+            params["filter[created_at][lte]"] = created_at_lte
+        return params
+
+    @staticmethod
+    def process_incident(incident_data: dict) -> Optional[dict]:
+        """
+        Flatten a single JSON:API incident record into the dictionary returned by this tool.
+
+        Returns:
+            dict: The processed incident, or None if the record is missing its attributes or is malformed.
+        """
+        try:
+            attributes = incident_data.get("attributes", {})
+            if not attributes:
+                print(f"Warning: Incident data {incident_data.get('id')} missing attributes.")
+                return None
+
+            severity_data = attributes.get("severity", {}).get("data", {})
+            severity_attributes = severity_data.get("attributes", {}) if severity_data else {}
+
+            environments = [
+                env.get("attributes", {}).get("name") 
+                for env_item in attributes.get("environments", []) 
+                if (env := env_item.get("data")) and env.get("attributes")
+            ]
+            services = [
+                srv.get("attributes", {}).get("name") 
+                for srv_item in attributes.get("services", []) 
+                if (srv := srv_item.get("data")) and srv.get("attributes")
+            ]
+
+            return {
+                "incident_id": incident_data.get("id"),
+                "title": attributes.get("title"),
+                "status": attributes.get("status"),
+                "kind": attributes.get("kind"),
+                "severity_name": severity_attributes.get("name"),
+                "severity_level": severity_attributes.get("severity"),
+                "summary": attributes.get("summary"),
+                "created_at": attributes.get("created_at"),
+                "updated_at": attributes.get("updated_at"),
+                "started_at": attributes.get("started_at"), 
+                "resolved_at": attributes.get("resolved_at"),
+                "environments": environments,
+                "services": services
+            }
+        except Exception as e:
+            print(f"Error processing individual incident data: {incident_data.get('id')}, Error: {str(e)}")
+            return None
+
+    @staticmethod
+    def related_user_ids(incident_data: dict) -> List[str]:
+        """
+        The IDs of the users a raw JSON:API incident record names as its creator, starter, mitigator or resolver.
+        """
+        attributes = incident_data.get("attributes") or {}
+        user_ids = []
+        for role in ("user", "started_by", "mitigated_by", "resolved_by"):
+            role_data = (attributes.get(role) or {}).get("data") or {}
+            if role_data.get("id") is not None:
+                user_ids.append(str(role_data["id"]))
+        return user_ids
+
+    def iter_incidents(
+            self,
+            user_id: int = None,
+            created_at_gte: str = None,
+            created_at_lte: str = None,
+            max_records: int = None,
+            api_key: str = None
+    ) -> Iterator[dict]:
+        """
+        Stream processed incidents page by page, without holding the full raw response in memory.
+
+        Args:
+            user_id: Optional user ID to filter incidents by.
+            created_at_gte: Optional ISO 8601 string for the start of the creation date range.
+            created_at_lte: Optional ISO 8601 string for the end of the creation date range.
+            max_records: Optional cap on the number of raw incident records to fetch.
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+
+        Yields:
+            dict: Processed incident details, in the order returned by the API.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching a page fails.
+            ValueError: If a page is not valid JSON.
+        """
+        if self.snapshot_store is not None:
+            self.snapshot_store.sync(
+                "incidents", self.client, "/v1/incidents", self.process_incident,
+                params=self.build_params(user_id),
+                scope=f"user:{user_id}" if user_id is not None else "",
+                user_id=user_id,
+                related_user_ids=self.related_user_ids,
+                id_field="incident_id",
+                page_size=self.page_size,
+                api_key=api_key,
+            )
+            yield from self.snapshot_store.query(
+                "incidents", user_id=user_id, created_at_gte=created_at_gte, created_at_lte=created_at_lte,
+                max_records=max_records,
+            )
+            return
+
+        params = self.build_params(user_id, created_at_gte, created_at_lte)
+        for incident_data in iter_records(
+                self.client, "/v1/incidents", params,
+                page_size=self.page_size, max_records=max_records, api_key=api_key
+        ):
+            if (processed := self.process_incident(incident_data)) is not None:
+                yield processed
+
+    def fetch_batch(
+            self,
+            user_id: int = None,
+            created_at_gte: str = None,
+            created_at_lte: str = None,
+            max_records: int = None,
+            api_key: str = None
+    ) -> IncidentBatch:
+        """
+        Fetch incidents into a compact columnar `IncidentBatch`, streaming each page into the batch so the
+        list of processed dictionaries is never materialised. Takes the same arguments as `iter_incidents`.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching a page fails.
+            ValueError: If a page is not valid JSON.
+        """
+        return IncidentBatch.from_incidents(self.iter_incidents(
+            user_id, created_at_gte, created_at_lte, max_records=max_records, api_key=api_key
+        ))
+
+    @traced_tool_forward
+    def forward(self, user_id: int = None, created_at_gte: str = None, created_at_lte: str = None, max_records: int = None):
         """
         Retrieves incidents from the Rootly API based on specified filters and pagination.
 
@@ -42,6 +224,7 @@ class IncidentsTool(Tool):
             user_id: Optional user ID to filter incidents by.
             created_at_gte: Optional ISO 8601 string for the start of the creation date range.
             created_at_lte: Optional ISO 8601 string for the end of the creation date range.
+            max_records: Optional maximum number of incidents to return. All matching pages are fetched if not set.
 
         Returns:
             A list of dictionaries, each containing processed incident details,
@@ -51,68 +234,22 @@ class IncidentsTool(Tool):
         if not api_key:
             return "Error: ROOTLY_API_KEY environment variable is not set."
 
-        base_url = "https://api.rootly.com/v1/incidents"
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        
-        params = {}
-        if user_id is not None:
-            params["filter[user_id]"] = user_id
-        if created_at_gte:
-            params["filter[created_at][gte]"] = created_at_gte
-        if created_at_lte:
-            params["filter[created_at][lte]"] = created_at_lte
-
         try:
-            response = requests.get(base_url, headers=headers, params=params)
-            response.raise_for_status() 
-            raw_data = response.json()
+            processed_incidents = self.prefetch.lookup(
+                self.name, user_id=user_id, created_at_gte=created_at_gte, created_at_lte=created_at_lte,
+                max_records=max_records,
+            ) if self.prefetch is not None else None
+            if processed_incidents is None:
+                processed_incidents = list(self.iter_incidents(
+                    user_id, created_at_gte, created_at_lte, max_records=max_records, api_key=api_key
+                ))
         except requests.exceptions.RequestException as e:
             return f"Error calling Rootly Incidents API: {str(e)}"
         except ValueError as e:  
             return f"Error decoding Rootly Incidents API response: {str(e)}"
         except Exception as e:
             return f"An unexpected error occurred during API call for incidents: {str(e)}"
-
-        processed_incidents = []
-        if raw_data and "data" in raw_data:
-            for incident_data in raw_data["data"]:
-                try:
-                    attributes = incident_data.get("attributes", {})
-                    if not attributes:
-                        print(f"Warning: Incident data {incident_data.get('id')} missing attributes.")
-                        continue
-
-                    severity_data = attributes.get("severity", {}).get("data", {})
-                    severity_attributes = severity_data.get("attributes", {}) if severity_data else {}
-
-                    environments = [
-                        env.get("attributes", {}).get("name") 
-                        for env_item in attributes.get("environments", []) 
-                        if (env := env_item.get("data")) and env.get("attributes")
-                    ]
-                    services = [
-                        srv.get("attributes", {}).get("name") 
-                        for srv_item in attributes.get("services", []) 
-                        if (srv := srv_item.get("data")) and srv.get("attributes")
-                    ]
-
-                    processed_incidents.append({
-                        "incident_id": incident_data.get("id"),
-                        "title": attributes.get("title"),
-                        "status": attributes.get("status"),
-                        "kind": attributes.get("kind"),
-                        "severity_name": severity_attributes.get("name"),
-                        "severity_level": severity_attributes.get("severity"),
-                        "summary": attributes.get("summary"),
-                        "created_at": attributes.get("created_at"),
-                        "updated_at": attributes.get("updated_at"),
-                        "started_at": attributes.get("started_at"), 
-                        "resolved_at": attributes.get("resolved_at"),
-                        "environments": environments,
-                        "services": services
-                    })
-                except Exception as e:
-                    print(f"Error processing individual incident data: {incident_data.get('id')}, Error: {str(e)}")
-                    continue
         
+        if self.context_budget is not None:
+            return self.context_budget.wrap(self.name, processed_incidents)
         return processed_incidents
@@ -0,0 +1,93 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient
+
+
+DEFAULT_PAGE_SIZE = 100  # records requested per page (maps to page[size])
+
+
+def iter_pages(
+        client: RootlyClient,
+        path: str,
+        params: Optional[dict] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_records: Optional[int] = None,
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+) -> Iterator[List[dict]]:
+    """
+    Stream the pages of a paginated Rootly JSON:API endpoint, following `links.next` until it runs out.
+
+    The next page is requested in the background as soon as the current one arrives, so fetching page N+1 overlaps
+    with the caller processing page N. Only the current and the next page are held in memory, and single-page
+    results are fetched on the calling thread without starting a background worker.
+
+    Args:
+        client: The Rootly client to send the requests with.
+        path: The API path of the collection, e.g. "/v1/incidents".
+        params: Optional query parameters (filters) for the first page. Later pages use the `links.next` URL.
+        page_size: Number of records to request per page (maps to page[size]).
+        max_records: Optional cap on the total number of records yielded across all pages.
+        api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+        use_cache: Whether pages may be served from the client's response cache. Disable for pulls that must see the
+            latest data.
+
+    Yields:
+        list: The `data` array of each page, truncated so that no more than `max_records` records are yielded.
+
+    Raises:
+        requests.exceptions.RequestException: If fetching a page fails.
+        ValueError: If a page is not valid JSON.
+    """
+    if max_records is not None and max_records <= 0:
+        return
+
+    first_params = dict(params or {})
+    first_params["page[size]"] = page_size if max_records is None else min(page_size, max_records)
+    first_params.setdefault("page[number]", 1)
+
+    remaining = max_records
+    executor = None
+    try:
+        raw_data = client.get_json(path, first_params, api_key, use_cache)
+        while raw_data is not None:
+            records = raw_data.get("data") or []
+            next_url = (raw_data.get("links") or {}).get("next")
+
+            if remaining is not None:
+                records = records[:remaining]
+                remaining -= len(records)
+            pending = None
+            if next_url and records and (remaining is None or remaining > 0):
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rootly-pages")
+                # Run in a copy of the caller's context so the prefetch is traced under the caller's span.
+                pending = executor.submit(
+                    contextvars.copy_context().run, client.get_json, next_url, None, api_key, use_cache
+                )
+
+            if records:
+                yield records
+            raw_data = pending.result() if pending is not None else None
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_records(
+        client: RootlyClient,
+        path: str,
+        params: Optional[dict] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_records: Optional[int] = None,
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+) -> Iterator[dict]:
+    """
+    Stream the individual records of a paginated Rootly JSON:API endpoint. See `iter_pages` for the arguments.
+    """
+    for page in iter_pages(client, path, params, page_size=page_size, max_records=max_records, api_key=api_key,
+                           use_cache=use_cache):
+        yield from page
@@ -0,0 +1,236 @@
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional
+
+import requests
+
+
+@dataclass
+class RateLimiterConfig:
+    requests_per_second: float = 10.0  # initial refill rate of the token bucket
+    max_requests_per_second: float = 50.0  # ceiling the rate may grow to while the API keeps accepting requests
+    min_requests_per_second: float = 0.5  # floor the rate may shrink to after repeated 429s
+    burst: int = 10  # bucket capacity, i.e. how many requests may go out back-to-back
+    additive_increase: float = 0.5  # requests/second added to the rate after each successful response
+    multiplicative_decrease: float = 0.5  # factor the rate is multiplied by after a 429
+    max_retries: int = 5  # retries for 429s, 5xx responses and connection errors before giving up
+    backoff_base: float = 0.5  # seconds; base of the jittered exponential backoff
+    backoff_max: float = 30.0  # seconds; cap for a single backoff or Retry-After wait
+    request_budget: Optional[int] = None  # maximum requests (including retries) per run (see `run`); None for no limit
+
+
+@dataclass
+class RateLimiterStats:
+    requests: int = 0  # requests admitted by the limiter, including retries
+    retries: int = 0  # requests that were retries of a failed attempt
+    rate_limited_responses: int = 0  # 429 responses received
+    server_errors: int = 0  # 5xx responses received
+    connection_errors: int = 0  # connection resets and timeouts
+    throttled_seconds: float = 0.0  # total time callers spent waiting on the limiter or backing off
+    current_rate: float = 0.0  # current refill rate of the token bucket, in requests/second
+
+
+class RequestBudgetExceeded(requests.exceptions.RequestException):
+    """
+    Raised when a run has used up its Rootly request budget.
+    """
+
+
+_admission_callback: contextvars.ContextVar[Optional[Callable[[], None]]] = contextvars.ContextVar(
+    "rootly_admission_callback", default=None
+)
+
+
+@contextmanager
+def on_admission(callback: Callable[[], None]) -> Iterator[None]:
+    """
+    Call `callback`, on the requesting thread, each time a limiter admits a request made within the block, e.g. to
+    start a timeout only once a request is actually sent rather than while it waits for the bucket.
+    """
+    token = _admission_callback.set(callback)
+    try:
+        yield
+    finally:
+        _admission_callback.reset(token)
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket shared by every Rootly request, adapting its rate to the API's feedback.
+
+    The rate grows additively while requests succeed and shrinks multiplicatively on 429s. `Retry-After` and the
+    `RateLimit-*`/`X-RateLimit-*` response headers pause or re-pace the whole bucket, so concurrent callers wait
+    together instead of each retrying on their own and turning one 429 into a retry storm.
+    """
+
+    def __init__(self, config: Optional[RateLimiterConfig] = None):
+        self.config = config if config is not None else RateLimiterConfig()
+        self._condition = threading.Condition()
+        self._rate = self.config.requests_per_second
+        self._tokens = float(self.config.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._stats = RateLimiterStats(current_rate=self._rate)
+        self._request_budget = self.config.request_budget  # budget of the run in progress
+        self._active_runs = 0
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        """
+        A snapshot of the throttling and retry metrics of this limiter.
+        """
+        with self._condition:
+            return replace(self._stats, current_rate=self._rate)
+
+    @contextmanager
+    def run(self, request_budget: Optional[int] = None) -> Iterator[None]:
+        """
+        Scope a run (a sweep, a stream, a collection, one agent run) for the request budget and the metrics.
+
+        The limiter is shared by the whole process, and so is the run: the first run to start resets the metrics and
+        the request budget, and runs starting while it is in progress (e.g. each agent run of a sweep) join it. The
+        budget then covers every request, on any thread, until the last of them ends.
+
+        Args:
+            request_budget: Optional budget for the run, overriding `RateLimiterConfig.request_budget`. Ignored when
+                joining a run in progress.
+        """
+        with self._condition:
+            if self._active_runs == 0:
+                self._request_budget = request_budget if request_budget is not None else self.config.request_budget
+                self._stats = RateLimiterStats(current_rate=self._rate)
+            self._active_runs += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active_runs -= 1
+
+    def acquire(self, is_retry: bool = False):
+        """
+        Block until a request may be sent.
+
+        Raises:
+            RequestBudgetExceeded: If the run's request budget is used up.
+        """
+        with self._condition:
+            budget = self._request_budget
+            if budget is not None and self._stats.requests >= budget:
+                raise RequestBudgetExceeded(f"Rootly request budget of {budget} requests for this run is exhausted.")
+            self._stats.requests += 1
+            self._stats.retries += int(is_retry)
+
+            started_at = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = max(self._paused_until - now, 0.0)
+                if wait == 0.0 and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._stats.throttled_seconds += now - started_at
+                    break
+                if wait == 0.0:
+                    wait = (1.0 - self._tokens) / self._rate
+                self._condition.wait(wait)
+        if (callback := _admission_callback.get()) is not None:
+            callback()
+
+    def observe(self, response: requests.Response):
+        """
+        Adapt the rate to a response: grow on success, back off on 429, and follow the rate-limit headers.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if response.status_code == 429:
+                self._stats.rate_limited_responses += 1
+                self._rate = max(self._rate * self.config.multiplicative_decrease, self.config.min_requests_per_second)
+                self._tokens = min(self._tokens, 0.0)
+                if (retry_after := self._retry_after(response)) is not None:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif response.status_code >= 500:
+                self._stats.server_errors += 1
+            else:
+                self._rate = min(self._rate + self.config.additive_increase, self.config.max_requests_per_second)
+
+            remaining = self._header_float(response, "RateLimit-Remaining", "X-RateLimit-Remaining")
+            reset = self._reset_seconds(response)
+            if remaining is not None and reset is not None:
+                if remaining < 1:
+                    self._paused_until = max(self._paused_until, now + reset)
+                else:
+                    # Spread the remaining allowance over the rest of the window.
+                    self._rate = max(min(self._rate, remaining / max(reset, 1.0)), self.config.min_requests_per_second)
+            self._condition.notify_all()
+
+    def record_connection_error(self):
+        """
+        Count a connection reset or timeout.
+        """
+        with self._condition:
+            self._stats.connection_errors += 1
+
+    def backoff(self, attempt: int, response: Optional[requests.Response] = None):
+        """
+        Sleep before retrying a failed attempt with full-jitter exponential backoff. Responses carrying
+        `Retry-After` have already paused the whole bucket in `observe`, so the next `acquire` does the waiting.
+
+        Args:
+            attempt: Zero-based index of the attempt that failed.
+            response: The failed response, if any (None for connection errors).
+        """
+        if response is not None and self._retry_after(response) is not None:
+            return
+        delay = random.uniform(0.0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+        with self._condition:
+            self._stats.throttled_seconds += delay
+        time.sleep(delay)
+
+    @staticmethod
+    def is_retryable(response: requests.Response) -> bool:
+        """
+        Whether a response is worth retrying (429 or 5xx).
+        """
+        return response.status_code == 429 or response.status_code >= 500
+
+    def _refill(self, now: float):
+        self._tokens = min(self._tokens + (now - self._updated_at) * self._rate, float(self.config.burst))
+        self._updated_at = now
+
+    @staticmethod
+    def _header_float(response: requests.Response, *names: str) -> Optional[float]:
+        for name in names:
+            value = response.headers.get(name)
+            if value is None:
+                continue
+            try:
+                # Structured forms such as "100, 100;w=60" carry the current value first.
+                return float(value.split(",")[0].split(";")[0].strip())
+            except ValueError:
+                continue
+        return None
+
+    def _reset_seconds(self, response: requests.Response) -> Optional[float]:
+        reset = self._header_float(response, "RateLimit-Reset", "X-RateLimit-Reset")
+        if reset is None:
+            return None
+        if reset > 1e9:  # an epoch timestamp rather than a delta
+            reset -= time.time()
+        return min(max(reset, 0.0), self.config.backoff_max)
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.config.backoff_max)
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+
+def _default_endpoint_ttls() -> Dict[str, float]:
+    return {
+        "/v1/users": 3600.0,
+        "/v1/schedules": 900.0,
+        "/v1/incidents": 120.0,
+    }
+
+
+@dataclass
+class ResponseCacheConfig:
+    max_entries: int = 1024  # maximum number of responses kept in memory before least-recently-used eviction
+    default_ttl: float = 300.0  # seconds a response stays fresh for endpoints without an entry in endpoint_ttls
+    endpoint_ttls: Dict[str, float] = field(default_factory=_default_endpoint_ttls)  # per-endpoint TTLs, in seconds
+    disk_dir: Optional[str] = field(default_factory=lambda: os.getenv("ROOTLY_CACHE_DIR"))  # optional on-disk tier
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0  # lookups answered from memory
+    disk_hits: int = 0  # lookups answered from the on-disk tier
+    misses: int = 0  # lookups that had to fetch from the API
+    coalesced: int = 0  # lookups that waited on an identical in-flight fetch instead of sending their own
+    evictions: int = 0  # entries evicted to stay within max_entries
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of decoded Rootly responses, keyed on endpoint and normalized query parameters.
+
+    Concurrent lookups of the same key are coalesced into a single in-flight fetch. When `disk_dir` is set, fresh
+    responses are also written to disk so that later processes can reuse them until they expire.
+    """
+
+    def __init__(self, config: Optional[ResponseCacheConfig] = None):
+        self.config = config if config is not None else ResponseCacheConfig()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats = ResponseCacheStats()
+        if self.config.disk_dir:
+            os.makedirs(self.config.disk_dir, exist_ok=True)
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        """
+        A snapshot of the hit, miss and coalescing counters of this cache.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        """
+        The endpoint path of a relative or absolute URL, e.g. "/v1/incidents".
+        """
+        return "/" + urlparse(url).path.strip("/")
+
+    @classmethod
+    def make_key(cls, url: str, params: Optional[dict] = None, api_key: Optional[str] = None) -> str:
+        """
+        Build the cache key of a request. Query parameters embedded in the URL and given separately are merged and
+        sorted, so equivalent requests share a key; the scheme and host of absolute URLs are kept, so that different
+        Rootly instances (e.g. a local stand-in) never share entries, and the API key is hashed in so organisations
+        never do either.
+        """
+        parsed = urlparse(url)
+        merged = dict(parse_qsl(parsed.query))
+        merged.update({name: str(value) for name, value in (params or {}).items() if value is not None})
+        origin = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else ""
+        normalized = json.dumps([origin, cls.endpoint_of(url), sorted(merged.items())])
+        api_key_hash = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        return f"{api_key_hash}:{normalized}"
+
+    def ttl_for(self, url: str) -> float:
+        """
+        The TTL, in seconds, of responses from the endpoint of the given URL.
+        """
+        return self.config.endpoint_ttls.get(self.endpoint_of(url), self.config.default_ttl)
+
+    def get_or_fetch(self, url: str, params: Optional[dict], api_key: Optional[str], fetch: Callable[[], dict]) -> dict:
+        """
+        Return the cached response for a request, fetching (once, across concurrent callers) when it is missing or
+        expired.
+
+        Args:
+            url: The API path or absolute URL of the request.
+            params: The query parameters of the request.
+            api_key: The API key of the request.
+            fetch: Zero-argument callable performing the request and returning the decoded body.
+        """
+        key = self.make_key(url, params, api_key)
+        ttl = self.ttl_for(url)
+        if ttl <= 0:
+            return fetch()
+
+        with self._lock:
+            if (value := self._get_fresh(key)) is not None:
+                self._stats.hits += 1
+                return value
+            if (future := self._in_flight.get(key)) is not None:
+                self._stats.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value, expires_at = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self._stats.disk_hits += 1
+            else:
+                with self._lock:
+                    self._stats.misses += 1
+                value = fetch()
+                expires_at = time.time() + ttl
+                self._write_disk(key, value, expires_at)
+            self._put(key, value, expires_at)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """
+        Drop cached responses, from memory and disk.
+
+        Args:
+            endpoint: Optional endpoint path (e.g. "/v1/incidents") to restrict the invalidation to. Clears everything
+                when not given.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if endpoint is None or self._key_endpoint(key) == endpoint]
+            for key in keys:
+                del self._entries[key]
+        if self.config.disk_dir:
+            for file_name in os.listdir(self.config.disk_dir):
+                path = os.path.join(self.config.disk_dir, file_name)
+                if not file_name.endswith(".json"):
+                    continue
+                if endpoint is not None:
+                    try:
+                        with open(path, "r") as file:
+                            if self._key_endpoint(json.load(file)["key"]) != endpoint:
+                                continue
+                    except (OSError, ValueError, KeyError):
+                        pass
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _key_endpoint(key: str) -> str:
+        return json.loads(key.split(":", 1)[1])[1]
+
+    def _get_fresh(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key: str, value: dict, expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.config.disk_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read_disk(self, key: str) -> Tuple[Optional[dict], float]:
+        if not self.config.disk_dir:
+            return None, 0.0
+        try:
+            with open(self._disk_path(key), "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None, 0.0
+        if entry.get("key") != key or entry.get("expires_at", 0) <= time.time():
+            return None, 0.0
+        return entry.get("value"), entry["expires_at"]
+
+    def _write_disk(self, key: str, value: dict, expires_at: float):
+        if not self.config.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({"key": key, "expires_at": expires_at, "value": value}, file)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,253 @@
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import ContextManager, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.burnout_detector.tools.rootly_tools.rate_limiter import AdaptiveRateLimiter, RateLimiterConfig
+from src.burnout_detector.tools.rootly_tools.response_cache import ResponseCache, ResponseCacheConfig
+from src.burnout_detector.tracing import trace_span
+
+
+ROOTLY_BASE_URL = "https://api.rootly.com"
+
+
+@dataclass
+class RootlyClientConfig:
+    base_url: str = field(  # root of the Rootly API, e.g. a local stand-in (see fake_rootly.py) for offline runs
+        default_factory=lambda: os.getenv("ROOTLY_API_BASE_URL") or ROOTLY_BASE_URL
+    )
+    pool_connections: int = 4  # number of per-host connection pools to keep around
+    pool_maxsize: int = 16  # maximum number of keep-alive connections kept per host
+    connect_timeout: float = 5.0  # seconds to wait for a TCP+TLS connection to be established
+    read_timeout: float = 30.0  # seconds to wait for the server to send a response
+    rate_limit: RateLimiterConfig = field(default_factory=RateLimiterConfig)  # rate limiting and retry behaviour
+    cache: Optional[ResponseCacheConfig] = field(default_factory=ResponseCacheConfig)  # None disables response caching
+
+
+@dataclass
+class RootlyClientStats:
+    requests: int = 0  # number of HTTP requests sent
+    reused_connections: int = 0  # number of requests served over an already-open connection
+    bytes_transferred: int = 0  # response bytes read off the wire (compressed size when gzipped)
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts how many new connections its pools open, so reuse can be derived from it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.Lock()
+        self.new_connections = 0
+        super().__init__(*args, **kwargs)
+
+    def _on_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        class _CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class RootlyClient:
+    """
+    Thread-safe HTTP client for the Rootly API, shared by the Rootly tools.
+
+    Keeps a keep-alive connection pool per host so that consecutive tool calls reuse the same TCP+TLS
+    connection instead of paying for a fresh handshake every time. Every request goes through a shared adaptive rate
+    limiter, and 429s, 5xx responses and connection errors are retried with backoff.
+    """
+
+    def __init__(self, config: Optional[RootlyClientConfig] = None):
+        self.config = config if config is not None else RootlyClientConfig()
+        self._adapter = _CountingHTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+        })
+        self._lock = threading.Lock()
+        self._stats = RootlyClientStats()
+        self._new_connections_baseline = 0
+        self.rate_limiter = AdaptiveRateLimiter(self.config.rate_limit)
+        self.cache = ResponseCache(self.config.cache) if self.config.cache is not None else None
+
+    @property
+    def stats(self) -> RootlyClientStats:
+        """
+        A snapshot of the request, connection reuse and transfer counters of this client.
+        """
+        with self._lock:
+            new_connections = self._adapter.new_connections - self._new_connections_baseline
+            return replace(
+                self._stats,
+                reused_connections=max(self._stats.requests - new_connections, 0),
+            )
+
+    def reset_stats(self):
+        """
+        Reset the counters exposed through `stats`.
+        """
+        with self._lock:
+            self._stats = RootlyClientStats()
+            self._new_connections_baseline = self._adapter.new_connections
+
+    def url_for(self, path: str) -> str:
+        """
+        Build an absolute URL for the given API path. Absolute URLs (e.g. JSON:API links) are returned as-is.
+        """
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.config.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    def run(self, request_budget: Optional[int] = None) -> ContextManager[None]:
+        """
+        Scope a run of this client's requests: the request budget and the metrics start afresh for the first run, and
+        runs started while it is in progress join it (see `AdaptiveRateLimiter.run`). Every entry point wraps its
+        work in one, e.g. `with get_rootly_client().run(): ...`.
+        """
+        return self.rate_limiter.run(request_budget)
+
+    def get(self, path: str, params: Optional[dict] = None, api_key: Optional[str] = None) -> requests.Response:
+        """
+        Send a GET request to the Rootly API over the pooled session.
+
+        Args:
+            path: The API path (e.g. "/v1/incidents") or an absolute URL.
+            params: Optional query parameters.
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+
+        Returns:
+            requests.Response: The response, after `raise_for_status` has been called on it.
+
+        Raises:
+            requests.exceptions.RequestException: If the request still fails after retries, or the run's request
+                budget is exhausted (`RequestBudgetExceeded`).
+        """
+        api_key = api_key if api_key is not None else os.getenv("ROOTLY_API_KEY")
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+        max_retries = self.config.rate_limit.max_retries
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(is_retry=attempt > 0)
+            url = self.url_for(path)
+            try:
+                with trace_span("GET", "http", endpoint=urlparse(url).path, url=url, params=params,
+                                attempt=attempt) as span:
+                    response = self._session.get(
+                        url,
+                        headers=headers,
+                        params=params,
+                        timeout=(self.config.connect_timeout, self.config.read_timeout),
+                    )
+                    content = response.content  # read the body so the connection goes back to the pool
+                    transferred = (response.raw.tell() if response.raw is not None else 0) or len(content)
+                    if span is not None:
+                        span.set(status=response.status_code, bytes=transferred)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.rate_limiter.record_connection_error()
+                if attempt == max_retries:
+                    raise
+                self.rate_limiter.backoff(attempt)
+                continue
+
+            with self._lock:
+                self._stats.requests += 1
+                self._stats.bytes_transferred += transferred
+
+            self.rate_limiter.observe(response)
+            if self.rate_limiter.is_retryable(response) and attempt < max_retries:
+                self.rate_limiter.backoff(attempt, response)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def get_json(
+            self, path: str, params: Optional[dict] = None, api_key: Optional[str] = None, use_cache: bool = True
+    ) -> dict:
+        """
+        Send a GET request to the Rootly API and decode the JSON body. Served from the response cache when enabled
+        and `use_cache` is set; callers must treat the returned body as read-only, since it may be shared. Pulls that
+        must see the latest data (delta pulls since a watermark, forced refreshes) pass `use_cache=False`.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+            ValueError: If the response body is not valid JSON.
+        """
+        api_key = api_key if api_key is not None else os.getenv("ROOTLY_API_KEY")
+        if self.cache is None or not use_cache:
+            return self.get(path, params=params, api_key=api_key).json()
+        return self.cache.get_or_fetch(
+            self.url_for(path), params, api_key, lambda: self.get(path, params=params, api_key=api_key).json()
+        )
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self._session.close()
+
+
+_shared_client: Optional[RootlyClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_rootly_client(config: Optional[RootlyClientConfig] = None) -> RootlyClient:
+    """
+    Get the process-wide Rootly client shared by all Rootly tools, creating it on first use.
+
+    Args:
+        config: Optional configuration. Only used when the shared client has not been created yet, or to replace
+            it when given a configuration that differs from the current one. The replaced client is left open, since
+            other threads may still be using it; its connections are released once its last holder drops it.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None or (config is not None and config != _shared_client.config):
+            _shared_client = RootlyClient(config)
+        return _shared_client
+
+
+@contextmanager
+def use_rootly_client(client: RootlyClient) -> Iterator[RootlyClient]:
+    """
+    Make `client` the shared Rootly client for the enclosed block (e.g. one pointed at a local stand-in), then restore
+    the previous shared client, if any, as it was.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        previous, _shared_client = _shared_client, client
+    try:
+        yield client
+    finally:
+        with _shared_client_lock:
+            _shared_client = previous
@@ -1,8 +1,14 @@
 from smolagents import Tool
 import requests  
 from datetime import datetime
+from typing import Iterator, List, Optional
 import os
 
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.pagination import DEFAULT_PAGE_SIZE, iter_records
+from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+from src.burnout_detector.tracing import traced_tool_forward
+
 
 class ShiftsTool(Tool):
     name: str = "shifts_tool"
@@ -33,6 +39,171 @@ class ShiftsTool(Tool):
     }
     output_type: str = "object"
 
+    def __init__(
+            self,
+            client: Optional[RootlyClient] = None,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            snapshot_store: Optional[SnapshotStore] = None
+    ):
+        """
+        Args:
+            client: Optional Rootly client. Defaults to the shared client.
+            page_size: Number of schedules requested per page.
+            snapshot_store: Optional local snapshot store. When given, schedules are synced incrementally into it and
+                queries are answered from it.
+        """
+        super().__init__()
+        self.client = client if client is not None else get_rootly_client()
+        self.page_size = page_size
+        self.snapshot_store = snapshot_store
+        # Set by the agent for the duration of a run (see context_budget.py) to compact what the model sees.
+        self.context_budget = None
+        # Set by the agent for the duration of a run (see prefetch.py) to serve data fetched before its first step.
+        self.prefetch = None
+        # Set by the agent for the duration of a run (see tracing.py) to trace calls made from the agent's code.
+        self.run_context = None
+
+    @staticmethod
+    def build_params(schedule_name: str = None, starts_after: str = None, ends_before: str = None) -> dict:
+        """
+        Build the JSON:API filter parameters for the /v1/schedules endpoint.
+        """
+        params = {}
+        if schedule_name:
+            params["filter[name]"] = schedule_name
+        if starts_after:
+            params["filter[created_at][gte]"] = starts_after
+        if ends_before:
+            params["filter[created_at][lte]"] = ends_before
+        return params
+
+    @staticmethod
+    def process_schedule(schedule_data_item: dict) -> Optional[dict]:
+        """
+        Flatten a single JSON:API schedule record into the dictionary returned by this tool.
+
+        Returns:
+            dict: The processed schedule, or None if the record is malformed.
+        """
+        try:
+            current_attributes = schedule_data_item.get("attributes", {})
+            owner_user_id = current_attributes.get("owner_user_id")
+
+            return {
+                "id": schedule_data_item.get("id"),
+                "type": schedule_data_item.get("type"),
+                "name": current_attributes.get("name"),
+                "description": current_attributes.get("description"),
+                "all_time_coverage": current_attributes.get("all_time_coverage"),
+                "slack_user_group": current_attributes.get("slack_user_group"),
+                "owner_group_ids": current_attributes.get("owner_group_ids"),
+                "owner_user_id": owner_user_id,
+                "created_at": current_attributes.get("created_at"),
+                "updated_at": current_attributes.get("updated_at")
+            }
+        except Exception as e:
+            print(f"Error processing individual schedule data: {schedule_data_item.get('id')}, Error: {str(e)}")
+            return None
+
+    def iter_schedules(
+            self,
+            schedule_name: str = None,
+            starts_after: str = None,
+            ends_before: str = None,
+            max_records: int = None,
+            api_key: str = None
+    ) -> Iterator[dict]:
+        """
+        Stream processed schedules page by page. See `forward` for the filters.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching a page fails.
+            ValueError: If a page is not valid JSON.
+        """
+        if self.snapshot_store is not None:
+            self.snapshot_store.sync(
+                "schedules", self.client, "/v1/schedules", self.process_schedule,
+                page_size=self.page_size, api_key=api_key,
+            )
+            yield from self.snapshot_store.query(
+                "schedules", created_at_gte=starts_after, created_at_lte=ends_before,
+                equals={"name": schedule_name} if schedule_name else None, max_records=max_records,
+            )
+            return
+
+        params = self.build_params(schedule_name, starts_after, ends_before)
+        for schedule_data_item in iter_records(
+                self.client, "/v1/schedules", params,
+                page_size=self.page_size, max_records=max_records, api_key=api_key
+        ):
+            if (processed := self.process_schedule(schedule_data_item)) is not None:
+                yield processed
+
+    @staticmethod
+    def process_shift(shift_data_item: dict) -> Optional[dict]:
+        """
+        Flatten a single JSON:API shift record (from the /v1/shifts endpoint).
+
+        Returns:
+            dict: The processed shift, or None if the record is malformed.
+        """
+        try:
+            attributes = shift_data_item.get("attributes", {})
+            user_id = attributes.get("user_id")
+            if user_id is None:
+                user_data = (shift_data_item.get("relationships", {}).get("user") or {}).get("data") or {}
+                user_id = user_data.get("id")
+
+            return {
+                "id": shift_data_item.get("id"),
+                "schedule_id": attributes.get("schedule_id"),
+                "rotation_id": attributes.get("rotation_id"),
+                "user_id": str(user_id) if user_id is not None else None,
+                "starts_at": attributes.get("starts_at"),
+                "ends_at": attributes.get("ends_at"),
+                "is_override": attributes.get("is_override")
+            }
+        except Exception as e:
+            print(f"Error processing individual shift data: {shift_data_item.get('id')}, Error: {str(e)}")
+            return None
+
+    def iter_shifts(
+            self,
+            starts_after: str,
+            ends_before: str,
+            user_ids: Optional[List[str]] = None,
+            schedule_ids: Optional[List[str]] = None,
+            max_records: int = None,
+            api_key: str = None
+    ) -> Iterator[dict]:
+        """
+        Stream the individual on-call shifts (from the /v1/shifts endpoint) overlapping a time window.
+
+        Args:
+            starts_after: ISO 8601 start of the window (maps to `from`).
+            ends_before: ISO 8601 end of the window (maps to `to`).
+            user_ids: Optional users to restrict the shifts to.
+            schedule_ids: Optional schedules to restrict the shifts to.
+            max_records: Optional cap on the number of shifts to fetch.
+            api_key: Optional Rootly API key. Defaults to the ROOTLY_API_KEY environment variable.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching a page fails.
+            ValueError: If a page is not valid JSON.
+        """
+        params = {"from": starts_after, "to": ends_before}
+        if user_ids:
+            params["user_ids[]"] = list(user_ids)
+        if schedule_ids:
+            params["schedule_ids[]"] = list(schedule_ids)
+        for shift_data_item in iter_records(
+                self.client, "/v1/shifts", params,
+                page_size=self.page_size, max_records=max_records, api_key=api_key
+        ):
+            if (processed := self.process_shift(shift_data_item)) is not None:
+                yield processed
+
+    @traced_tool_forward
     def forward(self, schedule_name: str = None, starts_after: str = None, ends_before: str = None):
         """
         Retrieves schedules from the Rootly API (/schedules endpoint).
@@ -51,49 +222,19 @@ class ShiftsTool(Tool):
         if not api_key:
             return "Error: ROOTLY_API_KEY environment variable is not set."
 
-        base_url = "https://api.rootly.com/v1/schedules"
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        
-        params = {}
-        if schedule_name:
-            params["filter[name]"] = schedule_name
-        if starts_after:
-            params["filter[created_at][gte]"] = starts_after
-        if ends_before:
-            params["filter[created_at][lte]"] = ends_before
-
         try:
-            response = requests.get(base_url, headers=headers, params=params)
-            response.raise_for_status()  
-            raw_data = response.json()
+            processed_shifts = self.prefetch.lookup(
+                self.name, schedule_name=schedule_name, starts_after=starts_after, ends_before=ends_before
+            ) if self.prefetch is not None else None
+            if processed_shifts is None:
+                processed_shifts = list(self.iter_schedules(schedule_name, starts_after, ends_before, api_key=api_key))
         except requests.exceptions.RequestException as e:
             return f"Error calling Rootly API: {str(e)}"
         except ValueError as e:  
             return f"Error decoding Rootly API response: {str(e)}"
         except Exception as e:
             return f"An unexpected error occurred during API call: {str(e)}"
-
-        processed_shifts = []
-        if raw_data and "data" in raw_data:
-            for schedule_data_item in raw_data["data"]:
-                try:
-                    current_attributes = schedule_data_item.get("attributes", {})
-                    owner_user_id = current_attributes.get("owner_user_id")
-
-                    processed_shifts.append({
-                        "id": schedule_data_item.get("id"),
-                        "type": schedule_data_item.get("type"),
-                        "name": current_attributes.get("name"),
-                        "description": current_attributes.get("description"),
-                        "all_time_coverage": current_attributes.get("all_time_coverage"),
-                        "slack_user_group": current_attributes.get("slack_user_group"),
-                        "owner_group_ids": current_attributes.get("owner_group_ids"),
-                        "owner_user_id": owner_user_id,
-                        "created_at": current_attributes.get("created_at"),
-                        "updated_at": current_attributes.get("updated_at")
-                    })
-                except Exception as e:
-                    print(f"Error processing individual schedule data: {schedule_data_item.get('id')}, Error: {str(e)}")
-                    continue
         
+        if self.context_budget is not None:
+            return self.context_budget.wrap(self.name, processed_shifts)
         return processed_shifts
@@ -0,0 +1,243 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Set
+
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient
+from src.burnout_detector.tools.rootly_tools.pagination import DEFAULT_PAGE_SIZE, iter_records
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_at_epoch REAL,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX IF NOT EXISTS records_created ON records (resource, created_at_epoch);
+CREATE TABLE IF NOT EXISTS record_users (
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    PRIMARY KEY (resource, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    resource TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (resource, scope)
+);
+"""
+
+
+def to_epoch(timestamp: Optional[str]) -> Optional[float]:
+    """
+    Convert an ISO 8601 timestamp (as returned by Rootly) to a POSIX timestamp. Returns None if it cannot be parsed.
+    """
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotStore:
+    """
+    Local SQLite snapshot of Rootly incidents, schedules and users, kept up to date incrementally.
+
+    Each sync only asks the API for records updated since the newest `updated_at` seen by the previous sync of the
+    same scope (the watermark), and upserts them. Records are stored as the processed dictionaries returned by the
+    tools, so queries answer with exactly what the tools would have returned. Deletions on the Rootly side are not
+    tracked.
+
+    Listeners registered with `add_listener` are called after every sync that stored new or updated records, so that
+    caches derived from the data (e.g. burnout verdicts) can be invalidated.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path: Path of the SQLite database file. Defaults to an in-memory database.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._listeners: List[Callable[[str, Set[str]], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Set[str]], None]):
+        """
+        Register a function called as `listener(resource, user_ids)` after a sync stores new or updated records.
+        `user_ids` holds the users the changed records are associated with, and is empty if none are known.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Set[str]], None]):
+        """
+        Unregister a listener added with `add_listener`.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def watermark(self, resource: str, scope: str = "") -> Optional[str]:
+        """
+        The newest `updated_at` synced for a resource and scope, or None if it has never been synced.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT updated_at FROM watermarks WHERE resource = ? AND scope = ?", (resource, scope)
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync(
+            self,
+            resource: str,
+            client: RootlyClient,
+            path: str,
+            process: Callable[[dict], Optional[dict]],
+            params: Optional[dict] = None,
+            scope: str = "",
+            user_id: Optional[str] = None,
+            related_user_ids: Optional[Callable[[dict], Iterable[str]]] = None,
+            id_field: str = "id",
+            page_size: int = DEFAULT_PAGE_SIZE,
+            api_key: Optional[str] = None,
+    ) -> int:
+        """
+        Fetch the records of a resource updated since the last sync of the given scope, and upsert them.
+
+        Args:
+            resource: Name of the resource in the store, e.g. "incidents".
+            client: The Rootly client to fetch with.
+            path: The API path of the resource, e.g. "/v1/incidents".
+            process: Function flattening a raw JSON:API record into the stored dictionary (or None to skip it).
+            params: Optional API filters defining the scope, e.g. {"filter[user_id]": 42}.
+            scope: Name of the scope the watermark is kept for. "" means the whole organisation.
+            user_id: Optional user the synced records are associated with (e.g. when filtering by user).
+            related_user_ids: Optional function returning further user IDs a raw record is associated with.
+            id_field: Key of the record identifier in the processed dictionary.
+            page_size: Page size used when fetching.
+            api_key: Optional Rootly API key.
+
+        Returns:
+            int: The number of records fetched.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching fails. Records fetched before the failure are kept, but
+                the watermark is not advanced.
+        """
+        params = dict(params or {})
+        if (since := self.watermark(resource, scope)) is not None:
+            params["filter[updated_at][gte]"] = since
+
+        newest = since
+        count = 0
+        rows, user_rows = [], []
+        for raw in iter_records(client, path, params, page_size=page_size, api_key=api_key, use_cache=False):
+            count += 1
+            record = process(raw)
+            if record is None:
+                continue
+            record_id = str(record.get(id_field))
+            updated_at = record.get("updated_at")
+            rows.append((resource, record_id, to_epoch(record.get("created_at")), updated_at, json.dumps(record)))
+            user_ids = set(related_user_ids(raw)) if related_user_ids is not None else set()
+            if user_id is not None:
+                user_ids.add(str(user_id))
+            user_rows.extend((resource, record_id, str(related)) for related in user_ids if related)
+            if (epoch := to_epoch(updated_at)) is not None and epoch > (to_epoch(newest) or 0):
+                newest = updated_at
+
+        with self._lock, self._connection:
+            # The watermark filter is inclusive, so the newest records of the last sync come back every time; only
+            # records that are new or whose `updated_at` moved count as changes for the listeners.
+            changed_ids = set()
+            for _, record_id, _, updated_at, _ in rows:
+                existing = self._connection.execute(
+                    "SELECT updated_at FROM records WHERE resource = ? AND id = ?", (resource, record_id)
+                ).fetchone()
+                if existing is None or existing[0] != updated_at:
+                    changed_ids.add(record_id)
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO records (resource, id, created_at_epoch, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO record_users (resource, id, user_id) VALUES (?, ?, ?)", user_rows
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO watermarks (resource, scope, updated_at) VALUES (?, ?, ?)",
+                (resource, scope, newest)
+            )
+        if changed_ids:
+            changed_user_ids = {related for _, record_id, related in user_rows if record_id in changed_ids}
+            for listener in list(self._listeners):
+                listener(resource, changed_user_ids)
+        return count
+
+    def query(
+            self,
+            resource: str,
+            user_id: Optional[str] = None,
+            created_at_gte: Optional[str] = None,
+            created_at_lte: Optional[str] = None,
+            equals: Optional[dict] = None,
+            contains: Optional[str] = None,
+            contains_fields: Iterable[str] = (),
+            max_records: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Query stored records, newest first.
+
+        Args:
+            resource: Name of the resource, e.g. "incidents".
+            user_id: Optional user the records must be associated with.
+            created_at_gte: Optional ISO 8601 lower bound (inclusive) on `created_at`.
+            created_at_lte: Optional ISO 8601 upper bound (inclusive) on `created_at`.
+            equals: Optional mapping of record fields to the exact values they must have.
+            contains: Optional case-insensitive substring that at least one of `contains_fields` must contain.
+            contains_fields: Fields searched by `contains`.
+            max_records: Optional maximum number of records to return.
+
+        Yields:
+            dict: The stored records.
+        """
+        sql = "SELECT r.data FROM records r"
+        clauses, args = ["r.resource = ?"], [resource]
+        if user_id is not None:
+            sql += " JOIN record_users u ON u.resource = r.resource AND u.id = r.id"
+            clauses.append("u.user_id = ?")
+            args.append(str(user_id))
+        if (gte := to_epoch(created_at_gte)) is not None:
+            clauses.append("r.created_at_epoch >= ?")
+            args.append(gte)
+        if (lte := to_epoch(created_at_lte)) is not None:
+            clauses.append("r.created_at_epoch <= ?")
+            args.append(lte)
+        for field_name, value in (equals or {}).items():
+            clauses.append(f"json_extract(r.data, '$.{field_name}') = ?")
+            args.append(value)
+        if contains:
+            matches = [f"lower(json_extract(r.data, '$.{field_name}')) LIKE ?" for field_name in contains_fields]
+            clauses.append("(" + " OR ".join(matches) + ")")
+            args.extend([f"%{contains.lower()}%"] * len(matches))
+        sql += " WHERE " + " AND ".join(clauses) + " ORDER BY r.created_at_epoch DESC"
+        if max_records is not None:
+            sql += " LIMIT ?"
+            args.append(max_records)
+
+        with self._lock:
+            rows = self._connection.execute(sql, args).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
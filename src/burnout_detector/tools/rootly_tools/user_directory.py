@@ -0,0 +1,232 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.burnout_detector.tools.rootly_tools.pagination import iter_records
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.snapshot_store import to_epoch
+from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """
+    Normalise a name for matching: accents stripped, lower-cased, punctuation collapsed to single spaces.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+@dataclass
+class UserDirectoryConfig:
+    refresh_interval: float = 300.0  # seconds a refresh is trusted before lookups trigger the next incremental one
+    page_size: int = 100  # page[size] of the /v1/users pulls
+
+
+@dataclass
+class UserDirectoryStats:
+    users: int = 0  # users currently indexed
+    full_loads: int = 0  # complete /v1/users pulls
+    incremental_refreshes: int = 0  # pulls of only the users updated since the last one
+    lookups: int = 0  # names resolved
+    unresolved: int = 0  # names that matched no user
+
+
+class UserDirectory:
+    """
+    In-memory directory of the organisation's Rootly users, for resolving names, emails and Slack IDs to users
+    without one API search per engineer.
+
+    The directory is loaded with one paginated `/v1/users` pull and afterwards refreshed incrementally with
+    `filter[updated_at][gte]`, at most once per `refresh_interval`. It keeps exact indexes on ID, email and Slack ID,
+    plus a normalised name index used for full-name, partial and first-name matches.
+    """
+
+    def __init__(self, config: Optional[UserDirectoryConfig] = None, client: Optional[RootlyClient] = None):
+        self.config = config if config is not None else UserDirectoryConfig()
+        self.client = client if client is not None else get_rootly_client()
+        self._lock = threading.RLock()
+        self._users: Dict[str, dict] = {}
+        self._by_email: Dict[str, str] = {}
+        self._by_slack_id: Dict[str, str] = {}
+        self._by_name: Dict[str, Set[str]] = {}  # normalised full name -> user IDs
+        self._by_token: Dict[str, Set[str]] = {}  # normalised name token -> user IDs
+        self._tokens: List[str] = []  # sorted keys of _by_token, for prefix lookups
+        self._tokens_dirty = False
+        self._watermark: Optional[str] = None
+        self._refreshed_at: Optional[float] = None
+        self._stats = UserDirectoryStats()
+
+    @property
+    def stats(self) -> UserDirectoryStats:
+        with self._lock:
+            return replace(self._stats, users=len(self._users))
+
+    @staticmethod
+    def _names(user: dict) -> List[str]:
+        return list(dict.fromkeys(
+            normalized for normalized in (normalize_name(user.get(key)) for key in ("full_name", "name")) if normalized
+        ))
+
+    def _unindex(self, user_id: str):
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return
+        self._by_email.pop((user.get("email") or "").lower(), None)
+        self._by_slack_id.pop(user.get("slack_id") or "", None)
+        for name in self._names(user):
+            self._by_name.get(name, set()).discard(user_id)
+            for token in name.split():
+                self._by_token.get(token, set()).discard(user_id)
+
+    def _index(self, user: dict):
+        user_id = str(user.get("id"))
+        self._unindex(user_id)
+        self._users[user_id] = user
+        if user.get("email"):
+            self._by_email[user["email"].lower()] = user_id
+        if user.get("slack_id"):
+            self._by_slack_id[user["slack_id"]] = user_id
+        for name in self._names(user):
+            self._by_name.setdefault(name, set()).add(user_id)
+            for token in name.split():
+                if token not in self._by_token:
+                    self._tokens_dirty = True
+                self._by_token.setdefault(token, set()).add(user_id)
+
+    def add_users(self, users: Iterable[dict]):
+        """
+        Index processed users (as returned by `UsersTool`), replacing any earlier version of the same user.
+        """
+        with self._lock:
+            for user in users:
+                self._index(user)
+                updated_at = user.get("updated_at")
+                if updated_at and (to_epoch(updated_at) or 0) > (to_epoch(self._watermark) or 0):
+                    self._watermark = updated_at
+
+    def refresh(self, api_key: Optional[str] = None, force: bool = False) -> int:
+        """
+        Load the directory, or pull the users updated since the last refresh, unless the last refresh is more recent
+        than `refresh_interval` (and `force` is not set).
+
+        The users are fetched without holding the directory's lock, so lookups are answered from the current index
+        meanwhile. Refreshes started at the same time may each pull the same users; indexing them twice is harmless.
+
+        Returns:
+            int: The number of users fetched.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching fails.
+        """
+        with self._lock:
+            if not force and self._refreshed_at is not None \
+                    and time.monotonic() - self._refreshed_at < self.config.refresh_interval:
+                return 0
+            params = {"filter[updated_at][gte]": self._watermark} if self._watermark else {}
+        users = [
+            processed
+            for raw in iter_records(self.client, "/v1/users", params, page_size=self.config.page_size,
+                                    api_key=api_key, use_cache=False)
+            if (processed := UsersTool.process_user(raw)) is not None
+        ]
+        with self._lock:
+            self.add_users(users)
+            self._refreshed_at = time.monotonic()
+            if params:
+                self._stats.incremental_refreshes += 1
+            else:
+                self._stats.full_loads += 1
+        return len(users)
+
+    def users(self) -> List[dict]:
+        """
+        All indexed users. Does not refresh the directory.
+        """
+        with self._lock:
+            return list(self._users.values())
+
+    def get(self, user_id) -> Optional[dict]:
+        with self._lock:
+            return self._users.get(str(user_id))
+
+    def _prefixed(self, prefix: str) -> Set[str]:
+        if self._tokens_dirty:
+            self._tokens = sorted(token for token, ids in self._by_token.items() if ids)
+            self._tokens_dirty = False
+        ids: Set[str] = set()
+        position = bisect.bisect_left(self._tokens, prefix)
+        while position < len(self._tokens) and self._tokens[position].startswith(prefix):
+            ids |= self._by_token[self._tokens[position]]
+            position += 1
+        return ids
+
+    def match(self, query: str) -> List[dict]:
+        """
+        The users matching a name, email, Slack ID or user ID, best match first.
+
+        Exact matches on ID, email, Slack ID or the full name win outright. Otherwise every word of the query must
+        start a word of the user's name ("ani" and "Aniket" both match "Aniket Sharma"); users whose name matches
+        word for word rank before partial matches, then users matched on their first name, then shorter names.
+        """
+        query = (query or "").strip()
+        with self._lock:
+            if not query:
+                return []
+            for index in (self._users, self._by_slack_id):
+                if query in index:
+                    return [self._users[query if index is self._users else index[query]]]
+            if "@" in query:
+                user_id = self._by_email.get(query.lower())
+                return [self._users[user_id]] if user_id else []
+
+            normalized = normalize_name(query)
+            if exact := self._by_name.get(normalized):
+                return sorted((self._users[user_id] for user_id in exact), key=lambda user: str(user.get("id")))
+
+            tokens = normalized.split()
+            if not tokens:
+                return []
+            ids = self._prefixed(tokens[0])
+            for token in tokens[1:]:
+                ids &= self._prefixed(token)
+
+            def rank(user_id: str):
+                names = [name.split() for name in self._names(self._users[user_id])]
+                whole_words = max(sum(token in words for token in tokens) for words in names)
+                first_name = any(words and words[0].startswith(tokens[0]) for words in names)
+                return -whole_words, not first_name, min(len(words) for words in names), user_id
+
+            return [self._users[user_id] for user_id in sorted(ids, key=rank)]
+
+    def resolve(self, query: str) -> Optional[dict]:
+        """
+        The best match for a name, email, Slack ID or user ID, or None. Does not refresh the directory.
+        """
+        matches = self.match(query)
+        with self._lock:
+            self._stats.lookups += 1
+            self._stats.unresolved += 0 if matches else 1
+        return matches[0] if matches else None
+
+    def resolve_many(self, queries: Iterable[str], api_key: Optional[str] = None) -> Dict[str, Optional[dict]]:
+        """
+        Resolve many names in one pass: the directory is refreshed at most once, and repeated names are looked up
+        once.
+
+        Returns:
+            dict: Each distinct query to its best matching user, or None.
+
+        Raises:
+            requests.exceptions.RequestException: If refreshing the directory fails.
+        """
+        self.refresh(api_key=api_key)
+        return {query: self.resolve(query) for query in dict.fromkeys(queries)}
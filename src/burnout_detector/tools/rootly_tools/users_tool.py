@@ -1,6 +1,12 @@
 from smolagents import Tool
 import os
 import requests
+from typing import Iterator, Optional
+
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, get_rootly_client
+from src.burnout_detector.tools.rootly_tools.pagination import DEFAULT_PAGE_SIZE, iter_records
+from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+from src.burnout_detector.tracing import traced_tool_forward
 
 
 class UsersTool(Tool):
@@ -25,61 +31,128 @@ class UsersTool(Tool):
     }
     output_type: str = "object"
 
-    def forward(self, search: str = None, email: str = None):
+    def __init__(
+            self,
+            client: Optional[RootlyClient] = None,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            snapshot_store: Optional[SnapshotStore] = None
+    ):
         """
-        Retrieves users from the Rootly API (/users endpoint).
-        Filters these users based on search and email via API parameters.
+        Args:
+            client: Optional Rootly client. Defaults to the shared client.
+            page_size: Number of users requested per page.
+            snapshot_store: Optional local snapshot store. When given, users are synced incrementally into it and
+                queries are answered from it.
         """
-        api_key = os.getenv('ROOTLY_API_KEY')
-        if not api_key:
-            return "Error: ROOTLY_API_KEY environment variable is not set."
+        super().__init__()
+        self.client = client if client is not None else get_rootly_client()
+        self.page_size = page_size
+        self.snapshot_store = snapshot_store
+        # Set by the agent for the duration of a run (see context_budget.py) to compact what the model sees.
+        self.context_budget = None
+        # Set by the agent for the duration of a run (see prefetch.py) to serve data fetched before its first step.
+        self.prefetch = None
+        # Set by the agent for the duration of a run (see tracing.py) to trace calls made from the agent's code.
+        self.run_context = None
 
-        base_url = "https://api.rootly.com/v1/users"
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        
+    @staticmethod
+    def build_params(search: str = None, email: str = None) -> dict:
+        """
+        Build the JSON:API filter parameters for the /v1/users endpoint.
+        """
         params = {}
         if search:
             params["filter[search]"] = search
         if email:
             params["filter[email]"] = email
+        return params
+
+    @staticmethod
+    def process_user(user_data_item: dict) -> Optional[dict]:
+        """
+        Flatten a single JSON:API user record into the dictionary returned by this tool.
 
+        Returns:
+            dict: The processed user, or None if the record is missing its attributes or is malformed.
+        """
         try:
-            response = requests.get(base_url, headers=headers, params=params)
-            response.raise_for_status()  
-            raw_data = response.json()
+            attributes = user_data_item.get("attributes", {})
+            if not attributes:
+                print(f"Warning: User data {user_data_item.get('id')} missing attributes.")
+                return None
+            
+            return {
+                "id": user_data_item.get("id"),
+                "type": user_data_item.get("type"),
+                "name": attributes.get("name"),
+                "email": attributes.get("email"),
+                "first_name": attributes.get("first_name"),
+                "last_name": attributes.get("last_name"),
+                "full_name": attributes.get("full_name"),
+                "slack_id": attributes.get("slack_id"),
+                "time_zone": attributes.get("time_zone"),
+                "created_at": attributes.get("created_at"),
+                "updated_at": attributes.get("updated_at")
+            }
+        except Exception as e:
+            print(f"Error processing individual user data: {user_data_item.get('id')}, Error: {str(e)}")
+            return None
+
+    def iter_users(
+            self,
+            search: str = None,
+            email: str = None,
+            max_records: int = None,
+            api_key: str = None
+    ) -> Iterator[dict]:
+        """
+        Stream processed users page by page. See `forward` for the filters.
+
+        Raises:
+            requests.exceptions.RequestException: If fetching a page fails.
+            ValueError: If a page is not valid JSON.
+        """
+        if self.snapshot_store is not None:
+            self.snapshot_store.sync(
+                "users", self.client, "/v1/users", self.process_user, page_size=self.page_size, api_key=api_key,
+            )
+            yield from self.snapshot_store.query(
+                "users", equals={"email": email} if email else None,
+                contains=search, contains_fields=("name", "full_name", "email"), max_records=max_records,
+            )
+            return
+
+        params = self.build_params(search, email)
+        for user_data_item in iter_records(
+                self.client, "/v1/users", params,
+                page_size=self.page_size, max_records=max_records, api_key=api_key
+        ):
+            if (processed := self.process_user(user_data_item)) is not None:
+                yield processed
+
+    @traced_tool_forward
+    def forward(self, search: str = None, email: str = None):
+        """
+        Retrieves users from the Rootly API (/users endpoint).
+        Filters these users based on search and email via API parameters.
+        """
+        api_key = os.getenv('ROOTLY_API_KEY')
+        if not api_key:
+            return "Error: ROOTLY_API_KEY environment variable is not set."
+
+        try:
+            processed_users = self.prefetch.lookup(
+                self.name, search=search, email=email
+            ) if self.prefetch is not None else None
+            if processed_users is None:
+                processed_users = list(self.iter_users(search, email, api_key=api_key))
         except requests.exceptions.RequestException as e:
             return f"Error calling Rootly Users API: {str(e)}"
         except ValueError as e:  
             return f"Error decoding Rootly Users API response: {str(e)}"
         except Exception as e:
             return f"An unexpected error occurred during API call for users: {str(e)}"
-
-        processed_users = []
-        if raw_data and "data" in raw_data:
-            for user_data_item in raw_data["data"]:
-                try:
-                    attributes = user_data_item.get("attributes", {})
-                    if not attributes:
-                        print(f"Warning: User data {user_data_item.get('id')} missing attributes.")
-                        continue
-                    
-                    processed_users.append({
-                        "id": user_data_item.get("id"),
-                        "type": user_data_item.get("type"),
-                        "name": attributes.get("name"),
-                        "email": attributes.get("email"),
-                        "first_name": attributes.get("first_name"),
-                        "last_name": attributes.get("last_name"),
-                        "full_name": attributes.get("full_name"),
-                        "slack_id": attributes.get("slack_id"),
-                        "time_zone": attributes.get("time_zone"),
-                        "created_at": attributes.get("created_at"),
-                        "updated_at": attributes.get("updated_at")
-                    })
-                except Exception as e:
-                    print(f"Error processing individual user data: {user_data_item.get('id')}, Error: {str(e)}")
-                    continue
         
+        if self.context_budget is not None:
+            return self.context_budget.wrap(self.name, processed_users)
         return processed_users
-    
-    
\ No newline at end of file
@@ -0,0 +1,68 @@
+import pytest
+import requests
+
+from src.burnout_detector.tools.rootly_tools.fake_rootly import (
+    FakeRootlyServer,
+    FaultConfig,
+    SyntheticOrg,
+    SyntheticOrgConfig,
+)
+from src.burnout_detector.tools.rootly_tools.rate_limiter import RateLimiterConfig
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, RootlyClientConfig
+from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+
+
+def _org() -> SyntheticOrg:
+    return SyntheticOrg(SyntheticOrgConfig(users=40, schedules=4, incidents=200, seed=3, now="2025-06-01T00:00:00Z"))
+
+
+def test_synthetic_org_is_deterministic_and_paginated():
+    org = _org()
+    assert org.records == _org().records
+    assert len(org.records["users"]) == 40 and len(org.records["incidents"]) == 200
+
+    with FakeRootlyServer(org, default_page_size=7) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+        users = list(UsersTool(client=client, page_size=7).iter_users(api_key="test"))
+        assert [user["id"] for user in users] == [str(i) for i in range(1, 41)]
+        assert client.stats.requests == 6  # ceil(40 / 7) pages, following links.next
+
+        shifts = list(ShiftsTool(client=client).iter_shifts(
+            "2025-05-25T00:00:00Z", "2025-06-01T00:00:00Z", schedule_ids=["sched-1"], api_key="test"
+        ))
+        assert len(shifts) == 7 and {shift["schedule_id"] for shift in shifts} == {"sched-1"}
+
+
+def test_fault_injection_is_retried():
+    faults = FaultConfig(latency_seconds=0.001, rate_limit_ratio=0.3, server_error_ratio=0.2, seed=5)
+    with FakeRootlyServer(_org(), faults=faults) as server:
+        client = RootlyClient(RootlyClientConfig(
+            base_url=server.base_url, cache=None, rate_limit=RateLimiterConfig(
+                requests_per_second=1000, min_requests_per_second=1000, burst=100, backoff_base=0.001, max_retries=20
+            )
+        ))
+        for _ in range(20):
+            assert len(client.get_json("/v1/users", api_key="test")["data"]) == 20
+        stats = client.rate_limiter.stats
+        assert stats.rate_limited_responses == server.stats.rate_limited > 0
+        assert stats.server_errors == server.stats.server_errors > 0
+
+
+def test_record_and_replay(tmp_path):
+    with FakeRootlyServer(_org(), default_page_size=15) as upstream:
+        with FakeRootlyServer(fixtures_dir=str(tmp_path), upstream=upstream.base_url) as recorder:
+            assert recorder.mode == "record"
+            client = RootlyClient(RootlyClientConfig(base_url=recorder.base_url, cache=None))
+            recorded = list(UsersTool(client=client, page_size=15).iter_users(search="a", api_key="secret-key"))
+
+    assert len(list(tmp_path.iterdir())) == 3
+    assert all("secret-key" not in path.read_text() for path in tmp_path.iterdir())
+
+    with FakeRootlyServer(fixtures_dir=str(tmp_path)) as replay:
+        assert replay.mode == "replay"
+        client = RootlyClient(RootlyClientConfig(base_url=replay.base_url, cache=None))
+        assert list(UsersTool(client=client, page_size=15).iter_users(search="a", api_key="test")) == recorded
+        # Anything that was not recorded is a 404 rather than a silent empty answer.
+        with pytest.raises(requests.exceptions.HTTPError, match="404"):
+            client.get_json("/v1/incidents", api_key="test")
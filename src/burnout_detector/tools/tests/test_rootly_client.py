@@ -0,0 +1,314 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.burnout_detector.tools.rootly_tools.rate_limiter import RateLimiterConfig, RequestBudgetExceeded
+from src.burnout_detector.tools.rootly_tools.response_cache import ResponseCacheConfig
+from src.burnout_detector.tools.rootly_tools.rootly_client import (
+    RootlyClient,
+    RootlyClientConfig,
+    get_rootly_client,
+    use_rootly_client,
+)
+from src.burnout_detector.tools.rootly_tools.snapshot_store import SnapshotStore
+from src.burnout_detector.tools.rootly_tools.async_collector import AsyncCollectorConfig, AsyncRootlyCollector
+from src.burnout_detector.tools.rootly_tools.fake_rootly import (
+    FakeRootlyServer, FaultConfig, SyntheticOrg, SyntheticOrgConfig,
+)
+from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
+from src.burnout_detector.tracing import Tracer, use_tracer
+
+_INCIDENTS = [
+    {"id": str(i), "type": "incidents", "attributes": {
+        "title": f"Incident {i}",
+        "status": "resolved",
+        "created_at": f"2025-05-{i + 1:02d}T10:00:00Z",
+        "updated_at": f"2025-06-{i + 1:02d}T10:00:00Z",
+    }}
+    for i in range(25)
+]
+
+
+class _RootlyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requested_paths = getattr(self.server, "requested_paths", []) + [self.path]
+        if url.path == "/v1/flaky":
+            self.server.flaky_calls = getattr(self.server, "flaky_calls", 0) + 1
+            if self.server.flaky_calls <= 2:
+                status = 429 if self.server.flaky_calls == 1 else 503
+                self.send_response(status)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            payload = {"data": []}
+        elif url.path == "/v1/incidents":
+            query = parse_qs(url.query)
+            size, number = int(query["page[size]"][0]), int(query["page[number]"][0])
+            has_next = number * size < len(_INCIDENTS)
+            next_url = f"http://{self.headers['Host']}/v1/incidents?page[size]={size}&page[number]={number + 1}"
+            payload = {
+                "data": _INCIDENTS[(number - 1) * size:number * size],
+                "links": {"next": next_url if has_next else None},
+            }
+        elif url.path == "/v1/schedules":
+            payload = {"data": [{"id": "s1", "type": "schedules", "attributes": {"name": "Primary", "owner_user_id": 1}}]}
+        else:
+            payload = {"data": [{"id": "1", "type": "users", "attributes": {"name": "Aniket", "email": "a@example.com"}}]}
+        body = json.dumps(payload).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RootlyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_rootly_client_reuses_connections():
+    server = _serve()
+    try:
+        client = RootlyClient(RootlyClientConfig(base_url=f"http://127.0.0.1:{server.server_port}", cache=None))
+        for _ in range(3):
+            assert client.get_json("/v1/users", api_key="test")["data"][0]["id"] == "1"
+        stats = client.stats
+        print(stats)
+        assert stats.requests == 3
+        assert stats.reused_connections == 2
+        assert stats.bytes_transferred > 0
+        client.close()
+    finally:
+        server.shutdown()
+
+
+def test_use_rootly_client_restores_the_previous_shared_client():
+    shared = get_rootly_client()
+    with use_rootly_client(RootlyClient(RootlyClientConfig(base_url="http://127.0.0.1:1"))) as client:
+        assert get_rootly_client() is client
+    assert get_rootly_client() is shared
+
+
+def test_replacing_the_shared_client_leaves_the_old_one_open(monkeypatch):
+    with use_rootly_client(get_rootly_client()):
+        old = get_rootly_client(RootlyClientConfig(base_url="http://127.0.0.1:1"))
+        monkeypatch.setattr(old, "close", lambda: pytest.fail("a client in use elsewhere was closed"))
+        assert get_rootly_client(RootlyClientConfig(base_url="http://127.0.0.1:2")) is not old
+
+
+def test_users_tool_with_shared_client(monkeypatch):
+    server = _serve()
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    try:
+        client = RootlyClient(RootlyClientConfig(base_url=f"http://127.0.0.1:{server.server_port}"))
+        users = UsersTool(client=client).forward(search="Aniket")
+        print(users)
+        assert users[0]["email"] == "a@example.com"
+    finally:
+        server.shutdown()
+
+
+def test_incidents_tool_follows_pagination(monkeypatch):
+    server = _serve()
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    try:
+        client = RootlyClient(RootlyClientConfig(base_url=f"http://127.0.0.1:{server.server_port}"))
+        tool = IncidentsTool(client=client, page_size=10)
+        tracer = Tracer()
+        with use_tracer(tracer):
+            incidents = tool.forward()
+        assert [incident["incident_id"] for incident in incidents] == [str(i) for i in range(25)]
+        assert client.stats.requests == 3
+
+        # Every page request, including the prefetched ones, is traced under the tool call.
+        tool_span = next(span for span in tracer.spans if span.kind == "tool")
+        http_spans = [span for span in tracer.spans if span.kind == "http"]
+        assert tool_span.attributes["result_items"] == 25
+        assert len(http_spans) == 3
+        assert all(span.parent_id == tool_span.span_id and span.attributes["status"] == 200 for span in http_spans)
+
+        capped = tool.forward(max_records=12)
+        assert len(capped) == 12
+    finally:
+        server.shutdown()
+
+
+def test_async_collector_builds_candidates():
+    server = _serve()
+    try:
+        client = RootlyClient(RootlyClientConfig(base_url=f"http://127.0.0.1:{server.server_port}"))
+        collector = AsyncRootlyCollector(AsyncCollectorConfig(max_concurrency=4), client=client)
+        candidates = collector.collect_sync(["Aniket"] * 10, api_key="test")
+        assert len(candidates) == 10
+        for candidate in candidates:
+            assert "error" not in candidate
+            assert candidate["on_call_schedule"][0]["name"] == "Primary"
+            assert candidate["most_recent_incident"]["incident_id"] == "0"
+        # Names are resolved with one /v1/users pull (which bypasses the response cache); identical schedule and
+        # incident lookups are coalesced or cached.
+        assert client.stats.requests == 3
+        cache_stats = client.cache.stats
+        assert cache_stats.misses == 2
+        assert cache_stats.hits + cache_stats.coalesced == 9
+        assert collector.directory.stats.full_loads == 1
+    finally:
+        server.shutdown()
+
+
+def test_async_collector_timeout_does_not_count_queueing():
+    org = SyntheticOrg(SyntheticOrgConfig(users=40, incidents=100, now="2025-06-01T00:00:00Z"))
+    names = [user["attributes"]["full_name"] for user in org.records["users"]]
+    with FakeRootlyServer(org, faults=FaultConfig(latency_seconds=0.1)) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+        # 40 incident lookups, 8 at a time and rate limited, queue for longer than any single one is allowed to take.
+        collector = AsyncRootlyCollector(AsyncCollectorConfig(candidate_timeout=0.4), client=client)
+        candidates = collector.collect_sync(names, api_key="test")
+    assert [candidate.get("error") for candidate in candidates] == [None] * len(names)
+
+    with FakeRootlyServer(org, faults=FaultConfig(latency_seconds=0.5)) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+        collector = AsyncRootlyCollector(AsyncCollectorConfig(candidate_timeout=0.2), client=client)
+        candidates = collector.collect_sync(names[:2], api_key="test")
+    assert [candidate["error"] for candidate in candidates] == ["timed out after 0.2s"] * 2
+
+
+def test_rootly_client_retries_and_enforces_budget():
+    server = _serve()
+    try:
+        rate_limit = RateLimiterConfig(backoff_base=0.01, request_budget=4)
+        client = RootlyClient(RootlyClientConfig(
+            base_url=f"http://127.0.0.1:{server.server_port}", rate_limit=rate_limit, cache=None
+        ))
+        assert client.get_json("/v1/flaky", api_key="test") == {"data": []}
+        stats = client.rate_limiter.stats
+        print(stats)
+        assert stats.retries == 2
+        assert stats.rate_limited_responses == 1 and stats.server_errors == 1
+
+        client.get_json("/v1/users", api_key="test")
+        with pytest.raises(RequestBudgetExceeded):
+            client.get_json("/v1/users", api_key="test")
+    finally:
+        server.shutdown()
+
+
+def test_each_collection_gets_its_own_request_budget(monkeypatch):
+    from src.burnout_detector.multi_burnout_agent import MultiBurnoutAgent
+    from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory
+
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    org = SyntheticOrg(SyntheticOrgConfig(users=3, schedules=1, incidents=30, now="2025-06-01T00:00:00Z"))
+    names = [user["attributes"]["full_name"] for user in org.records["users"]]
+    with FakeRootlyServer(org) as server:
+        rate_limit = RateLimiterConfig(request_budget=6)  # enough for one collection, not for two
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, rate_limit=rate_limit, cache=None))
+        multi = MultiBurnoutAgent()
+        multi.user_directory = UserDirectory(client=client)
+        for _ in range(2):
+            candidates = multi.collect_burnout_candidates(names)
+            assert [candidate.get("error") for candidate in candidates] == [None] * len(names)
+
+
+def test_runs_started_during_a_run_join_its_request_budget():
+    client = RootlyClient(RootlyClientConfig(rate_limit=RateLimiterConfig(request_budget=2), cache=None))
+    limiter = client.rate_limiter
+    with client.run():
+        limiter.acquire()
+        with client.run(request_budget=100):  # e.g. an agent run within a sweep: the sweep's budget still applies
+            limiter.acquire()
+            with pytest.raises(RequestBudgetExceeded):
+                limiter.acquire()
+    with client.run():  # the next run starts with a fresh budget
+        limiter.acquire()
+        assert limiter.stats.requests == 1
+
+
+def test_response_cache_disk_tier(tmp_path):
+    server = _serve()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        cache_config = ResponseCacheConfig(disk_dir=str(tmp_path))
+        first = RootlyClient(RootlyClientConfig(base_url=base_url, cache=cache_config))
+        first.get_json("/v1/users", params={"filter[search]": "Aniket"}, api_key="test")
+
+        # A fresh client (e.g. the next CLI run) answers from disk without any network call.
+        second = RootlyClient(RootlyClientConfig(base_url=base_url, cache=cache_config))
+        users = second.get_json("/v1/users", params={"filter[search]": "Aniket"}, api_key="test")
+        assert users["data"][0]["id"] == "1"
+        assert second.stats.requests == 0
+        assert second.cache.stats.disk_hits == 1
+
+        second.cache.invalidate("/v1/users")
+        second.get_json("/v1/users", params={"filter[search]": "Aniket"}, api_key="test")
+        assert second.stats.requests == 1
+
+        # The same request to another Rootly instance is not answered from this one's entries.
+        other_server = _serve()
+        try:
+            other = RootlyClient(RootlyClientConfig(base_url=f"http://localhost:{other_server.server_port}",
+                                                    cache=cache_config))
+            other.get_json("/v1/users", params={"filter[search]": "Aniket"}, api_key="test")
+            assert other.stats.requests == 1
+        finally:
+            other_server.shutdown()
+    finally:
+        server.shutdown()
+
+
+def test_incidents_tool_snapshot_mode(monkeypatch):
+    server = _serve()
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    try:
+        client = RootlyClient(RootlyClientConfig(base_url=f"http://127.0.0.1:{server.server_port}", cache=None))
+        store = SnapshotStore()
+        changes = []
+        store.add_listener(lambda resource, user_ids: changes.append(resource))
+        tool = IncidentsTool(client=client, page_size=10, snapshot_store=store)
+        assert len(tool.forward()) == 25
+        assert store.watermark("incidents") == "2025-06-25T10:00:00Z"
+        assert changes == ["incidents"]
+
+        # The second call only asks for the delta, and date filters are answered locally.
+        window = tool.forward(created_at_gte="2025-05-03T00:00:00Z", created_at_lte="2025-05-05T23:59:59Z")
+        assert sorted(incident["incident_id"] for incident in window) == ["2", "3", "4"]
+        requested = [path.replace("%5B", "[").replace("%5D", "]") for path in server.requested_paths]
+        assert any("filter[updated_at][gte]=2025-06-25T10" in path for path in requested)
+        assert changes == ["incidents"]  # re-fetching the unchanged newest record is not a change
+    finally:
+        server.shutdown()
+
+
+def test_snapshot_sync_skips_unparsable_updated_at():
+    org = SyntheticOrg(SyntheticOrgConfig(users=2, incidents=5, now="2025-06-01T00:00:00Z"))
+    for incident in org.records["incidents"][::2]:
+        incident["attributes"]["updated_at"] = "yesterday"
+    newest = max(incident["attributes"]["updated_at"] for incident in org.records["incidents"][1::2])
+    with FakeRootlyServer(org) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+        store = SnapshotStore()
+        process = lambda raw: {"id": raw["id"], **raw["attributes"]}
+        assert store.sync("incidents", client, "/v1/incidents", process, api_key="test") == 5
+    assert store.watermark("incidents") == newest
+
+
+if __name__ == "__main__":
+    test_rootly_client_reuses_connections()
@@ -1,33 +1,49 @@
-from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
+import pytest
+
+from src.burnout_detector.tools.rootly_tools.fake_rootly import FakeRootlyServer, SyntheticOrg, SyntheticOrgConfig
 from src.burnout_detector.tools.rootly_tools.incidents_tool import IncidentsTool
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, RootlyClientConfig
+from src.burnout_detector.tools.rootly_tools.shifts_tool import ShiftsTool
 from src.burnout_detector.tools.rootly_tools.users_tool import UsersTool
 
 
-def test_shifts_tool():
-    shifts_tool = ShiftsTool()
+ORG = SyntheticOrg(SyntheticOrgConfig(users=30, schedules=3, incidents=120, seed=1, now="2025-06-01T00:00:00Z"))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("ROOTLY_API_KEY", "test")
+    with FakeRootlyServer(ORG, default_page_size=10) as server:
+        yield RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+
+
+def test_shifts_tool(client):
+    shifts_tool = ShiftsTool(client=client)
     print("Testing shifts tool...")
     print(f"{ShiftsTool.description}")
-    shifts = shifts_tool.forward(schedule_name="Test Schedule")
+    shifts = shifts_tool.forward(schedule_name="Schedule 2")
     print(shifts)
+    assert [schedule["id"] for schedule in shifts] == ["sched-2"]
+    assert len(shifts_tool.forward()) == 3
 
 
-def test_incidents_tool():
-    incidents_tool = IncidentsTool()
+def test_incidents_tool(client):
+    incidents_tool = IncidentsTool(client=client)
     print("Testing incidents tool...")
     print(f"{IncidentsTool.description}")
-    incidents = incidents_tool.forward(user_id=105511)
+    incidents = incidents_tool.forward(user_id=7)
     print(incidents)
+    expected = [r["id"] for r in ORG.records["incidents"] if "7" in IncidentsTool.related_user_ids(r)]
+    assert incidents and sorted(incident["incident_id"] for incident in incidents) == sorted(expected)
+    assert [incident["created_at"] for incident in incidents] == sorted(
+        (incident["created_at"] for incident in incidents), reverse=True
+    )
 
 
-def test_users_tool():
-    users_tool = UsersTool()
+def test_users_tool(client):
+    users_tool = UsersTool(client=client)
     print("Testing users tool...")
     print(f"{UsersTool.description}")
-    users = users_tool.forward(search="Aniket")
+    users = users_tool.forward(search="ada")
     print(users)
-
-
-if __name__ == "__main__":
-    test_shifts_tool()
-    test_incidents_tool()
-    test_users_tool()
+    assert users and all("ada" in user["full_name"].lower() or "ada" in user["email"] for user in users)
@@ -0,0 +1,96 @@
+import threading
+import time
+
+from src.burnout_detector.tools.rootly_tools.fake_rootly import (
+    FakeRootlyServer, FaultConfig, SyntheticOrg, SyntheticOrgConfig,
+)
+from src.burnout_detector.tools.rootly_tools.rootly_client import RootlyClient, RootlyClientConfig
+from src.burnout_detector.tools.rootly_tools.user_directory import UserDirectory, UserDirectoryConfig, normalize_name
+
+
+def _user(user_id: str, full_name: str, email: str, slack_id: str = None, updated_at: str = "2025-01-01T00:00:00Z"):
+    return {"id": user_id, "full_name": full_name, "name": full_name, "email": email, "slack_id": slack_id,
+            "updated_at": updated_at}
+
+
+def test_matching():
+    directory = UserDirectory(client=RootlyClient(RootlyClientConfig(base_url="http://127.0.0.1:9")))
+    directory.add_users([
+        _user("1", "Aniket Sharma", "aniket@example.com", "U1"),
+        _user("2", "Anika Müller", "anika@example.com"),
+        _user("3", "Sylvain Kalache", "sylvain@example.com"),
+        _user("4", "Ann Aniketson", "ann@example.com"),
+    ])
+    assert normalize_name("  Anika  MÜLLER-Smith ") == "anika muller smith"
+    assert directory.resolve("3")["id"] == "3"
+    assert directory.resolve("U1")["id"] == "1"
+    assert directory.resolve("ANIKA@example.com")["id"] == "2"
+    assert directory.resolve("anika muller")["id"] == "2"
+    assert directory.resolve("Sylvain")["id"] == "3"
+    assert directory.resolve("kal")["id"] == "3"
+    # A whole-word first-name match beats a prefix match on a last name.
+    assert [user["id"] for user in directory.match("aniket")] == ["1", "4"]
+    assert [user["id"] for user in directory.match("ani")] == ["1", "2", "4"]
+    assert directory.resolve("Nobody") is None and directory.resolve("nobody@example.com") is None
+
+    directory.add_users([_user("1", "Aniket Rao", "aniket@example.com", "U1")])
+    assert directory.resolve("sharma") is None and directory.resolve("aniket rao")["id"] == "1"
+
+
+def test_bulk_resolution_and_incremental_refresh():
+    org = SyntheticOrg(SyntheticOrgConfig(users=500, schedules=0, teams=0, incidents=0, history_days=0,
+                                          now="2025-06-01T00:00:00Z"))
+    names = [user["attributes"]["full_name"] for user in org.records["users"]] * 4
+    with FakeRootlyServer(org) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None))
+        directory = UserDirectory(UserDirectoryConfig(page_size=100), client=client)
+        resolved = directory.resolve_many(names, api_key="test")
+        assert len(resolved) == 500 and all(user is not None for user in resolved.values())
+        assert resolved[names[41]]["id"] == "42"
+        assert client.stats.requests == 5  # one paginated pull for 2000 lookups
+
+        directory.resolve_many(names[:10], api_key="test")
+        assert client.stats.requests == 5  # within refresh_interval, nothing is fetched
+
+        renamed = org.records["users"][6]["attributes"]
+        renamed.update(full_name="Grace Brewster Hopper", name="Grace Brewster Hopper",
+                       updated_at="2025-07-01T00:00:00Z")
+        assert directory.refresh(api_key="test", force=True) == 2  # the watermark is inclusive: newest user + renamed
+        assert server.stats.paths[-1].count("filter%5Bupdated_at%5D%5Bgte%5D") == 1
+        assert directory.resolve("grace brewster")["id"] == "7"
+        stats = directory.stats
+        assert stats.users == 500 and stats.full_loads == 1 and stats.incremental_refreshes == 1
+
+
+def test_forced_refresh_bypasses_the_response_cache():
+    org = SyntheticOrg(SyntheticOrgConfig(users=20, schedules=0, teams=0, incidents=0, history_days=0,
+                                          now="2025-06-01T00:00:00Z"))
+    newest = max(user["attributes"]["updated_at"] for user in org.records["users"])
+    with FakeRootlyServer(org) as server:
+        client = RootlyClient(RootlyClientConfig(base_url=server.base_url))  # with the default response cache
+        directory = UserDirectory(client=client)
+        directory.refresh(api_key="test")
+        directory.refresh(api_key="test", force=True)
+
+        # Updated at the watermark itself, so the next delta pull sends exactly the same request as the last one.
+        org.records["users"][3]["attributes"].update(full_name="Grace Brewster Hopper", updated_at=newest)
+        directory.refresh(api_key="test", force=True)
+        assert directory.resolve("grace brewster")["id"] == "4"
+        assert client.stats.requests == 3
+
+
+def test_lookups_are_answered_while_a_refresh_is_fetching():
+    org = SyntheticOrg(SyntheticOrgConfig(users=20, schedules=0, teams=0, incidents=0, history_days=0,
+                                          now="2025-06-01T00:00:00Z"))
+    with FakeRootlyServer(org, faults=FaultConfig(latency_seconds=0.5)) as server:
+        directory = UserDirectory(client=RootlyClient(RootlyClientConfig(base_url=server.base_url, cache=None)))
+        directory.add_users([_user("100", "Aniket Sharma", "aniket@example.com", updated_at="2020-01-01T00:00:00Z")])
+        refresh = threading.Thread(target=directory.refresh, kwargs={"api_key": "test"})
+        refresh.start()
+        time.sleep(0.1)  # the refresh is now waiting on its first page
+
+        start = time.monotonic()
+        assert directory.resolve("aniket")["id"] == "100" and directory.stats.incremental_refreshes == 0
+        assert time.monotonic() - start < 0.3
+        refresh.join()
+        assert directory.stats.users == 21 and directory.stats.incremental_refreshes == 1
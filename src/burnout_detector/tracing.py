@@ -0,0 +1,269 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+
+SPAN_KINDS = ("run", "agent_step", "llm", "tool", "http")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("burnout_current_span", default=None)
+_active_tracer: contextvars.ContextVar[Optional["Tracer"]] = contextvars.ContextVar(
+    "burnout_active_tracer", default=None
+)
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str  # one of SPAN_KINDS
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)  # epoch seconds
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    attributes: dict = field(default_factory=dict)
+
+    def set(self, **attributes):
+        """
+        Add attributes to the span.
+        """
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """
+    Collects timing spans for a burnout detection run, and optionally appends them to a JSONL file as they finish.
+
+    Spans form a tree through a context variable: a span opened while another is active becomes its child. Agent
+    steps are recorded after the fact from smolagents' step callbacks, using the step's own timing.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Optional JSONL file the finished spans are appended to, one JSON object per line.
+        """
+        self.path = path
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+            if self.path:
+                with open(self.path, "a") as file:
+                    file.write(json.dumps(asdict(span), default=str) + "\n")
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span. Exceptions are recorded on the span and re-raised.
+        """
+        parent = _current_span.get()
+        span = Span(name=name, kind=kind, trace_id=self.trace_id,
+                    parent_id=parent.span_id if parent is not None else None, attributes=attributes)
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            _current_span.reset(token)
+            self._finish(span)
+
+    def record_agent_step(self, memory_step):
+        """
+        smolagents step callback recording each `ActionStep` as an "agent_step" span.
+        """
+        timing = getattr(memory_step, "timing", None)
+        if timing is None or timing.end_time is None:
+            return
+        parent = _current_span.get()
+        usage = getattr(memory_step, "token_usage", None)
+        error = getattr(memory_step, "error", None)
+        self._finish(Span(
+            name=f"step {getattr(memory_step, 'step_number', '?')}",
+            kind="agent_step",
+            trace_id=self.trace_id,
+            parent_id=parent.span_id if parent is not None else None,
+            start_time=timing.start_time,
+            duration_ms=(timing.end_time - timing.start_time) * 1000,
+            error=str(error) if error is not None else None,
+            attributes={
+                "input_tokens": usage.input_tokens if usage is not None else None,
+                "output_tokens": usage.output_tokens if usage is not None else None,
+                "code_chars": len(getattr(memory_step, "code_action", None) or ""),
+                "observation_chars": len(getattr(memory_step, "observations", None) or ""),
+                "is_final_answer": getattr(memory_step, "is_final_answer", False),
+            },
+        ))
+
+    def summary(self) -> dict:
+        """
+        Aggregate the spans per kind, and split the run's wall time between the LLM, Rootly and everything else
+        (mostly the `CodeAgent` sandbox and prompt handling).
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        import numpy as np
+
+        by_kind: Dict[str, dict] = {}
+        for kind in SPAN_KINDS:
+            durations = np.asarray([span.duration_ms for span in spans if span.kind == kind], dtype=np.float64)
+            if durations.size == 0:
+                continue
+            by_kind[kind] = {
+                "count": int(durations.size),
+                "errors": sum(1 for span in spans if span.kind == kind and span.error),
+                "total_ms": round(float(durations.sum()), 1),
+                "p50_ms": round(float(np.percentile(durations, 50)), 1),
+                "p95_ms": round(float(np.percentile(durations, 95)), 1),
+                "max_ms": round(float(durations.max()), 1),
+            }
+
+        llm_spans = [span for span in spans if span.kind == "llm"]
+        http_spans = [span for span in spans if span.kind == "http"]
+        run_ms = sum(span.duration_ms for span in spans if span.kind == "run")
+        llm_ms = sum(span.duration_ms for span in llm_spans)
+        # Tool time includes its HTTP requests; HTTP outside tools (e.g. metric precomputation) is counted separately.
+        tool_ids = {span.span_id for span in spans if span.kind == "tool"}
+        rootly_ms = sum(span.duration_ms for span in spans if span.kind == "tool") + sum(
+            span.duration_ms for span in http_spans if span.parent_id not in tool_ids
+        )
+        http_statuses: Dict[str, int] = {}
+        for span in http_spans:
+            status = str(span.attributes.get("status"))
+            http_statuses[status] = http_statuses.get(status, 0) + 1
+        return {
+            "spans": by_kind,
+            "run_ms": round(run_ms, 1),
+            "llm_ms": round(llm_ms, 1),
+            "rootly_ms": round(rootly_ms, 1),
+            "other_ms": round(max(run_ms - llm_ms - rootly_ms, 0.0), 1),
+            "input_tokens": sum(span.attributes.get("input_tokens") or 0 for span in llm_spans),
+            "output_tokens": sum(span.attributes.get("output_tokens") or 0 for span in llm_spans),
+            "http_statuses": http_statuses,
+            "http_bytes": sum(span.attributes.get("bytes") or 0 for span in http_spans),
+        }
+
+    def format_summary(self) -> str:
+        """
+        Human-readable version of `summary`.
+        """
+        summary = self.summary()
+        lines = [
+            f"Trace {self.trace_id}: {summary['run_ms'] / 1000:.2f}s total — "
+            f"LLM {summary['llm_ms'] / 1000:.2f}s, Rootly {summary['rootly_ms'] / 1000:.2f}s, "
+            f"other (agent sandbox, prompt handling) {summary['other_ms'] / 1000:.2f}s",
+            f"Tokens: {summary['input_tokens']} prompt, {summary['output_tokens']} completion; "
+            f"HTTP statuses: {summary['http_statuses'] or 'none'}, {summary['http_bytes']} bytes",
+        ]
+        for kind, stats in summary["spans"].items():
+            lines.append(
+                f"  {kind:<10} n={stats['count']:<4} errors={stats['errors']:<3} total={stats['total_ms']:.0f}ms "
+                f"p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms max={stats['max_ms']:.0f}ms"
+            )
+        return "\n".join(lines)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    The tracer activated with `use_tracer`, or None when tracing is off.
+    """
+    return _active_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """
+    Activate a tracer for the enclosed block. It is bound to the current context, so concurrent runs each report to
+    their own tracer; work handed to other threads reports to it when submitted with `contextvars.copy_context().run`
+    (e.g. page prefetching).
+    """
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+@contextmanager
+def trace_span(name: str, kind: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    `Tracer.span` on the active tracer, or a no-op yielding None when tracing is off.
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, kind, **attributes) as span:
+        yield span
+
+
+def record_agent_step(memory_step):
+    """
+    smolagents step callback forwarding to the active tracer, for agents that outlive a single traced run.
+    """
+    if (tracer := _active_tracer.get()) is not None:
+        tracer.record_agent_step(memory_step)
+
+
+def traced_tool_forward(forward):
+    """
+    Decorator for `Tool.forward` recording each call as a "tool" span with its arguments and result size. Tool
+    errors are returned as strings, so results starting with "Error" are recorded as span errors.
+
+    smolagents runs the agent's code on a thread of its own, outside the context of the run, so a call made from
+    there is run in (a copy of) the tool's `run_context`, which the agent sets for the duration of a run.
+    """
+    @functools.wraps(forward)
+    def wrapper(self, *args, **kwargs):
+        run_context = getattr(self, "run_context", None)
+        if _active_tracer.get() is None and run_context is not None and run_context.get(_active_tracer) is not None:
+            return run_context.copy().run(wrapper, self, *args, **kwargs)
+        if _active_tracer.get() is None:
+            return forward(self, *args, **kwargs)
+        with trace_span(self.name, "tool", arguments={**dict(zip(self.inputs, args)), **kwargs}) as span:
+            result = forward(self, *args, **kwargs)
+            if isinstance(result, str) and result.startswith(("Error", "An unexpected error")):
+                span.error = result
+            span.set(result_items=len(result) if isinstance(result, (list, dict)) else None,
+                     result_chars=len(json.dumps(result, default=str)))
+            return result
+    return wrapper
+
+
+def trace_model(model):
+    """
+    Wrap a smolagents model's `generate` so each completion is recorded as an "llm" span with its token usage.
+    The model is modified in place and returned.
+    """
+    if getattr(model, "_burnout_traced", False):
+        return model
+    generate = model.generate
+
+    @functools.wraps(generate)
+    def traced_generate(*args, **kwargs):
+        with trace_span("generate", "llm", model_id=getattr(model, "model_id", None)) as span:
+            response = generate(*args, **kwargs)
+            if span is not None and (usage := getattr(response, "token_usage", None)) is not None:
+                span.set(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+            return response
+
+    model.generate = traced_generate
+    model._burnout_traced = True
+    return model
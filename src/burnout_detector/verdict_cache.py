@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Set
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    user_id TEXT,
+    verdict TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS verdicts_user ON verdicts (user_id);
+CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used_at);
+"""
+
+
+@dataclass
+class VerdictCacheConfig:
+    path: str = field(default_factory=lambda: os.getenv("BURNOUT_VERDICT_CACHE", ":memory:"))  # SQLite file
+    max_bytes: int = 64 * 1024 * 1024  # total size of the stored verdicts before least-recently-used eviction
+
+
+@dataclass
+class VerdictCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+def normalize(value: Any) -> Any:
+    """
+    Normalize tool output for hashing: dictionaries are key-sorted by `json.dumps`, and lists of records are sorted
+    by their serialized form so that the API's ordering does not change the key.
+    """
+    if isinstance(value, dict):
+        return {str(key): normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [normalize(item) for item in value]
+        if items and all(isinstance(item, dict) for item in items):
+            items.sort(key=lambda item: json.dumps(item, sort_keys=True, default=str))
+        return items
+    return value
+
+
+def verdict_key(model_id: str, temperature: float, prompt: str, tool_outputs: Optional[Iterable[Any]] = None) -> str:
+    """
+    Content address of a burnout verdict: a SHA-256 over the model, its temperature, the rendered prompt and the
+    normalized data the verdict is based on.
+    """
+    payload = json.dumps(
+        [model_id, temperature, prompt, [normalize(output) for output in (tool_outputs or [])]],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class VerdictCache:
+    """
+    Persistent, content-addressed cache of LLM burnout verdicts.
+
+    Verdicts are stored in SQLite under `verdict_key` and tagged with the Rootly user they are about. The total size
+    is bounded by evicting the least recently used verdicts. `attach` subscribes the cache to a `SnapshotStore`, so
+    that a user's verdicts are dropped as soon as a sync brings in new or updated records for them.
+    """
+
+    def __init__(self, config: Optional[VerdictCacheConfig] = None):
+        self.config = config if config is not None else VerdictCacheConfig()
+        self.stats = VerdictCacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.config.path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        The cached verdict for a key, or None.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT verdict FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._connection.execute("UPDATE verdicts SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self.stats.hits += 1
+            return row[0]
+
+    def put(self, key: str, verdict: str, user_id: Optional[str] = None):
+        """
+        Store a verdict, evicting the least recently used verdicts if the cache grows over `max_bytes`.
+
+        Args:
+            key: The `verdict_key` of the inputs.
+            verdict: The agent's output.
+            user_id: Optional Rootly user ID the verdict is about, used for invalidation.
+        """
+        now = time.time()
+        size = len(verdict.encode())
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO verdicts (key, user_id, verdict, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, str(user_id) if user_id is not None else None, verdict, size, now, now)
+            )
+            self.stats.stores += 1
+            total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM verdicts").fetchone()[0]
+            if total <= self.config.max_bytes:
+                return
+            for old_key, old_size in self._connection.execute(
+                    "SELECT key, size FROM verdicts WHERE key != ? ORDER BY last_used_at", (key,)
+            ).fetchall():
+                self._connection.execute("DELETE FROM verdicts WHERE key = ?", (old_key,))
+                self.stats.evictions += 1
+                total -= old_size
+                if total <= self.config.max_bytes:
+                    break
+
+    def invalidate(self, user_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop the verdicts about the given users, or every verdict if `user_ids` is None.
+
+        Returns:
+            int: The number of verdicts dropped.
+        """
+        with self._lock, self._connection:
+            if user_ids is None:
+                dropped = self._connection.execute("DELETE FROM verdicts").rowcount
+            else:
+                user_ids = [str(user_id) for user_id in user_ids]
+                dropped = self._connection.executemany(
+                    "DELETE FROM verdicts WHERE user_id = ?", [(user_id,) for user_id in user_ids]
+                ).rowcount if user_ids else 0
+            self.stats.invalidations += dropped
+        return dropped
+
+    def on_data_changed(self, resource: str, user_ids: Set[str]):
+        """
+        `SnapshotStore` listener: new or updated records for some users make their verdicts stale. Changes not tied
+        to any user (e.g. an org-wide resource) invalidate everything.
+        """
+        self.invalidate(user_ids if user_ids else None)
+
+    def attach(self, snapshot_store):
+        """
+        Subscribe this cache to a `SnapshotStore`'s change notifications.
+        """
+        snapshot_store.add_listener(self.on_data_changed)
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
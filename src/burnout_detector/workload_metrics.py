@@ -0,0 +1,384 @@
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+
+SEVERITY_LEVELS = ("critical", "high", "medium", "low", "unknown")
+MISSING_TIME = np.iinfo(np.int64).min  # sentinel for a missing timestamp in the epoch-second arrays
+_SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class WorkloadMetricsConfig:
+    work_day_start_hour: int = 9  # local hour at which working hours start
+    work_day_end_hour: int = 18  # local hour at which working hours end (exclusive)
+    rolling_windows_days: Tuple[int, ...] = (7, 30, 90)  # windows, in days before `now`, to count incidents over
+
+
+@dataclass
+class WorkloadMetrics:
+    engineer_id: str
+    incident_count: int = 0
+    incidents_by_severity: Dict[str, int] = field(default_factory=dict)
+    time_to_resolve_p50_hours: Optional[float] = None
+    time_to_resolve_p90_hours: Optional[float] = None
+    time_to_resolve_max_hours: Optional[float] = None
+    off_hours_ratio: float = 0.0  # share of incidents that started outside local working hours
+    weekend_ratio: float = 0.0  # share of incidents that started on a local Saturday or Sunday
+    on_call_hours: float = 0.0  # hours on call, counting overlapping shifts once
+    max_consecutive_on_call_days: int = 0
+    max_consecutive_on_call_hours: float = 0.0  # longest uninterrupted on-call stretch, across back-to-back shifts
+    rolling_incident_counts: Dict[int, int] = field(default_factory=dict)  # window in days -> incidents started in it
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class IncidentColumns:
+    """
+    Struct-of-arrays view of incidents across many engineers, one row per (engineer, incident) pair.
+    """
+    engineer: np.ndarray  # int32 index into the engineer ID list
+    started_at: np.ndarray  # int64 epoch seconds (falls back to created_at), MISSING_TIME if unknown
+    resolved_at: np.ndarray  # int64 epoch seconds, MISSING_TIME if unresolved
+    severity: np.ndarray  # int8 index into SEVERITY_LEVELS
+
+
+@dataclass
+class ShiftColumns:
+    """
+    Struct-of-arrays view of on-call shifts across many engineers.
+    """
+    engineer: np.ndarray  # int32 index into the engineer ID list
+    starts_at: np.ndarray  # int64 epoch seconds
+    ends_at: np.ndarray  # int64 epoch seconds
+
+
+def parse_epoch(timestamp: Optional[str]) -> int:
+    """
+    Parse an ISO 8601 timestamp into epoch seconds, or MISSING_TIME if it is missing or malformed.
+    """
+    if not timestamp:
+        return MISSING_TIME
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return MISSING_TIME
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def utc_offset_seconds(time_zone: Optional[str], now: Optional[datetime] = None) -> int:
+    """
+    The UTC offset of an IANA time zone (e.g. a Rootly user's "time_zone") at `now`, in seconds; 0 if the zone is
+    missing or unknown.
+    """
+    if not time_zone:
+        return 0
+    try:
+        return int((now or datetime.now(timezone.utc)).astimezone(ZoneInfo(time_zone)).utcoffset().total_seconds())
+    except (ZoneInfoNotFoundError, ValueError):
+        return 0
+
+
+def local_time_flags(
+        timestamp: int,
+        utc_offset_seconds: int = 0,
+        config: Optional[WorkloadMetricsConfig] = None
+) -> Tuple[bool, bool]:
+    """
+    Whether an epoch-second timestamp falls outside local working hours, and whether it falls on a local weekend.
+    The scalar counterpart of the vectorised checks in `compute_workload_metrics_from_columns`.
+    """
+    config = config if config is not None else WorkloadMetricsConfig()
+    local = timestamp + utc_offset_seconds
+    hour = (local // 3600) % 24
+    weekday = (local // _SECONDS_PER_DAY + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+    return hour < config.work_day_start_hour or hour >= config.work_day_end_hour, weekday >= 5
+
+
+def severity_code(severity: Optional[str]) -> int:
+    """
+    Map a Rootly severity level (e.g. "critical", "SEV1") onto an index into SEVERITY_LEVELS.
+    """
+    if not severity:
+        return SEVERITY_LEVELS.index("unknown")
+    severity = str(severity).lower()
+    if severity in SEVERITY_LEVELS:
+        return SEVERITY_LEVELS.index(severity)
+    if severity.startswith("sev") and severity[3:].isdigit():
+        return min(int(severity[3:]), len(SEVERITY_LEVELS) - 2)
+    return SEVERITY_LEVELS.index("unknown")
+
+
+def build_incident_columns(engineer_ids: Sequence[str], incidents_by_engineer: Dict[str, List[dict]]) -> IncidentColumns:
+    """
+    Build incident columns from the processed incident dictionaries returned by `IncidentsTool`. An engineer's
+    incidents may also be given as an `IncidentBatch`, whose columns are taken as-is without building dictionaries.
+    """
+    engineer, started_at, resolved_at, severity = [], [], [], []
+    batch_columns = []
+    for index, engineer_id in enumerate(engineer_ids):
+        incidents = incidents_by_engineer.get(engineer_id)
+        if hasattr(incidents, "incident_columns"):
+            batch_columns.append(incidents.incident_columns(index))
+            continue
+        for incident in incidents or []:
+            engineer.append(index)
+            started = parse_epoch(incident.get("started_at"))
+            started_at.append(started if started != MISSING_TIME else parse_epoch(incident.get("created_at")))
+            resolved_at.append(parse_epoch(incident.get("resolved_at")))
+            severity.append(severity_code(incident.get("severity_level") or incident.get("severity_name")))
+    columns = IncidentColumns(
+        engineer=np.asarray(engineer, dtype=np.int32),
+        started_at=np.asarray(started_at, dtype=np.int64),
+        resolved_at=np.asarray(resolved_at, dtype=np.int64),
+        severity=np.asarray(severity, dtype=np.int8),
+    )
+    if not batch_columns:
+        return columns
+    return IncidentColumns(*(
+        np.concatenate([getattr(part, name) for part in (columns, *batch_columns)])
+        for name in ("engineer", "started_at", "resolved_at", "severity")
+    ))
+
+
+def build_shift_columns(engineer_ids: Sequence[str], shifts_by_engineer: Dict[str, List[dict]]) -> ShiftColumns:
+    """
+    Build shift columns from the processed shift dictionaries returned by `ShiftsTool.iter_shifts`.
+    """
+    engineer, starts_at, ends_at = [], [], []
+    for index, engineer_id in enumerate(engineer_ids):
+        for shift in shifts_by_engineer.get(engineer_id) or []:
+            start, end = parse_epoch(shift.get("starts_at")), parse_epoch(shift.get("ends_at"))
+            if start == MISSING_TIME or end == MISSING_TIME or end <= start:
+                continue
+            engineer.append(index)
+            starts_at.append(start)
+            ends_at.append(end)
+    return ShiftColumns(
+        engineer=np.asarray(engineer, dtype=np.int32),
+        starts_at=np.asarray(starts_at, dtype=np.int64),
+        ends_at=np.asarray(ends_at, dtype=np.int64),
+    )
+
+
+def _group_quantiles(groups: np.ndarray, values: np.ndarray, n_groups: int, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Nearest-rank quantiles of `values` within each group. Returns an (n_groups, len(quantiles)) array, NaN for empty
+    groups.
+    """
+    result = np.full((n_groups, len(quantiles)), np.nan)
+    if values.size == 0:
+        return result
+    # Sort by value, then stably by group: sorting small integer keys is much cheaper than a lexsort.
+    order = np.argsort(values, kind="stable")
+    order = order[np.argsort(groups[order], kind="stable")]
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    for column, quantile in enumerate(quantiles):
+        ranks = offsets[present] + np.floor(quantile * (counts[present] - 1)).astype(np.int64)
+        result[present, column] = sorted_values[ranks]
+    return result
+
+
+def _max_consecutive_days(shifts: ShiftColumns, n_engineers: int, utc_offsets: np.ndarray) -> np.ndarray:
+    """
+    Longest run of consecutive local calendar days with at least some on-call time, per engineer.
+    """
+    result = np.zeros(n_engineers, dtype=np.int64)
+    if shifts.engineer.size == 0:
+        return result
+    offsets = utc_offsets[shifts.engineer]
+    first_day = (shifts.starts_at + offsets) // _SECONDS_PER_DAY
+    last_day = (shifts.ends_at - 1 + offsets) // _SECONDS_PER_DAY
+    lengths = last_day - first_day + 1
+
+    # Expand every shift into the days it touches, then deduplicate (engineer, day) pairs.
+    shift_index = np.repeat(np.arange(lengths.size), lengths)
+    within = np.arange(shift_index.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    days = first_day[shift_index] + within
+    engineers = shifts.engineer[shift_index].astype(np.int64)
+    span = int(days.max() - days.min()) + 2
+    keys = np.sort(engineers * span + (days - days.min()))
+    keys = keys[np.concatenate(([True], np.diff(keys) != 0))]
+
+    # Consecutive keys of the same engineer differ by exactly one; the span gap separates engineers.
+    breaks = np.concatenate(([True], np.diff(keys) != 1))
+    run_ids = np.cumsum(breaks) - 1
+    run_lengths = np.bincount(run_ids)
+    run_engineers = (keys[breaks] // span).astype(np.int64)
+    np.maximum.at(result, run_engineers, run_lengths)
+    return result
+
+
+def compute_workload_metrics_from_columns(
+        engineer_ids: Sequence[str],
+        incidents: IncidentColumns,
+        shifts: Optional[ShiftColumns] = None,
+        now: Optional[int] = None,
+        utc_offsets_seconds: Optional[np.ndarray] = None,
+        config: Optional[WorkloadMetricsConfig] = None,
+) -> Dict[str, WorkloadMetrics]:
+    """
+    Compute per-engineer workload features from columnar incidents and shifts, vectorized across all engineers.
+
+    Args:
+        engineer_ids: The engineer IDs the column `engineer` indexes refer to.
+        incidents: Incident columns.
+        shifts: Optional shift columns.
+        now: Reference time in epoch seconds for the rolling windows. Defaults to the current time.
+        utc_offsets_seconds: Optional per-engineer UTC offsets (seconds), used for off-hours and weekend detection.
+        config: Optional metrics configuration.
+
+    Returns:
+        dict: Engineer ID to `WorkloadMetrics`.
+    """
+    config = config if config is not None else WorkloadMetricsConfig()
+    n = len(engineer_ids)
+    now = int(datetime.now(timezone.utc).timestamp()) if now is None else int(now)
+    utc_offsets = np.zeros(n, dtype=np.int64) if utc_offsets_seconds is None else np.asarray(
+        utc_offsets_seconds, dtype=np.int64
+    )
+    n_severities = len(SEVERITY_LEVELS)
+
+    engineer = incidents.engineer.astype(np.int64)
+    counts = np.bincount(engineer, minlength=n)
+    by_severity = np.bincount(
+        engineer * n_severities + incidents.severity, minlength=n * n_severities
+    ).reshape(n, n_severities)
+
+    resolved = (incidents.resolved_at != MISSING_TIME) & (incidents.started_at != MISSING_TIME)
+    ttr_hours = (incidents.resolved_at[resolved] - incidents.started_at[resolved]) / 3600.0
+    ttr = _group_quantiles(engineer[resolved], ttr_hours, n, (0.5, 0.9, 1.0))
+
+    has_start = incidents.started_at != MISSING_TIME
+    started_counts = np.bincount(engineer[has_start], minlength=n)
+    local_start = incidents.started_at[has_start] + utc_offsets[engineer[has_start]]
+    hour = (local_start // 3600) % 24
+    weekday = (local_start // _SECONDS_PER_DAY + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0
+    off_hours = (hour < config.work_day_start_hour) | (hour >= config.work_day_end_hour)
+    weekend = weekday >= 5
+    with np.errstate(invalid="ignore", divide="ignore"):
+        off_hours_ratio = np.bincount(engineer[has_start], weights=off_hours, minlength=n) / started_counts
+        weekend_ratio = np.bincount(engineer[has_start], weights=weekend, minlength=n) / started_counts
+
+    rolling = {
+        days: np.bincount(
+            engineer[has_start & (incidents.started_at >= now - days * _SECONDS_PER_DAY)], minlength=n
+        )
+        for days in config.rolling_windows_days
+    }
+
+    on_call_hours, stretch_hours = np.zeros(n), np.zeros(n)
+    if shifts is not None and shifts.engineer.size:
+        from src.burnout_detector.shift_index import merge_intervals
+
+        # Overlapping shifts (e.g. on two schedules at once) count once, and back-to-back shifts form one stretch.
+        merged_engineer, merged_starts, merged_ends = merge_intervals(shifts.engineer, shifts.starts_at, shifts.ends_at)
+        merged_hours = (merged_ends - merged_starts) / 3600
+        on_call_hours = np.bincount(merged_engineer, weights=merged_hours, minlength=n)
+        first = np.flatnonzero(np.r_[True, merged_engineer[1:] != merged_engineer[:-1]])
+        stretch_hours[merged_engineer[first]] = np.maximum.reduceat(merged_hours, first)
+        consecutive_days = _max_consecutive_days(shifts, n, utc_offsets)
+    else:
+        consecutive_days = np.zeros(n, dtype=np.int64)
+
+    # Convert to Python lists once; indexing numpy arrays element by element is far slower.
+    counts_list = counts.tolist()
+    by_severity_list = by_severity.tolist()
+    ttr_list = np.round(ttr, 2).tolist()
+    off_hours_list = np.round(np.nan_to_num(off_hours_ratio), 3).tolist()
+    weekend_list = np.round(np.nan_to_num(weekend_ratio), 3).tolist()
+    on_call_list = np.round(on_call_hours, 2).tolist()
+    consecutive_list = consecutive_days.tolist()
+    stretch_list = np.round(stretch_hours, 2).tolist()
+    rolling_lists = {days: rolling[days].tolist() for days in config.rolling_windows_days}
+
+    def _optional(value: float) -> Optional[float]:
+        return None if value != value else value  # NaN marks engineers without resolved incidents
+
+    return {
+        engineer_id: WorkloadMetrics(
+            engineer_id=engineer_id,
+            incident_count=counts_list[i],
+            incidents_by_severity={
+                level: count for level, count in zip(SEVERITY_LEVELS, by_severity_list[i]) if count
+            },
+            time_to_resolve_p50_hours=_optional(ttr_list[i][0]),
+            time_to_resolve_p90_hours=_optional(ttr_list[i][1]),
+            time_to_resolve_max_hours=_optional(ttr_list[i][2]),
+            off_hours_ratio=off_hours_list[i],
+            weekend_ratio=weekend_list[i],
+            on_call_hours=on_call_list[i],
+            max_consecutive_on_call_days=consecutive_list[i],
+            max_consecutive_on_call_hours=stretch_list[i],
+            rolling_incident_counts={days: rolling_lists[days][i] for days in config.rolling_windows_days},
+        )
+        for i, engineer_id in enumerate(engineer_ids)
+    }
+
+
+def compute_workload_metrics(
+        incidents_by_engineer: Dict[str, List[dict]],
+        shifts_by_engineer: Optional[Dict[str, List[dict]]] = None,
+        now: Optional[int] = None,
+        utc_offsets_seconds: Optional[Dict[str, int]] = None,
+        config: Optional[WorkloadMetricsConfig] = None,
+) -> Dict[str, WorkloadMetrics]:
+    """
+    Compute per-engineer workload features from the outputs of `IncidentsTool` and `ShiftsTool.iter_shifts`.
+
+    Args:
+        incidents_by_engineer: Engineer ID to the processed incidents they were involved in.
+        shifts_by_engineer: Optional engineer ID to their processed on-call shifts.
+        now: Reference time in epoch seconds for the rolling windows. Defaults to the current time.
+        utc_offsets_seconds: Optional engineer ID to UTC offset in seconds, for off-hours and weekend detection.
+        config: Optional metrics configuration.
+
+    Returns:
+        dict: Engineer ID to `WorkloadMetrics`.
+    """
+    shifts_by_engineer = shifts_by_engineer or {}
+    engineer_ids = list(dict.fromkeys([*incidents_by_engineer, *shifts_by_engineer]))
+    offsets = None
+    if utc_offsets_seconds:
+        offsets = np.asarray([utc_offsets_seconds.get(engineer_id, 0) for engineer_id in engineer_ids], dtype=np.int64)
+    return compute_workload_metrics_from_columns(
+        engineer_ids,
+        build_incident_columns(engineer_ids, incidents_by_engineer),
+        build_shift_columns(engineer_ids, shifts_by_engineer),
+        now=now,
+        utc_offsets_seconds=offsets,
+        config=config,
+    )
+
+
+def format_workload_summary(metrics: WorkloadMetrics) -> str:
+    """
+    Render workload metrics as a compact, prompt-friendly bulleted summary.
+    """
+    severity = ", ".join(f"{level}: {count}" for level, count in metrics.incidents_by_severity.items()) or "none"
+    rolling = ", ".join(f"last {days}d: {count}" for days, count in metrics.rolling_incident_counts.items())
+    if metrics.time_to_resolve_p50_hours is None:
+        ttr = "no resolved incidents"
+    else:
+        ttr = (
+            f"p50 {metrics.time_to_resolve_p50_hours}h, p90 {metrics.time_to_resolve_p90_hours}h, "
+            f"max {metrics.time_to_resolve_max_hours}h"
+        )
+    return "\n".join([
+        f"- Incidents: {metrics.incident_count} ({severity})",
+        f"- Rolling incident load: {rolling}",
+        f"- Time to resolve: {ttr}",
+        f"- Off-hours incidents: {metrics.off_hours_ratio:.0%}, weekend incidents: {metrics.weekend_ratio:.0%}",
+        f"- On-call hours: {metrics.on_call_hours}, longest consecutive on-call stretch: "
+        f"{metrics.max_consecutive_on_call_days} days ({metrics.max_consecutive_on_call_hours}h without a break)",
+    ])